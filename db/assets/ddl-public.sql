@@ -5,6 +5,8 @@ CREATE TABLE tenants (
     schema_name VARCHAR(255) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+-- Un schema por tenant; tenant_middleware resuelve el tenant por schema_name
+CREATE UNIQUE INDEX tenants_schema_name_idx ON tenants (schema_name);
 
 -- Tabla customers
 CREATE TABLE customers (
@@ -27,6 +29,8 @@ CREATE TABLE orders (
     id_customer INTEGER NOT NULL,
     FOREIGN KEY (id_customer) REFERENCES customers(id) ON DELETE CASCADE
 );
+CREATE INDEX orders_id_customer_idx ON orders (id_customer, id);
+CREATE INDEX orders_status_idx ON orders (status, id);
 
 -- Tabla products
 CREATE TABLE products (
@@ -46,6 +50,7 @@ CREATE TABLE inventory (
     restock_date TIMESTAMP,
     FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
 );
+CREATE INDEX inventory_product_id_idx ON inventory (product_id);
 
 -- Tabla credit_accounts
 CREATE TABLE credit_accounts (
@@ -55,6 +60,7 @@ CREATE TABLE credit_accounts (
     id_customer INTEGER NOT NULL,
     FOREIGN KEY (id_customer) REFERENCES customers(id) ON DELETE CASCADE
 );
+CREATE INDEX credit_accounts_id_customer_idx ON credit_accounts (id_customer);
 
 -- Tabla order_items
 CREATE TABLE order_items (
@@ -66,6 +72,8 @@ CREATE TABLE order_items (
     FOREIGN KEY (id_order) REFERENCES orders(id) ON DELETE CASCADE,
     FOREIGN KEY (id_product) REFERENCES products(id) ON DELETE CASCADE
 );
+CREATE INDEX order_items_id_order_idx ON order_items (id_order);
+CREATE INDEX order_items_id_product_idx ON order_items (id_product);
 
 -- Tabla sales
 CREATE TABLE sales (
@@ -77,6 +85,7 @@ CREATE TABLE sales (
     FOREIGN KEY (id_customer) REFERENCES customers(id) ON DELETE CASCADE,
     FOREIGN KEY (id_order) REFERENCES orders(id) ON DELETE SET NULL
 );
+CREATE INDEX sales_id_customer_idx ON sales (id_customer);
 
 -- Tabla sales_reports
 CREATE TABLE sales_reports (
@@ -87,6 +96,34 @@ CREATE TABLE sales_reports (
     most_sold_product VARCHAR,
     least_sold_product VARCHAR,
     pending_collections FLOAT,
-    id_customer INTEGER NOT NULL,
+    id_customer INTEGER, -- NULL para los reportes del tenant completo
     FOREIGN KEY (id_customer) REFERENCES customers(id) ON DELETE CASCADE
 );
+
+-- Tabla jobs: trabajos en segundo plano (siempre en el schema public; también en db/migrations/public/0003_jobs.sql)
+CREATE TABLE public.jobs (
+    id SERIAL PRIMARY KEY,
+    job_type VARCHAR NOT NULL,
+    schema_name VARCHAR(255) NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    progress FLOAT NOT NULL DEFAULT 0,
+    params JSONB,
+    result JSONB,
+    error VARCHAR,
+    worker_id VARCHAR,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX jobs_status_idx ON public.jobs (status, id);
+
+-- pg_trgm para la búsqueda de clientes (también en db/migrations/public/0002_pg_trgm.sql)
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+    END IF;
+END
+$$;
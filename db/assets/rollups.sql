@@ -0,0 +1,136 @@
+-- Rollups de pedidos y ventas por tenant.
+-- Se ejecuta con el search_path apuntando al schema del tenant y es idempotente,
+-- por lo que también sirve para instalar las rollups en tenants ya existentes.
+-- Las funciones fijan su search_path al schema en el que se crean
+-- (SET search_path FROM CURRENT), así los triggers actualizan las rollups del
+-- tenant correcto aunque la sesión que escribe use otro search_path.
+
+-- Tabla order_status_rollup: pedidos por estado
+CREATE TABLE IF NOT EXISTS order_status_rollup (
+    status VARCHAR PRIMARY KEY,
+    order_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Tabla product_sales_rollup: cantidad vendida por producto (pedidos completados)
+CREATE TABLE IF NOT EXISTS product_sales_rollup (
+    id_product INTEGER PRIMARY KEY,
+    quantity_sold INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (id_product) REFERENCES products(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS product_sales_rollup_quantity_sold_idx ON product_sales_rollup (quantity_sold DESC);
+
+-- Tabla customer_orders_rollup: pedidos completados y ventas por cliente
+CREATE TABLE IF NOT EXISTS customer_orders_rollup (
+    id_customer INTEGER PRIMARY KEY,
+    completed_orders INTEGER NOT NULL DEFAULT 0,
+    total_sales FLOAT NOT NULL DEFAULT 0,
+    FOREIGN KEY (id_customer) REFERENCES customers(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS customer_orders_rollup_completed_orders_idx ON customer_orders_rollup (completed_orders DESC);
+
+CREATE OR REPLACE FUNCTION rollup_add_status(p_status VARCHAR, p_delta INTEGER) RETURNS VOID AS $$
+BEGIN
+    INSERT INTO order_status_rollup (status, order_count) VALUES (p_status, p_delta)
+    ON CONFLICT (status) DO UPDATE SET order_count = order_status_rollup.order_count + EXCLUDED.order_count;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION rollup_add_product(p_id_product INTEGER, p_delta INTEGER) RETURNS VOID AS $$
+BEGIN
+    IF p_delta = 0 OR NOT EXISTS (SELECT 1 FROM products WHERE id = p_id_product) THEN
+        RETURN;
+    END IF;
+    INSERT INTO product_sales_rollup (id_product, quantity_sold) VALUES (p_id_product, p_delta)
+    ON CONFLICT (id_product) DO UPDATE SET quantity_sold = product_sales_rollup.quantity_sold + EXCLUDED.quantity_sold;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION rollup_add_customer(p_id_customer INTEGER, p_orders INTEGER, p_sales FLOAT) RETURNS VOID AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM customers WHERE id = p_id_customer) THEN
+        RETURN;
+    END IF;
+    INSERT INTO customer_orders_rollup (id_customer, completed_orders, total_sales) VALUES (p_id_customer, p_orders, p_sales)
+    ON CONFLICT (id_customer) DO UPDATE SET
+        completed_orders = customer_orders_rollup.completed_orders + EXCLUDED.completed_orders,
+        total_sales = customer_orders_rollup.total_sales + EXCLUDED.total_sales;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+-- Mueve las cantidades de todos los items de un pedido cuando entra o sale del estado completado
+CREATE OR REPLACE FUNCTION rollup_add_order_items(p_id_order INTEGER, p_sign INTEGER) RETURNS VOID AS $$
+DECLARE
+    item RECORD;
+BEGIN
+    FOR item IN SELECT id_product, SUM(quantity)::INTEGER AS quantity FROM order_items WHERE id_order = p_id_order GROUP BY id_product LOOP
+        PERFORM rollup_add_product(item.id_product, p_sign * item.quantity);
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION rollup_orders_trigger() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM rollup_add_status(OLD.status, -1);
+        IF OLD.status = 'Completada' THEN
+            PERFORM rollup_add_customer(OLD.id_customer, -1, 0);
+            PERFORM rollup_add_order_items(OLD.id, -1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM rollup_add_status(NEW.status, 1);
+        IF NEW.status = 'Completada' THEN
+            PERFORM rollup_add_customer(NEW.id_customer, 1, 0);
+            PERFORM rollup_add_order_items(NEW.id, 1);
+        END IF;
+        RETURN NEW;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION rollup_order_items_trigger() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND EXISTS (SELECT 1 FROM orders WHERE id = OLD.id_order AND status = 'Completada') THEN
+        PERFORM rollup_add_product(OLD.id_product, -OLD.quantity);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF EXISTS (SELECT 1 FROM orders WHERE id = NEW.id_order AND status = 'Completada') THEN
+            PERFORM rollup_add_product(NEW.id_product, NEW.quantity);
+        END IF;
+        RETURN NEW;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION rollup_sales_trigger() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM rollup_add_customer(OLD.id_customer, 0, -OLD.total_amount);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM rollup_add_customer(NEW.id_customer, 0, NEW.total_amount);
+        RETURN NEW;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+-- Los pedidos se procesan ANTES de borrarse para que sus items sigan visibles;
+-- los items borrados en cascada ya no encuentran el pedido y no se cuentan dos veces.
+DROP TRIGGER IF EXISTS orders_rollup_delete ON orders;
+CREATE TRIGGER orders_rollup_delete BEFORE DELETE ON orders
+    FOR EACH ROW EXECUTE FUNCTION rollup_orders_trigger();
+
+DROP TRIGGER IF EXISTS orders_rollup_write ON orders;
+CREATE TRIGGER orders_rollup_write AFTER INSERT OR UPDATE OF status, id_customer ON orders
+    FOR EACH ROW EXECUTE FUNCTION rollup_orders_trigger();
+
+DROP TRIGGER IF EXISTS order_items_rollup ON order_items;
+CREATE TRIGGER order_items_rollup AFTER INSERT OR UPDATE OF quantity, id_product, id_order OR DELETE ON order_items
+    FOR EACH ROW EXECUTE FUNCTION rollup_order_items_trigger();
+
+DROP TRIGGER IF EXISTS sales_rollup ON sales;
+CREATE TRIGGER sales_rollup AFTER INSERT OR UPDATE OF total_amount, id_customer OR DELETE ON sales
+    FOR EACH ROW EXECUTE FUNCTION rollup_sales_trigger();
@@ -0,0 +1,24 @@
+-- Ajustes de sales_reports para el motor de reportes.
+-- Se ejecuta con el search_path apuntando al schema del tenant y es idempotente,
+-- por lo que también actualiza los tenants creados antes de su introducción.
+
+-- Los reportes del tenant completo no tienen cliente (id_customer NULL)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'sales_reports'
+          AND column_name = 'id_customer' AND is_nullable = 'NO'
+    ) THEN
+        ALTER TABLE sales_reports ALTER COLUMN id_customer DROP NOT NULL;
+    END IF;
+END;
+$$;
+
+-- Un único reporte por tipo, periodo y cliente (o tenant)
+CREATE UNIQUE INDEX IF NOT EXISTS sales_reports_period_idx
+    ON sales_reports (report_type, report_date, (COALESCE(id_customer, 0)));
+
+-- Rangos de fechas usados al calcular solo los periodos nuevos
+CREATE INDEX IF NOT EXISTS sales_sale_date_idx ON sales (sale_date);
+CREATE INDEX IF NOT EXISTS credit_accounts_due_date_idx ON credit_accounts (due_date);
@@ -0,0 +1,14 @@
+-- Índices secundarios de las tablas del tenant.
+-- Cubren los filtros de los repositorios (cliente, estado, pedido, producto) y los
+-- joins de las estadísticas, que sin ellos recorren la tabla completa. Los filtros
+-- de los listados ordenan por id, por eso se incluye como segunda columna.
+-- Se crean dentro de la transacción de la migración (sin CONCURRENTLY): en tenants
+-- grandes bloquean las escrituras de la tabla mientras se construyen.
+
+CREATE INDEX IF NOT EXISTS orders_id_customer_idx ON orders (id_customer, id);
+CREATE INDEX IF NOT EXISTS orders_status_idx ON orders (status, id);
+CREATE INDEX IF NOT EXISTS order_items_id_order_idx ON order_items (id_order);
+CREATE INDEX IF NOT EXISTS order_items_id_product_idx ON order_items (id_product);
+CREATE INDEX IF NOT EXISTS inventory_product_id_idx ON inventory (product_id);
+CREATE INDEX IF NOT EXISTS credit_accounts_id_customer_idx ON credit_accounts (id_customer);
+CREATE INDEX IF NOT EXISTS sales_id_customer_idx ON sales (id_customer);
@@ -0,0 +1,9 @@
+-- Búsqueda de clientes (GET /customers/search).
+-- Los índices trigram van en 0003_customer_trigram_indexes, que espera a que
+-- pg_trgm esté instalado; este índice no depende de ninguna extensión.
+
+-- Texto completo sobre nombre y dirección. La expresión debe coincidir con
+-- CUSTOMER_DOCUMENT_SQL de customer_repository.py para que el índice se use.
+CREATE INDEX IF NOT EXISTS customers_search_document_idx ON customers USING gin (
+    to_tsvector('simple'::regconfig, coalesce(full_name, '') || ' ' || coalesce(address, ''))
+);
@@ -0,0 +1,7 @@
+-- requires: pg_trgm
+-- Índices trigram de la búsqueda de clientes: sirven a ILIKE '%término%' (y
+-- 'término%') sobre nombre y email. pg_trgm lo instala la migración public
+-- 0002_pg_trgm; mientras no esté instalado, esta migración queda pendiente
+-- (no se registra) y se aplica en el siguiente `flask migrations apply`.
+CREATE INDEX IF NOT EXISTS customers_full_name_trgm_idx ON customers USING gin (full_name public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS customers_email_trgm_idx ON customers USING gin (email public.gin_trgm_ops);
@@ -0,0 +1,3 @@
+-- Búsqueda de tenants por schema_name (tenant_middleware) y unicidad del schema.
+-- Las bases creadas con ddl-public.sql ya tienen el índice.
+CREATE UNIQUE INDEX IF NOT EXISTS tenants_schema_name_idx ON public.tenants (schema_name);
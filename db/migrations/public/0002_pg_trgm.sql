@@ -0,0 +1,11 @@
+-- pg_trgm para la búsqueda de clientes (GET /customers/search).
+-- Se instala una sola vez por base de datos, en public, para que sus operadores
+-- estén disponibles en el search_path de todos los tenants. Si el servidor no
+-- lo ofrece, la búsqueda trigram no tendrá índices y el resto sigue funcionando.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+    END IF;
+END
+$$;
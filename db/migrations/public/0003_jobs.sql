@@ -0,0 +1,19 @@
+-- Tabla jobs: trabajos en segundo plano (siempre en el schema public).
+-- Igual que en db/assets/ddl-public.sql, para las bases creadas antes de la cola de trabajos.
+CREATE TABLE IF NOT EXISTS public.jobs (
+    id SERIAL PRIMARY KEY,
+    job_type VARCHAR NOT NULL,
+    schema_name VARCHAR(255) NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    progress FLOAT NOT NULL DEFAULT 0,
+    params JSONB,
+    result JSONB,
+    error VARCHAR,
+    worker_id VARCHAR,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON public.jobs (status, id);
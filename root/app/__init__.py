@@ -1,59 +1,97 @@
+import importlib
 from flask import Flask
 from flask_cors import CORS
 from flask_injector import FlaskInjector
 from injector import singleton
 from app.extensions import db
+from app.extensions import tenant_cache
+from app.extensions import tenant_connections
+from app.extensions import query_cache
+from app.extensions import tenant_ddl
+from app.extensions import request_metrics
+from app.extensions import slow_queries
 from app.extensions import init_logging
+from app.config import get_config_object
+from app.middlewares.tenant_middleware import tenant_middleware
+from app.utils.json_provider import FastJSONProvider
+from app.utils.lazy_views import LazyBlueprints, import_models
 
-# Import Controllers
-from .controllers.tenants_controller import tenant_bp
-from .controllers.customer_controller import customer_bp
-from .controllers.order_controller import order_bp
-from .controllers.order_item_controller import order_item_bp
-from .controllers.product_controller import product_bp
-from .controllers.sales_controller import sale_bp
-from .controllers.credit_account_controller import credit_account_bp
-from .controllers.inventory_controller import inventory_bp
-
-# Import Services
-from .services.tenants_service import TenantService
-from .services.customer_service import CustomerService
-from .services.order_service import OrderService
-from .services.order_item_service import OrderItemService
-from .services.product_service import ProductService
-from .services.sale_service import SaleService
-from .services.credit_account_service import CreditAccountService
-from .services.inventory_service import InventoryService
+# Controllers: (module, blueprint), registered under /api/v1
+BLUEPRINTS = [
+    ('app.controllers.tenants_controller', 'tenant_bp'),
+    ('app.controllers.credit_account_controller', 'credit_account_bp'),
+    ('app.controllers.customer_controller', 'customer_bp'),
+    ('app.controllers.order_controller', 'order_bp'),
+    ('app.controllers.order_item_controller', 'order_item_bp'),
+    ('app.controllers.product_controller', 'product_bp'),
+    ('app.controllers.sales_controller', 'sale_bp'),
+    ('app.controllers.inventory_controller', 'inventory_bp'),
+    ('app.controllers.sales_report_controller', 'sales_report_bp'),
+    ('app.controllers.import_controller', 'import_bp'),
+    ('app.controllers.metrics_controller', 'metrics_bp'),
+]
+
+# Services: (module, class), bound as singletons
+SERVICES = [
+    ('app.services.tenants_service', 'TenantService'),
+    ('app.services.customer_service', 'CustomerService'),
+    ('app.services.order_service', 'OrderService'),
+    ('app.services.order_item_service', 'OrderItemService'),
+    ('app.services.product_service', 'ProductService'),
+    ('app.services.sale_service', 'SaleService'),
+    ('app.services.credit_account_service', 'CreditAccountService'),
+    ('app.services.inventory_service', 'InventoryService'),
+    ('app.services.rollup_service', 'RollupService'),
+    ('app.services.sales_report_service', 'SalesReportService'),
+    ('app.services.job_service', 'JobService'),
+    ('app.services.import_service', 'ImportService'),
+    ('app.services.provisioning_service', 'ProvisioningService'),
+    ('app.services.migration_service', 'MigrationService'),
+    ('app.services.index_advisor_service', 'IndexAdvisorService'),
+]
 
 def configure(binder):
-    binder.bind(TenantService, to=TenantService, scope=singleton)
-    binder.bind(CustomerService, to=CustomerService, scope=singleton)
-    binder.bind(OrderService, to=OrderService, scope=singleton)
-    binder.bind(OrderItemService, to=OrderItemService, scope=singleton)
-    binder.bind(ProductService, to=ProductService, scope=singleton)
-    binder.bind(SaleService, to=SaleService, scope=singleton)
-    binder.bind(CreditAccountService, to=CreditAccountService, scope=singleton)
-    binder.bind(InventoryService, to=InventoryService, scope=singleton)
-
-def create_app():
+    for module_name, class_name in SERVICES:
+        service = getattr(importlib.import_module(module_name), class_name)
+        binder.bind(service, to=service, scope=singleton)
+
+def create_app(config_object=None):
     app = Flask(__name__)
     CORS(app)
-    app.config.from_object('app.config.Config')
+    app.config.from_object(config_object or get_config_object())
+    app.json = FastJSONProvider(app)
 
+    tenant_connections.init_app(app)
     db.init_app(app)
+    query_cache.init_app(app)
+    tenant_cache.init_app(app)
+    tenant_ddl.init_app(app)
+    request_metrics.init_app(app)
+    slow_queries.init_app(app)
+    # Registered after request_metrics so tenant resolution is part of the measured request
+    app.before_request(tenant_middleware)
     logger = init_logging()
     logger.info(f"API INVOKE")
 
+    if app.config.get('LAZY_APP', False):
+        # Controllers and services are imported by the first request that needs them
+        import_models()
+        lazy_blueprints = LazyBlueprints(app, SERVICES)
+        for module_name, blueprint_attr in BLUEPRINTS:
+            lazy_blueprints.register(module_name, blueprint_attr, url_prefix='/api/v1')
+        app.injector = FlaskInjector(app=app, modules=[lazy_blueprints.bind_loaded_services]).injector
+        app.extensions['lazy_blueprints'] = lazy_blueprints
+        return app
+
     # Register blueprints
-    app.register_blueprint(tenant_bp, url_prefix='/api/v1')
-    app.register_blueprint(credit_account_bp, url_prefix='/api/v1')
-    app.register_blueprint(customer_bp, url_prefix='/api/v1')
-    app.register_blueprint(order_bp, url_prefix='/api/v1')
-    app.register_blueprint(order_item_bp, url_prefix='/api/v1')
-    app.register_blueprint(product_bp, url_prefix='/api/v1')
-    app.register_blueprint(sale_bp, url_prefix='/api/v1')
-    app.register_blueprint(inventory_bp, url_prefix='/api/v1')
-
-    FlaskInjector(app=app, modules=[configure])
+    for module_name, blueprint_attr in BLUEPRINTS:
+        blueprint = getattr(importlib.import_module(module_name), blueprint_attr)
+        app.register_blueprint(blueprint, url_prefix='/api/v1')
+
+    app.injector = FlaskInjector(app=app, modules=[configure]).injector
+
+    # CLI commands import every service, so they are only available in eager mode
+    from app.commands import register_commands
+    register_commands(app)
 
     return app
@@ -0,0 +1,174 @@
+import csv
+import json
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from app.services.rollup_service import RollupService
+from app.services.sales_report_service import SalesReportService
+from app.repositories.sales_report_repository import REPORT_PERIODS
+from app.worker import JobWorker
+from app.services.import_service import ImportService
+from app.utils.bulk_import import IMPORT_FIELDS, IMPORT_FORMATS, detect_format
+from app.services.provisioning_service import ProvisioningService
+from app.services.migration_service import MigrationService
+from app.services.index_advisor_service import IndexAdvisorService
+
+rollups_cli = AppGroup('rollups', help='Order and sales rollup maintenance.')
+
+@rollups_cli.command('rebuild')
+@click.option('--schema', 'schema_name', default=None, help='Tenant schema to rebuild (default: every tenant).')
+def rebuild_rollups(schema_name):
+    """Recomputes the rollup tables from orders, order_items and sales."""
+    results = current_app.injector.get(RollupService).rebuild(schema_name)
+    for result in results:
+        status = 'OK' if result['success'] else 'FAILED'
+        click.echo(f"{result['schema_name']}: {status} {result['message']}")
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
+
+sales_reports_cli = AppGroup('sales-reports', help='Sales report generation.')
+
+@sales_reports_cli.command('generate')
+@click.option('--schema', 'schema_name', default=None, help='Tenant schema to report on (default: every tenant).')
+@click.option('--type', 'report_types', multiple=True, type=click.Choice(list(REPORT_PERIODS)),
+              help='Report type to generate (repeatable, default: all).')
+@click.option('--since', type=click.DateTime(), default=None, help='Recompute the periods starting at this date.')
+def generate_sales_reports(schema_name, report_types, since):
+    """Builds the pending daily, weekly and monthly sales reports."""
+    outcomes = current_app.injector.get(SalesReportService).generate_for_tenants(schema_name, list(report_types), since)
+    for outcome in outcomes:
+        status = 'OK' if outcome['success'] else 'FAILED'
+        click.echo(f"{outcome['schema_name']}: {status} {outcome['message']}")
+    if not all(outcome['success'] for outcome in outcomes):
+        raise SystemExit(1)
+
+jobs_cli = AppGroup('jobs', help='Background job processing.')
+
+@jobs_cli.command('worker')
+@click.option('--threads', type=int, default=None, help='Jobs run in parallel by this worker (default: JOB_WORKER_THREADS).')
+@click.option('--once', is_flag=True, help='Exit once there are no more jobs to claim.')
+def run_job_worker(threads, once):
+    """Runs queued jobs until interrupted."""
+    worker = JobWorker(current_app._get_current_object(), threads=threads)
+    click.echo(f"Job worker {worker.worker_id} started with {worker.threads} threads")
+    processed = worker.run(stop_when_idle=once)
+    click.echo(f"Job worker stopped after {processed} jobs")
+
+@click.command('import-data')
+@click.argument('resource', type=click.Choice(list(IMPORT_FIELDS)))
+@click.argument('source', type=click.File('rb'))
+@click.option('--schema', 'schema_name', required=True, help='Tenant schema to load into.')
+@click.option('--format', 'import_format', type=click.Choice(IMPORT_FORMATS), default=None,
+              help='Input format (default: from the file extension, else ndjson).')
+@with_appcontext
+def import_data(resource, source, schema_name, import_format):
+    """Bulk loads a CSV or NDJSON file of customers, products or inventory with COPY."""
+    import_format = detect_format(filename=source.name, explicit=import_format)
+    summary = current_app.injector.get(ImportService).import_records(resource, source, import_format, schema_name)
+    for error in summary['errors']:
+        click.echo(f"row {error['row']}: {error['errors']}")
+    click.echo(f"{schema_name}.{resource}: {summary['imported']} imported, "
+               f"{summary['rejected']} rejected of {summary['received']} rows")
+
+tenants_cli = AppGroup('tenants', help='Tenant provisioning.')
+
+def read_tenants_file(source):
+    """Reads {tenant_name, schema_name} entries from a JSON list or a CSV with those columns."""
+    if source.name.lower().endswith('.csv'):
+        return list(csv.DictReader(source))
+    return json.load(source)
+
+@tenants_cli.command('provision')
+@click.option('--tenant', 'tenant_specs', multiple=True, metavar='NAME:SCHEMA',
+              help='Tenant to create as tenant_name:schema_name (repeatable).')
+@click.option('--file', 'source', type=click.File('r'), default=None,
+              help='JSON list or CSV file with tenant_name and schema_name.')
+@click.option('--workers', type=int, default=None, help='Tenants created in parallel (default: PROVISIONING_WORKERS).')
+def provision_tenants(tenant_specs, source, workers):
+    """Creates tenants and their schemas in parallel from the cached tenant DDL."""
+    tenants = read_tenants_file(source) if source else []
+    for spec in tenant_specs:
+        tenant_name, _, schema_name = spec.rpartition(':')
+        tenants.append({"tenant_name": tenant_name, "schema_name": schema_name})
+    if not tenants:
+        raise click.UsageError('Pass at least one --tenant or a --file.')
+
+    results = current_app.injector.get(ProvisioningService).provision_tenants(tenants, workers=workers)
+    for result in results:
+        status = 'OK' if result['success'] else 'FAILED'
+        click.echo(f"{result['schema_name']}: {status} {result['message']}")
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
+
+@tenants_cli.command('template')
+def build_tenant_template():
+    """Builds the empty template schema used by the warmup, or rebuilds it when the DDL changed."""
+    version = current_app.injector.get(ProvisioningService).ensure_template()
+    click.echo(f"{current_app.config.get('TENANT_TEMPLATE_SCHEMA', 'tenant_template')}: OK {version}")
+
+migrations_cli = AppGroup('migrations', help='Database and tenant schema migrations.')
+
+def echo_migration_results(results):
+    for result in results:
+        status = 'OK' if result['success'] else 'FAILED'
+        details = f" applied={result['applied']}" if result['applied'] else ''
+        details += f" pending={result['pending']}" if result['pending'] else ''
+        click.echo(f"{result['schema_name']}: {status} {result['message']}{details}")
+    if not all(result['success'] for result in results):
+        raise SystemExit(1)
+
+@migrations_cli.command('status')
+@click.option('--schema', 'schema_name', default=None, help='Tenant schema to check (default: every tenant).')
+@click.option('--workers', type=int, default=None, help='Tenants checked in parallel (default: MIGRATION_WORKERS).')
+def migrations_status(schema_name, workers):
+    """Lists the migrations pending in the public schema and every tenant schema."""
+    migration_service = current_app.injector.get(MigrationService)
+    results = [] if schema_name else [migration_service.migrate_public(dry_run=True)]
+    echo_migration_results(results + migration_service.migrate(schema_name, dry_run=True, workers=workers))
+
+@migrations_cli.command('apply')
+@click.option('--schema', 'schema_name', default=None, help='Tenant schema to migrate (default: every tenant).')
+@click.option('--target', type=int, default=None, help='Last migration version to apply (default: the latest).')
+@click.option('--dry-run', is_flag=True, help='Only report what would be applied.')
+@click.option('--workers', type=int, default=None, help='Tenants migrated in parallel (default: MIGRATION_WORKERS).')
+@click.option('--public-target', type=int, default=None, help='Last public migration version to apply (default: the latest).')
+def apply_migrations(schema_name, target, dry_run, workers, public_target):
+    """
+    Applies the pending public migrations and then the pending tenant migrations,
+    resuming where a previous run stopped. Tenants are skipped if a public migration fails.
+    """
+    migration_service = current_app.injector.get(MigrationService)
+    if not schema_name:
+        # Exits before the tenants when a public migration fails
+        echo_migration_results([migration_service.migrate_public(public_target, dry_run)])
+    echo_migration_results(migration_service.migrate(schema_name, target, dry_run, workers))
+
+indexes_cli = AppGroup('indexes', help='Index maintenance.')
+
+@indexes_cli.command('advise')
+@click.option('--schema', 'schema_name', default=None, help='Tenant schema to inspect (default: every tenant).')
+@click.option('--min-rows', type=int, default=10000, show_default=True, help='Ignore tables with fewer live rows.')
+@click.option('--min-seq-scans', type=int, default=50, show_default=True, help='Sequential scans needed to flag a table.')
+@click.option('--min-seq-ratio', type=click.FloatRange(0, 1), default=0.5, show_default=True,
+              help='Share of sequential scans needed to flag a table.')
+def advise_indexes(schema_name, min_rows, min_seq_scans, min_seq_ratio):
+    """Flags tenant tables read mostly with sequential scans, from pg_stat_user_tables."""
+    advice = current_app.injector.get(IndexAdvisorService).advise(schema_name, min_rows, min_seq_scans, min_seq_ratio)
+    for hotspot in advice['hotspots']:
+        click.echo(f"{hotspot['schema_name']}.{hotspot['table_name']}: {hotspot['seq_scan']} seq scans "
+                   f"({hotspot['seq_ratio']:.0%} of scans) reading {hotspot['seq_tup_read']} rows, "
+                   f"~{hotspot['rows_per_seq_scan']} per scan of {hotspot['live_rows']} live rows")
+    for foreign_key in advice['unindexed_foreign_keys']:
+        click.echo(f"{foreign_key['schema_name']}.{foreign_key['table_name']}.{foreign_key['column_name']}: "
+                   f"foreign key without an index")
+    if not advice['hotspots'] and not advice['unindexed_foreign_keys']:
+        click.echo("No sequential-scan hotspots found")
+
+def register_commands(app):
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(sales_reports_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(import_data)
+    app.cli.add_command(tenants_cli)
+    app.cli.add_command(migrations_cli)
+    app.cli.add_command(indexes_cli)
@@ -1,8 +1,159 @@
 import os
 from datetime import timedelta
 
+def env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+def engine_options(pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping=True, pool_use_lifo=True):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS from the given defaults. Every value can be
+    overridden with the matching DB_POOL_* environment variable. The sizing options
+    are dropped for databases that do not use a QueuePool (e.g. in-memory SQLite).
+    """
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', pool_recycle)),
+        'pool_pre_ping': env_bool('DB_POOL_PRE_PING', pool_pre_ping),
+        'pool_use_lifo': env_bool('DB_POOL_USE_LIFO', pool_use_lifo),
+    }
+
 class Config:
     #DATABASE CONFIGURATION
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    #CONNECTION POOL CONFIGURATION
+    # LIFO keeps the most recently used connections warm so idle ones can be recycled
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800)
+
+    #STARTUP CONFIGURATION
+    # Register controllers without importing them and create the engine on first use.
+    # Controllers and their services are imported by the first request that reaches them.
+    # CLI commands are only registered when this is off
+    LAZY_APP = env_bool('LAZY_APP', False)
+    # Warm the connection, mappers and hot statements while the Lambda container starts
+    # (wsgi.py). WARMUP_SCHEMA defaults to the empty template schema
+    WARMUP_ON_INIT = env_bool('WARMUP_ON_INIT', False)
+    WARMUP_SCHEMA = os.getenv('WARMUP_SCHEMA')
+    # Event sources answered as keep-warm pings instead of being passed to the app
+    WARMUP_EVENT_SOURCES = ['aws.events', 'serverless-plugin-warmup']
+
+    #INSTRUMENTATION CONFIGURATION
+    # Latency, SQL statements, DB, serialization and tenant resolution time per endpoint
+    # and tenant, kept in in-process histograms (GET /api/v1/admin/metrics)
+    REQUEST_METRICS_ENABLED = env_bool('REQUEST_METRICS_ENABLED', True)
+    SERVER_TIMING_HEADER = env_bool('SERVER_TIMING_HEADER', True)
+    # Endpoint/tenant pairs tracked; further tenants are reported as '_other'
+    REQUEST_METRICS_MAX_SERIES = int(os.getenv('REQUEST_METRICS_MAX_SERIES', 1000))
+    # Statements slower than the threshold are kept with their tenant, endpoint and
+    # redacted parameters (GET /api/v1/admin/slow_queries) and, when SLOW_QUERY_LOG_PATH
+    # is set, written as JSON lines to a rotating file
+    SLOW_QUERY_ENABLED = env_bool('SLOW_QUERY_ENABLED', True)
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 500))
+    SLOW_QUERY_BUFFER_SIZE = int(os.getenv('SLOW_QUERY_BUFFER_SIZE', 200))
+    SLOW_QUERY_LOG_PATH = os.getenv('SLOW_QUERY_LOG_PATH')
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.getenv('SLOW_QUERY_LOG_BACKUPS', 5))
+    # Fraction of slow SELECTs re-run with EXPLAIN (ANALYZE, BUFFERS). This executes the
+    # query again, so keep it low; 0 disables it
+    SLOW_QUERY_EXPLAIN_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_RATE', 0))
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', 5000))
+    # The /admin endpoints require it in the X-Admin-Token header; they answer 403 while it is unset
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+    #PAGINATION CONFIGURATION
+    # 'exact' runs COUNT(*), 'estimated' uses planner statistics, 'cached' reuses a recent
+    # COUNT(*) for the same tenant and filters. Clients can override it with ?count=
+    PAGINATION_COUNT_STRATEGY = os.getenv('PAGINATION_COUNT_STRATEGY', 'exact')
+    COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', 30))
+
+    #JSON CONFIGURATION
+    # Responses are encoded with orjson when installed. 'http' keeps the RFC 822 dates
+    # Flask has always returned, 'iso' switches to ISO 8601 (as in the exports)
+    JSON_DATETIME_FORMAT = os.getenv('JSON_DATETIME_FORMAT', 'http')
+
+    #EXPORT CONFIGURATION
+    # Rows fetched per round trip from the server-side cursor, and rows per streamed chunk
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', 500))
+
+    #IMPORT CONFIGURATION
+    # Row errors returned by a bulk import; further rejected rows are only counted
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))
+
+    #ROLLUP CONFIGURATION
+    # Serve statistics and top-N endpoints from the rollup tables. Enable only once
+    # `flask rollups rebuild` has installed them in every tenant schema
+    ORDER_ROLLUPS_ENABLED = env_bool('ORDER_ROLLUPS_ENABLED', False)
+    # Seconds a top-N result is reused for the same tenant and parameters.
+    # Writes to orders, order items, customers or products drop it earlier
+    TOP_N_CACHE_TTL = int(os.getenv('TOP_N_CACHE_TTL', 60))
+    # Cached query results kept across all tenants; the least recently used go first
+    QUERY_CACHE_MAX_SIZE = int(os.getenv('QUERY_CACHE_MAX_SIZE', 1024))
+
+    #JOB CONFIGURATION
+    # Background jobs (e.g. sales reports) run in `flask jobs worker` or the worker Lambda
+    JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 4))
+    JOB_MAX_PER_TENANT = int(os.getenv('JOB_MAX_PER_TENANT', 1))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2))
+    # Running jobs without a heartbeat for this many seconds are requeued (or failed
+    # after JOB_MAX_ATTEMPTS)
+    JOB_STALE_AFTER = int(os.getenv('JOB_STALE_AFTER', 1800))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+
+    #TENANT CACHE CONFIGURATION
+    TENANT_CACHE_TTL = int(os.getenv('TENANT_CACHE_TTL', 300))
+    TENANT_CACHE_MAX_SIZE = int(os.getenv('TENANT_CACHE_MAX_SIZE', 1024))
+
+    #TENANT CONNECTION CONFIGURATION
+    # 'search_path' switches the connection search_path per tenant,
+    # 'schema_translate' renders schema-qualified table names instead
+    TENANCY_MODE = os.getenv('TENANCY_MODE', 'search_path')
+    TENANT_CONNECTION_AFFINITY = env_bool('TENANT_CONNECTION_AFFINITY', True)
+
+    #TENANT PROVISIONING CONFIGURATION
+    # New tenant schemas run TENANT_DDL_PATH followed by the extra assets, read once at startup
+    TENANT_DDL_PATH = os.getenv('TENANT_DDL_PATH', 'db/assets/ddl.sql')
+    TENANT_DDL_EXTRA_PATHS = ['db/assets/rollups.sql', 'db/assets/sales_reports.sql']
+    # Empty schema built by `flask tenants template` for the warmup
+    TENANT_TEMPLATE_SCHEMA = os.getenv('TENANT_TEMPLATE_SCHEMA', 'tenant_template')
+    PROVISIONING_WORKERS = int(os.getenv('PROVISIONING_WORKERS', 4))
+
+    #TENANT MIGRATION CONFIGURATION
+    # Versioned NNNN_description.sql migrations applied to every tenant schema by
+    # `flask migrations apply`. New tenants are provisioned with all of them applied
+    TENANT_MIGRATIONS_PATH = os.getenv('TENANT_MIGRATIONS_PATH', 'db/migrations')
+    # Idempotent database-level migrations (public tables, extensions), applied first
+    PUBLIC_MIGRATIONS_PATH = os.getenv('PUBLIC_MIGRATIONS_PATH', 'db/migrations/public')
+    # Tenants migrated in parallel, capped by the connection pool size
+    MIGRATION_WORKERS = int(os.getenv('MIGRATION_WORKERS', 8))
+
+class LambdaConfig(Config):
+    #CONNECTION POOL CONFIGURATION
+    # A Lambda container serves one request at a time, so a single pooled connection is
+    # enough. The engine lives at module level in wsgi.py and survives warm invocations;
+    # pre-ping replaces connections the server dropped while the container was frozen.
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=1, max_overflow=0, pool_timeout=10, pool_recycle=300)
+
+    #STARTUP CONFIGURATION
+    # Cold starts only pay for the controller the first request needs
+    LAZY_APP = env_bool('LAZY_APP', True)
+    WARMUP_ON_INIT = env_bool('WARMUP_ON_INIT', True)
+
+    #JOB CONFIGURATION
+    # The worker Lambda shares the single pooled connection above, so it runs one job
+    # at a time; raising this needs DB_POOL_SIZE raised to match
+    JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 1))
+
+def get_config_object():
+    """
+    Returns the import path of the configuration class to load. APP_CONFIG wins,
+    otherwise the Lambda profile is used when running inside AWS Lambda.
+    """
+    if os.getenv('APP_CONFIG'):
+        return os.getenv('APP_CONFIG')
+    if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+        return 'app.config.LambdaConfig'
+    return 'app.config.Config'
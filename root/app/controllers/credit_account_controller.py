@@ -3,12 +3,21 @@ from werkzeug.exceptions import BadRequest, NotFound, InternalServerError
 from app.services.credit_account_service import CreditAccountService
 from flask_injector import inject
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
+from app.utils.export import export_response, get_export_format
 import logging
 
 # Configuración del blueprint para el controlador
 credit_account_bp = Blueprint('credit_account_bp', __name__)
 logger = logging.getLogger(__name__)
 
+def get_credit_account_filters():
+    return {
+        "id_customer": request.args.get('id_customer', type=int),
+        "min_balance": request.args.get('min_balance', type=float),
+        "max_balance": request.args.get('max_balance', type=float)
+    }
+
 @credit_account_bp.route('/credit_accounts', methods=['POST'])
 @inject
 def create_credit_account(credit_account_service: CreditAccountService):
@@ -66,15 +75,18 @@ def get_credit_accounts_paginated(credit_account_service: CreditAccountService):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        filters = {
-            "id_customer": request.args.get('id_customer', type=int),
-            "min_balance": request.args.get('min_balance', type=float),
-            "max_balance": request.args.get('max_balance', type=float)
-        }
+        filters = get_credit_account_filters()
+
+        keyset = get_keyset_args()
+        if keyset:
+            accounts, next_id, total = credit_account_service.get_credit_accounts_keyset(
+                per_page, keyset.after_id, keyset.include_total, **filters
+            )
+            return create_response(success=True, result=keyset_result(accounts, next_id, total), status=200)
 
         accounts, total = credit_account_service.get_credit_accounts_paginated(page, per_page, **filters)
 
-        return create_response(success=True, result={"data": [account.as_dict() for account in accounts], "total": total}, status=200)
+        return create_response(success=True, result={"data": accounts, "total": total}, status=200)
 
     except BadRequest as e:
         logger.error(f"Bad request: {e}")
@@ -103,3 +115,18 @@ def delete_credit_account(credit_account_service: CreditAccountService, account_
     except Exception as e:
         logger.error(f"Internal error: {e}")
         return create_response(success=False, message="An internal error occurred while deleting the credit account.", status=500)
+
+@credit_account_bp.route('/credit_accounts/export', methods=['GET'])
+@inject
+def export_credit_accounts(credit_account_service: CreditAccountService):
+    """
+    Endpoint to stream credit accounts as NDJSON (default) or CSV (``format=csv``).
+    """
+    try:
+        export_format = get_export_format()
+        return export_response(credit_account_service.export_credit_accounts(**get_credit_account_filters()), 'credit_accounts', export_format)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error exporting credit accounts: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -4,6 +4,9 @@ from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
 from app.services.customer_service import CustomerService
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result, encode_rank_cursor, decode_rank_cursor
+from app.utils.request_args import get_int_arg
+from app.utils.export import export_response, get_export_format
 
 # Logger configuration
 logger = logging.getLogger(__name__)
@@ -11,6 +14,13 @@ logger = logging.getLogger(__name__)
 # Define the Blueprint for Customer
 customer_bp = Blueprint('customers', __name__)
 
+def get_customer_filters():
+    return {
+        "full_name": request.args.get('full_name'),
+        "email": request.args.get('email')
+    }
+
+
 @customer_bp.route('/customers', methods=['POST'])
 @inject
 def create_customer(customer_service: CustomerService):
@@ -92,14 +102,18 @@ def get_all_customers(customer_service: CustomerService):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        filters = {
-            "full_name": request.args.get('full_name'),
-            "email": request.args.get('email')
-        }
+        filters = get_customer_filters()
+
+        keyset = get_keyset_args()
+        if keyset:
+            customers, next_id, total = customer_service.get_customers_keyset(
+                per_page, keyset.after_id, keyset.include_total, **filters
+            )
+            return create_response(success=True, result=keyset_result(customers, next_id, total), status=200)
 
         customers, total = customer_service.get_customers_paginated(page, per_page, **filters)
 
-        return create_response(success=True, result={"data": [customer.as_dict() for customer in customers], "total": total}, status=200)
+        return create_response(success=True, result={"data": customers, "total": total}, status=200)
 
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
@@ -110,6 +124,39 @@ def get_all_customers(customer_service: CustomerService):
         return create_response(success=False, message="Internal server error", status=500)
 
 
+@customer_bp.route('/customers/search', methods=['GET'])
+@inject
+def search_customers(customer_service: CustomerService):
+    """
+    Endpoint to search customers, best matches first.
+
+    Query:
+        - q (str): The search term.
+        - mode (str): 'trigram' (default) matches name or email as you type,
+          'fulltext' matches every word against name and address.
+        - per_page (int): Results per page (1-100, default 10).
+        - cursor (str): ``next_cursor`` of the previous page.
+    """
+    try:
+        per_page = get_int_arg('per_page', 10, minimum=1, maximum=100)
+        cursor = request.args.get('cursor')
+        after = decode_rank_cursor(cursor) if cursor else None
+
+        rows, next_position = customer_service.search_customers(
+            request.args.get('q'), request.args.get('mode', 'trigram'), per_page, after
+        )
+        data = [{**customer.as_dict(), "rank": float(rank)} for customer, rank in rows]
+        return create_response(success=True, result={"data": data, "next_cursor": encode_rank_cursor(*next_position) if next_position else None}, status=200)
+
+    except BadRequest as e:
+        logger.warning(f"Bad request: {e}")
+        return create_response(success=False, message=str(e), status=400)
+
+    except Exception as e:
+        logger.error(f"Error searching customers: {e}", exc_info=True)
+        return create_response(success=False, message="Internal server error", status=500)
+
+
 @customer_bp.route('/customers/<int:customer_id>', methods=['GET'])
 @inject
 def get_customer_by_id(customer_id, customer_service: CustomerService):
@@ -158,3 +205,19 @@ def delete_customer(customer_id, customer_service: CustomerService):
     except Exception as e:
         logger.error(f"Error deleting customer with ID {customer_id}: {e}", exc_info=True)
         return create_response(success=False, message="Internal server error", status=500)
+
+
+@customer_bp.route('/customers/export', methods=['GET'])
+@inject
+def export_customers(customer_service: CustomerService):
+    """
+    Endpoint to stream customers as NDJSON (default) or CSV (``format=csv``).
+    """
+    try:
+        export_format = get_export_format()
+        return export_response(customer_service.export_customers(**get_customer_filters()), 'customers', export_format)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error exporting customers: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -0,0 +1,40 @@
+import logging
+from flask import Blueprint, request
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest
+from app.services.import_service import ImportService
+from app.utils.response import create_response
+from app.utils.bulk_import import detect_format
+
+logger = logging.getLogger(__name__)
+
+import_bp = Blueprint('imports', __name__)
+
+@import_bp.route('/import/<string:resource>', methods=['POST'])
+@inject
+def import_records(resource, import_service: ImportService):
+    """
+    Endpoint to bulk load customers, products or inventory into the current tenant.
+
+    The body is the CSV or NDJSON content itself, or a multipart upload in the
+    ``file`` field. The format comes from ``?format=``, the file extension or the
+    Content-Type (default: ndjson).
+    """
+    try:
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if upload is None:
+                raise BadRequest("Missing 'file' upload")
+            stream = upload.stream
+            import_format = detect_format(upload.mimetype, upload.filename, request.args.get('format'))
+        else:
+            stream = request.stream
+            import_format = detect_format(request.mimetype, explicit=request.args.get('format'))
+
+        summary = import_service.import_records(resource, stream, import_format)
+        return create_response(success=True, result=summary, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error importing {resource}: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -4,11 +4,20 @@ from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
 from app.services.inventory_service import InventoryService
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
+from app.utils.export import export_response, get_export_format
 
 logger = logging.getLogger(__name__)
 
 inventory_bp = Blueprint('inventory', __name__)
 
+def get_inventory_filters():
+    return {
+        "product_id": request.args.get('product_id', type=int),
+        "min_stock": request.args.get('min_stock', type=int),
+        "max_stock": request.args.get('max_stock', type=int)
+    }
+
 @inventory_bp.route('/inventory', methods=['POST'])
 @inject
 def create_inventory_item(inventory_service: InventoryService):
@@ -52,15 +61,18 @@ def get_inventory_items_paginated(inventory_service: InventoryService):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        filters = {
-            "product_id": request.args.get('product_id', type=int),
-            "min_stock": request.args.get('min_stock', type=int),
-            "max_stock": request.args.get('max_stock', type=int)
-        }
+        filters = get_inventory_filters()
+
+        keyset = get_keyset_args()
+        if keyset:
+            items, next_id, total = inventory_service.get_inventory_items_keyset(
+                per_page, keyset.after_id, keyset.include_total, **filters
+            )
+            return create_response(success=True, result=keyset_result(items, next_id, total), status=200)
 
         items, total = inventory_service.get_inventory_items_paginated(page, per_page, **filters)
 
-        return create_response(success=True, result={"data": [item.as_dict() for item in items], "total": total}, status=200)
+        return create_response(success=True, result={"data": items, "total": total}, status=200)
 
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
@@ -88,3 +100,18 @@ def delete_inventory_item(item_id, inventory_service: InventoryService):
     except Exception as e:
         logger.error(f"Error deleting inventory item with ID {item_id}: {e}")
         return create_response(success=False, message="Internal server error", status=500)
+
+@inventory_bp.route('/inventory/export', methods=['GET'])
+@inject
+def export_inventory(inventory_service: InventoryService):
+    """
+    Endpoint to stream inventory as NDJSON (default) or CSV (``format=csv``).
+    """
+    try:
+        export_format = get_export_format()
+        return export_response(inventory_service.export_inventory_items(**get_inventory_filters()), 'inventory', export_format)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error exporting inventory: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -0,0 +1,84 @@
+import hmac
+import logging
+from flask import Blueprint, current_app, request
+from werkzeug.exceptions import BadRequest, Forbidden
+from app.extensions import request_metrics, slow_queries
+from app.utils.request_args import get_int_arg
+from app.utils.response import create_response
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def check_admin_token():
+    """Admin endpoints require X-Admin-Token to match ADMIN_TOKEN, and are closed while it is unset."""
+    token = current_app.config.get('ADMIN_TOKEN')
+    if not token:
+        raise Forbidden("Admin endpoints are disabled: ADMIN_TOKEN is not configured")
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token):
+        raise Forbidden("Invalid admin token")
+
+@metrics_bp.route('/admin/metrics', methods=['GET'])
+def get_request_metrics():
+    """
+    Endpoint to dump the request histograms of this process, per endpoint
+    and tenant. Optional filters: endpoint, tenant.
+    """
+    try:
+        check_admin_token()
+        snapshot = request_metrics.snapshot(endpoint=request.args.get('endpoint'), tenant=request.args.get('tenant'))
+        return create_response(success=True, result=snapshot, status=200)
+    except Forbidden as e:
+        return create_response(success=False, message=e.description, status=403)
+    except Exception as e:
+        logger.error(f"Error fetching request metrics: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@metrics_bp.route('/admin/metrics', methods=['DELETE'])
+def reset_request_metrics():
+    """
+    Endpoint to clear the request histograms of this process.
+    """
+    try:
+        check_admin_token()
+        request_metrics.reset()
+        return create_response(success=True, message="Request metrics reset", status=200)
+    except Forbidden as e:
+        return create_response(success=False, message=e.description, status=403)
+    except Exception as e:
+        logger.error(f"Error resetting request metrics: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@metrics_bp.route('/admin/slow_queries', methods=['GET'])
+def get_slow_queries():
+    """
+    Endpoint to list the slow queries recorded by this process, newest first,
+    with the count and total time per tenant. Optional filters: schema, limit.
+    """
+    try:
+        check_admin_token()
+        limit = get_int_arg('limit', default=None, minimum=1, maximum=1000)
+        snapshot = slow_queries.snapshot(schema_name=request.args.get('schema'), limit=limit)
+        return create_response(success=True, result=snapshot, status=200)
+    except Forbidden as e:
+        return create_response(success=False, message=e.description, status=403)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error fetching slow queries: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@metrics_bp.route('/admin/slow_queries', methods=['DELETE'])
+def reset_slow_queries():
+    """
+    Endpoint to clear the slow queries recorded by this process.
+    """
+    try:
+        check_admin_token()
+        slow_queries.reset()
+        return create_response(success=True, message="Slow queries cleared", status=200)
+    except Forbidden as e:
+        return create_response(success=False, message=e.description, status=403)
+    except Exception as e:
+        logger.error(f"Error clearing slow queries: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -2,13 +2,22 @@ import logging
 from flask import Blueprint, request
 from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
-from app.services.order_service import OrderService
+from app.services.order_service import OrderService, COMPLETED_STATUS
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
+from app.utils.export import export_response, get_export_format
+from app.utils.request_args import get_datetime_arg, get_int_arg, get_until_arg
 
 logger = logging.getLogger(__name__)
 
 order_bp = Blueprint('orders', __name__)
 
+def get_order_filters():
+    return {
+        "status": request.args.get('status'),
+        "id_customer": request.args.get('id_customer', type=int)
+    }
+
 @order_bp.route('/orders', methods=['POST'])
 @inject
 def create_order(order_service: OrderService):
@@ -25,11 +34,8 @@ def create_order(order_service: OrderService):
             order_items=data.get('order_items')  # Pasamos order_items para la creación
         )
 
-        # Convertimos la orden y sus items a formato dict
-        order_data = new_order.as_dict()
-        order_data['order_items'] = [item.as_dict() for item in new_order.order_items]
-
-        return create_response(success=True, result=order_data, status=201)
+        # as_dict ya incluye los items de la orden
+        return create_response(success=True, result=new_order.as_dict(), status=201)
 
     except BadRequest as e:
         logger.error(f"Bad request: {e}")
@@ -38,6 +44,33 @@ def create_order(order_service: OrderService):
         logger.error(f"Error creating order: {e}")
         return create_response(success=False, message="Internal server error", status=500)
 
+@order_bp.route('/orders/bulk', methods=['POST'])
+@inject
+def create_orders_bulk(order_service: OrderService):
+    try:
+        data = request.get_json()
+        orders = data.get('orders') if isinstance(data, dict) else data
+        if not orders or not isinstance(orders, list):
+            raise BadRequest("Body must contain a non-empty 'orders' list")
+
+        for index, order in enumerate(orders):
+            if not isinstance(order, dict) or 'payment_method' not in order or 'id_customer' not in order:
+                raise BadRequest(f"Order {index}: missing required fields 'payment_method' and 'id_customer'")
+            for item in order.get('order_items') or []:
+                if not isinstance(item, dict) or not {'quantity', 'price', 'id_product'} <= item.keys():
+                    raise BadRequest(f"Order {index}: order items require 'quantity', 'price' and 'id_product'")
+
+        new_orders = order_service.create_orders_bulk(orders)
+
+        return create_response(success=True, result=[order.as_dict() for order in new_orders], status=201)
+
+    except BadRequest as e:
+        logger.error(f"Bad request: {e}")
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error creating orders in bulk: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
 @order_bp.route('/orders/<int:order_id>', methods=['GET'])
 @inject
 def get_order_by_id(order_id, order_service: OrderService):
@@ -46,11 +79,8 @@ def get_order_by_id(order_id, order_service: OrderService):
         if not order:
             raise NotFound("Order not found")
 
-        # Incluir order_items en la respuesta
-        order_data = order.as_dict()
-        order_data['order_items'] = [item.as_dict() for item in order.order_items]
-
-        return create_response(success=True, result=order_data, status=200)
+        # as_dict ya incluye los items de la orden
+        return create_response(success=True, result=order.as_dict(), status=200)
 
     except NotFound as e:
         return create_response(success=False, message=str(e), status=404)
@@ -64,20 +94,19 @@ def get_all_orders_paginated(order_service: OrderService):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
-        filters = {
-            "status": request.args.get('status'),
-            "id_customer": request.args.get('id_customer', type=int)
-        }
+        filters = get_order_filters()
 
-        orders, total = order_service.get_orders_paginated(page, per_page, **filters)
+        keyset = get_keyset_args()
+        if keyset:
+            orders, next_id, total = order_service.get_orders_keyset(
+                per_page, keyset.after_id, keyset.include_total, **filters
+            )
+            return create_response(success=True, result=keyset_result(orders, next_id, total), status=200)
 
-        # Incluir order_items en cada orden
-        orders_data = [{
-            **order.as_dict(),
-            "order_items": [item.as_dict() for item in order.order_items]
-        } for order in orders]
+        # Las órdenes ya vienen como dicts con sus items, proyectados por el repositorio
+        orders, total = order_service.get_orders_paginated(page, per_page, **filters)
 
-        return create_response(success=True, result={"data": orders_data, "total": total}, status=200)
+        return create_response(success=True, result={"data": orders, "total": total}, status=200)
 
     except BadRequest as e:
         logger.warning(f"Bad request: {e}")
@@ -130,18 +159,33 @@ def delete_order(order_id, order_service: OrderService):
 @inject
 def get_order_statistics(order_service: OrderService):
     try:
-        stats = order_service.get_statistics()
+        stats = order_service.get_statistics(
+            since=get_datetime_arg('since'),
+            until=get_until_arg()
+        )
         return create_response(success=True, result=stats, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
     except Exception as e:
         logger.error(f"Error fetching order statistics: {e}")
         return create_response(success=False, message="Internal server error", status=500)
 
+def get_top_n_args():
+    return {
+        "limit": get_int_arg('limit', 3, minimum=1, maximum=100),
+        "since": get_datetime_arg('since'),
+        "until": get_until_arg(),
+        "status": request.args.get('status', COMPLETED_STATUS)
+    }
+
 @order_bp.route('/orders/top-customers', methods=['GET'])
 @inject
 def get_top_customers(order_service: OrderService):
     try:
-        top_customers = order_service.get_top_customers()
+        top_customers = order_service.get_top_customers(**get_top_n_args())
         return create_response(success=True, result=top_customers, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
     except Exception as e:
         logger.error(f"Error fetching top customers: {e}")
         return create_response(success=False, message="Internal server error", status=500)
@@ -150,9 +194,25 @@ def get_top_customers(order_service: OrderService):
 @inject
 def get_top_selling_products(order_service: OrderService):
     try:
-        top_products = order_service.get_top_selling_products()
+        top_products = order_service.get_top_selling_products(**get_top_n_args())
         return create_response(success=True, result=top_products, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
     except Exception as e:
         logger.error(f"Error fetching top selling products: {e}")
         return create_response(success=False, message="Internal server error", status=500)
 
+@order_bp.route('/orders/export', methods=['GET'])
+@inject
+def export_orders(order_service: OrderService):
+    """
+    Endpoint to stream orders as NDJSON (default) or CSV (``format=csv``).
+    """
+    try:
+        export_format = get_export_format()
+        return export_response(order_service.export_orders(**get_order_filters()), 'orders', export_format)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error exporting orders: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -4,6 +4,7 @@ from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
 from app.services.order_item_service import OrderItemService
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +40,16 @@ def get_order_items_paginated(order_item_service: OrderItemService):
         per_page = request.args.get('per_page', 10, type=int)
         id_order = request.args.get('id_order', type=int)
 
+        keyset = get_keyset_args()
+        if keyset:
+            items, next_id, total = order_item_service.get_order_items_keyset(
+                per_page, keyset.after_id, keyset.include_total, id_order=id_order
+            )
+            return create_response(success=True, result=keyset_result(items, next_id, total), status=200)
+
         items, total = order_item_service.get_order_items_paginated(page, per_page, id_order=id_order)
 
-        return create_response(success=True, result={"data": [item.as_dict() for item in items], "total": total}, status=200)
+        return create_response(success=True, result={"data": items, "total": total}, status=200)
 
     except BadRequest as e:
         return create_response(success=False, message=str(e), status=400)
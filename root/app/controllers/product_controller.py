@@ -4,6 +4,7 @@ from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
 from app.services.product_service import ProductService
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +38,15 @@ def get_products_paginated(product_service: ProductService):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        keyset = get_keyset_args()
+        if keyset:
+            products, next_id, total = product_service.get_products_keyset(per_page, keyset.after_id, keyset.include_total)
+            return create_response(success=True, result=keyset_result(products, next_id, total), status=200)
+
         products, total = product_service.get_products_paginated(page, per_page)
-        return create_response(success=True, result={"data": [product.as_dict() for product in products], "total": total}, status=200)
+        return create_response(success=True, result={"data": products, "total": total}, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
     except Exception as e:
         logger.error(f"Error fetching paginated products: {e}")
         return create_response(success=False, message="Internal server error", status=500)
@@ -4,6 +4,8 @@ from flask_injector import inject
 from werkzeug.exceptions import BadRequest, NotFound
 from app.services.sale_service import SaleService
 from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
+from app.utils.export import export_response, get_export_format
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +38,15 @@ def get_sales_paginated(sale_service: SaleService):
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        keyset = get_keyset_args()
+        if keyset:
+            sales, next_id, total = sale_service.get_sales_keyset(per_page, keyset.after_id, keyset.include_total)
+            return create_response(success=True, result=keyset_result(sales, next_id, total), status=200)
+
         sales, total = sale_service.get_sales_paginated(page, per_page)
-        return create_response(success=True, result={"data": [sale.as_dict() for sale in sales], "total": total}, status=200)
+        return create_response(success=True, result={"data": sales, "total": total}, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
     except Exception as e:
         logger.error(f"Error fetching paginated sales: {e}")
         return create_response(success=False, message="Internal server error", status=500)
@@ -69,3 +78,18 @@ def delete_sale(sale_id, sale_service: SaleService):
     except Exception as e:
         logger.error(f"Error deleting sale with ID {sale_id}: {e}")
         return create_response(success=False, message="Internal server error", status=500)
+
+@sale_bp.route('/sales/export', methods=['GET'])
+@inject
+def export_sales(sale_service: SaleService):
+    """
+    Endpoint to stream sales as NDJSON (default) or CSV (``format=csv``).
+    """
+    try:
+        export_format = get_export_format()
+        return export_response(sale_service.export_sales(), 'sales', export_format)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error exporting sales: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -0,0 +1,127 @@
+import logging
+from flask import Blueprint, request
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest, NotFound
+from app.services.sales_report_service import SalesReportService
+from app.services.job_service import JobService
+from app.utils.response import create_response
+from app.utils.pagination import get_keyset_args, keyset_result
+from app.utils.request_args import get_datetime_arg, get_until_arg
+
+logger = logging.getLogger(__name__)
+
+sales_report_bp = Blueprint('sales_reports', __name__)
+
+def parse_report_types(data):
+    report_types = data.get('report_types')
+    if report_types is not None and (not isinstance(report_types, list) or not report_types):
+        raise BadRequest("'report_types' must be a non-empty list")
+    return report_types
+
+@sales_report_bp.route('/sales_reports/generate', methods=['POST'])
+@inject
+def generate_sales_reports(sales_report_service: SalesReportService):
+    """
+    Endpoint to build the pending sales reports of the current tenant.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        report_types = parse_report_types(data)
+        since = get_datetime_arg('since')
+
+        results = sales_report_service.generate_reports(report_types=report_types, since=since)
+        return create_response(success=True, result=results, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error generating sales reports: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@sales_report_bp.route('/sales_reports/jobs', methods=['POST'])
+@inject
+def enqueue_sales_reports_job(job_service: JobService):
+    """
+    Endpoint to queue the sales report generation of the current tenant.
+    Poll GET /sales_reports/jobs/<job_id> for its progress and results.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        report_types = parse_report_types(data)
+        since = get_datetime_arg('since')
+
+        job = job_service.enqueue_sales_reports(report_types=report_types, since=since)
+        return create_response(success=True, result=job.as_dict(), status=202)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error queueing sales reports job: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@sales_report_bp.route('/sales_reports/jobs/<int:job_id>', methods=['GET'])
+@inject
+def get_sales_reports_job(job_id, job_service: JobService):
+    try:
+        job = job_service.get_job(job_id)
+        return create_response(success=True, result=job.as_dict(), status=200)
+    except NotFound as e:
+        return create_response(success=False, message=str(e), status=404)
+    except Exception as e:
+        logger.error(f"Error fetching job by ID {job_id}: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@sales_report_bp.route('/sales_reports', methods=['GET'])
+@inject
+def get_sales_reports_paginated(sales_report_service: SalesReportService):
+    """
+    Endpoint to retrieve paginated sales reports with optional filters.
+    ``scope=tenant`` returns the tenant-wide reports, ``scope=customer`` the per-customer ones.
+    """
+    try:
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 10, type=int)
+        filters = {
+            "report_type": request.args.get('report_type'),
+            "id_customer": request.args.get('id_customer', type=int),
+            "scope": request.args.get('scope'),
+            "since": get_datetime_arg('since'),
+            "until": get_until_arg()
+        }
+
+        keyset = get_keyset_args()
+        if keyset:
+            reports, next_id, total = sales_report_service.get_sales_reports_keyset(
+                per_page, keyset.after_id, keyset.include_total, **filters
+            )
+            return create_response(success=True, result=keyset_result(reports, next_id, total), status=200)
+
+        reports, total = sales_report_service.get_sales_reports_paginated(page, per_page, **filters)
+        return create_response(success=True, result={"data": reports, "total": total}, status=200)
+    except BadRequest as e:
+        return create_response(success=False, message=str(e), status=400)
+    except Exception as e:
+        logger.error(f"Error fetching paginated sales reports: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@sales_report_bp.route('/sales_reports/<int:report_id>', methods=['GET'])
+@inject
+def get_sales_report_by_id(report_id, sales_report_service: SalesReportService):
+    try:
+        report = sales_report_service.get_sales_report_by_id(report_id)
+        return create_response(success=True, result=report.as_dict(), status=200)
+    except NotFound as e:
+        return create_response(success=False, message=str(e), status=404)
+    except Exception as e:
+        logger.error(f"Error fetching sales report by ID {report_id}: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+@sales_report_bp.route('/sales_reports/<int:report_id>', methods=['DELETE'])
+@inject
+def delete_sales_report(report_id, sales_report_service: SalesReportService):
+    try:
+        sales_report_service.delete_sales_report(report_id)
+        return create_response(success=True, result={"deleted_id": report_id}, status=200)
+    except NotFound as e:
+        return create_response(success=False, message=str(e), status=404)
+    except Exception as e:
+        logger.error(f"Error deleting sales report: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
@@ -46,6 +46,38 @@ def create_tenant(tenant_service: TenantService):
         return create_response.internal_server_error()
 
 
+@tenant_bp.route('/tenants/batch', methods=['POST'])
+@inject
+def create_tenants(tenant_service: TenantService):
+    """
+    Endpoint to create many tenants concurrently.
+
+    Body:
+        JSON:
+            - tenants (list): Objects with tenant_name and schema_name.
+
+    Returns:
+        JSON: The outcome of every tenant, in request order. The status is 201 when
+        all of them were created and 207 otherwise.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        results = tenant_service.create_tenants(data.get('tenants'))
+
+        all_created = all(result['success'] for result in results)
+        return create_response(
+            success=all_created,
+            result=results,
+            status=201 if all_created else 207,
+            message="Tenants created" if all_created else "Some tenants could not be created"
+        )
+    except BadRequest as e:
+        return create_response(success=False, message=e.description, status=400)
+    except Exception as e:
+        logger.error(f"Error creating tenants: {e}")
+        return create_response(success=False, message="Internal server error", status=500)
+
+
 @tenant_bp.route('/tenants', methods=['GET'])
 @inject
 def get_all_tenants(tenant_service: TenantService):
@@ -1,7 +1,19 @@
-from flask_sqlalchemy import SQLAlchemy
+from app.utils.lazy_engine import LazySQLAlchemy
+from app.utils.tenant_cache import TenantCache
+from app.utils.tenant_connection import TenantConnectionManager
+from app.utils.query_cache import QueryCache
+from app.utils.tenant_ddl import TenantDDL
+from app.utils.request_metrics import RequestMetrics
+from app.utils.slow_queries import SlowQueryLog
 import logging
 
-db = SQLAlchemy()
+db = LazySQLAlchemy()
+tenant_cache = TenantCache()
+tenant_connections = TenantConnectionManager(db)
+query_cache = QueryCache(db)
+tenant_ddl = TenantDDL()
+request_metrics = RequestMetrics()
+slow_queries = SlowQueryLog()
 
 def init_logging():
     logging.basicConfig(level=logging.INFO, 
@@ -1,14 +1,27 @@
 from flask import g, request, abort
-from sqlalchemy import text
 from app.models.tenants import Tenant
-from app.extensions import db
+from app.extensions import db, tenant_cache, tenant_connections
+from app.utils.request_metrics import TENANT_PHASE, timed
 
-EXCLUDED_PREFIXES = ['/api/v1/tenants']
+EXCLUDED_PREFIXES = ['/api/v1/tenants', '/api/v1/admin']
 
+def find_tenant(schema_name):
+    """Looks up a tenant by schema name in the public schema."""
+    # Qualify the 'tenants' table with the public schema instead of switching the
+    # search_path, so the connection keeps whatever tenant it is bound to
+    return Tenant.query.execution_options(
+        schema_translate_map={None: 'public'}
+    ).filter_by(schema_name=schema_name).first()
+
+@timed(TENANT_PHASE)
 def tenant_middleware():
     """
     Middleware to set the tenant schema for the current request, excluding routes that start with certain prefixes.
     """
+    # CORS preflight requests carry no X-Tenant header
+    if request.method == 'OPTIONS':
+        return
+
     # Check if the requested route starts with an excluded prefix
     if any(request.path.startswith(prefix) for prefix in EXCLUDED_PREFIXES):
         return  # Skip middleware logic for excluded routes
@@ -18,26 +31,27 @@ def tenant_middleware():
     if not tenant_name:
         abort(400, description="Tenant name is required in the X-Tenant header")
 
-    # Perform tenant lookup in the "public" schema first
-    try:
-        # Ensure the search_path is set to 'public' to query the 'tenants' table
-        query_public_schema = text('SET search_path TO public')
-        db.session.execute(query_public_schema)
+    # Resolve the tenant from the in-process cache before touching the public schema
+    tenant = tenant_cache.get(tenant_name)
 
-        # Look for the tenant in the 'tenants' table within the public schema
-        tenant = Tenant.query.filter_by(schema_name=tenant_name).first()
-    except Exception as e:
-        abort(500, description=f"Error querying tenant information: {str(e)}")
+    if tenant is None:
+        # Perform tenant lookup in the "public" schema first
+        try:
+            tenant = find_tenant(tenant_name)
+        except Exception as e:
+            abort(500, description=f"Error querying tenant information: {str(e)}")
+
+        if not tenant:
+            abort(404, description=f"Tenant {tenant_name} not found")
 
-    if not tenant:
-        abort(404, description=f"Tenant {tenant_name} not found")
+        tenant = tenant_cache.set(tenant_name, tenant)
 
     schema_name = tenant.schema_name
 
     try:
-        # Set the search_path to the tenant schema and 'public'
-        query_set_schema = text(f'SET search_path TO {schema_name}, public')
-        db.session.execute(query_set_schema)
+        # Bind the request to the tenant schema and 'public'; skipped when the
+        # pooled connection already points at this tenant
+        tenant_connections.use_schema(schema_name)
     except Exception as e:
         db.session.rollback()
         abort(500, description=f"Error setting search path for tenant schema: {str(e)}")
@@ -0,0 +1,18 @@
+from app import db
+
+class CustomerOrdersRollup(db.Model):
+    __tablename__ = 'customer_orders_rollup'
+
+    id_customer = db.Column(db.Integer, db.ForeignKey('customers.id', ondelete='CASCADE'), primary_key=True)
+    completed_orders = db.Column(db.Integer, nullable=False, default=0)
+    total_sales = db.Column(db.Float, nullable=False, default=0.0)
+
+    def as_dict(self):
+        return {
+            "id_customer": self.id_customer,
+            "completed_orders": self.completed_orders,
+            "total_sales": self.total_sales
+        }
+
+    def __repr__(self):
+        return f"<CustomerOrdersRollup {self.id_customer}>"
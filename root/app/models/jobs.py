@@ -0,0 +1,53 @@
+from datetime import datetime
+from app import db
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    # Los jobs viven siempre en el schema public, sin importar el tenant de la sesión
+    __table_args__ = {'schema': 'public'}
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String, nullable=False)
+    schema_name = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String, nullable=False, default=QUEUED)
+    progress = db.Column(db.Float, nullable=False, default=0)
+    params = db.Column(db.JSON, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.String, nullable=True)
+    worker_id = db.Column(db.String, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, job_type, schema_name, params=None):
+        self.job_type = job_type
+        self.schema_name = schema_name
+        self.params = params
+        self.status = self.QUEUED
+        self.progress = 0
+        self.attempts = 0
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "progress": self.progress,
+            "params": self.params,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.job_type}>"
@@ -0,0 +1,16 @@
+from app import db
+
+class OrderStatusRollup(db.Model):
+    __tablename__ = 'order_status_rollup'
+
+    status = db.Column(db.String, primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def as_dict(self):
+        return {
+            "status": self.status,
+            "order_count": self.order_count
+        }
+
+    def __repr__(self):
+        return f"<OrderStatusRollup {self.status}>"
@@ -0,0 +1,16 @@
+from app import db
+
+class ProductSalesRollup(db.Model):
+    __tablename__ = 'product_sales_rollup'
+
+    id_product = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    quantity_sold = db.Column(db.Integer, nullable=False, default=0)
+
+    def as_dict(self):
+        return {
+            "id_product": self.id_product,
+            "quantity_sold": self.quantity_sold
+        }
+
+    def __repr__(self):
+        return f"<ProductSalesRollup {self.id_product}>"
@@ -11,9 +11,9 @@ class SalesReport(db.Model):
     most_sold_product = db.Column(db.String, nullable=True)
     least_sold_product = db.Column(db.String, nullable=True)
     pending_collections = db.Column(db.Float, nullable=True)
-    id_customer = db.Column(db.Integer, db.ForeignKey('customers.id', ondelete='CASCADE'), nullable=False)
+    id_customer = db.Column(db.Integer, db.ForeignKey('customers.id', ondelete='CASCADE'), nullable=True)
 
-    def __init__(self, report_type, total_sales, id_customer, report_date=None, most_sold_product=None, 
+    def __init__(self, report_type, total_sales, id_customer=None, report_date=None, most_sold_product=None, 
                  least_sold_product=None, pending_collections=None):
         self.report_type = report_type
         self.report_date = report_date if report_date else datetime.utcnow()
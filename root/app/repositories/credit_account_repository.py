@@ -1,5 +1,9 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
+from app.utils.export import stream_columns
 from app.models.credit_accounts import CreditAccount
 
 class CreditAccountRepository:
@@ -41,7 +45,7 @@ class CreditAccountRepository:
             raise e
 
     @staticmethod
-    def get_credit_accounts_paginated(page, per_page, id_customer=None, min_balance=None, max_balance=None):
+    def _filtered_query(id_customer=None, min_balance=None, max_balance=None):
         query = CreditAccount.query
         if id_customer:
             query = query.filter_by(id_customer=id_customer)
@@ -49,9 +53,24 @@ class CreditAccountRepository:
             query = query.filter(CreditAccount.credit_balance >= min_balance)
         if max_balance:
             query = query.filter(CreditAccount.credit_balance <= max_balance)
-        
+        return query
+
+    @staticmethod
+    def get_credit_accounts_paginated(page, per_page, **filters):
+        query = CreditAccountRepository._filtered_query(**filters)
+
         # Orden descendente por id
         query = query.order_by(CreditAccount.id.desc())
 
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-        return paginated.items, paginated.total
+        paginated = project_columns(query, CreditAccount).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return rows_as_dicts(paginated.items), count_rows(query)
+
+    @staticmethod
+    def get_credit_accounts_keyset(per_page, after_id=None, include_total=False, **filters):
+        query = CreditAccountRepository._filtered_query(**filters)
+        items, next_id, total = keyset_paginate(project_columns(query, CreditAccount), CreditAccount.id, per_page, after_id, include_total)
+        return rows_as_dicts(items), next_id, total
+
+    @staticmethod
+    def stream_credit_accounts(**filters):
+        return stream_columns(CreditAccountRepository._filtered_query(**filters), CreditAccount)
@@ -1,7 +1,39 @@
+import re
+from sqlalchemy import Numeric, case, cast, func, literal_column, or_, text, tuple_
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
+from app.utils.export import stream_columns
 from app.models.customers import Customer
 
+SEARCH_TRIGRAM = 'trigram'
+SEARCH_FULLTEXT = 'fulltext'
+SEARCH_MODES = (SEARCH_TRIGRAM, SEARCH_FULLTEXT)
+
+# Debe coincidir con la expresión de customers_search_document_idx (db/migrations/0002_customer_search.sql)
+CUSTOMER_DOCUMENT_SQL = "to_tsvector('simple'::regconfig, coalesce(customers.full_name, '') || ' ' || coalesce(customers.address, ''))"
+
+# Con menos caracteres no hay trigramas completos: se busca por prefijo, que el índice sí resuelve
+TRIGRAM_MIN_CONTAINS_LENGTH = 3
+
+# Decimales con los que se compara el ranking en la paginación por cursor
+SEARCH_RANK_SCALE = 6
+
+# pg_trgm es opcional (db/migrations/public/0002_pg_trgm.sql): se comprueba una vez
+# por base de datos y, sin él, el modo trigram ordena solo con ILIKE
+_trigram_available = {}
+
+
+def escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def prefix_tsquery(term):
+    """Builds a tsquery matching every word of ``term`` as a prefix ("ana ro" -> "ana:* & ro:*")."""
+    return ' & '.join(f"{word}:*" for word in re.findall(r'\w+', term))
+
 class CustomerRepository:
     
     @staticmethod
@@ -23,18 +55,92 @@ class CustomerRepository:
             raise e
         
     @staticmethod
-    def get_customers_paginated(page, per_page, full_name=None, email=None):
+    def _filtered_query(full_name=None, email=None):
         query = Customer.query
         if full_name:
             query = query.filter(Customer.full_name.ilike(f"%{full_name}%"))
         if email:
             query = query.filter(Customer.email.ilike(f"%{email}%"))
-        
+        return query
+
+    @staticmethod
+    def get_customers_paginated(page, per_page, **filters):
+        query = CustomerRepository._filtered_query(**filters)
+
         # Orden descendente por id para mostrar los clientes más recientes primero
         query = query.order_by(Customer.id.desc())
 
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-        return paginated.items, paginated.total
+        paginated = project_columns(query, Customer).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return rows_as_dicts(paginated.items), count_rows(query)
+
+    @staticmethod
+    def get_customers_keyset(per_page, after_id=None, include_total=False, **filters):
+        query = CustomerRepository._filtered_query(**filters)
+        items, next_id, total = keyset_paginate(project_columns(query, Customer), Customer.id, per_page, after_id, include_total)
+        return rows_as_dicts(items), next_id, total
+
+    @staticmethod
+    def stream_customers(**filters):
+        return stream_columns(CustomerRepository._filtered_query(**filters), Customer)
+
+    @staticmethod
+    def trigram_available():
+        """Whether pg_trgm is installed, checked once per database."""
+        url = str(db.engine.url)
+        if url not in _trigram_available:
+            _trigram_available[url] = db.session.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            ).scalar()
+        return _trigram_available[url]
+
+    @staticmethod
+    def search_customers(term, mode=SEARCH_TRIGRAM, per_page=10, after=None):
+        """
+        Ranked customer search, best matches first.
+
+        ``trigram`` matches ``term`` inside the name or email (as a prefix for
+        terms shorter than three characters) through the pg_trgm indexes and
+        ranks by word similarity; without pg_trgm, names and then emails that
+        start with ``term`` rank first. ``fulltext`` matches every word of
+        ``term`` as a prefix of a word of the name or address and ranks with ts_rank.
+
+        Args:
+            after (tuple): (rank, id) of the last row of the previous page.
+
+        Returns:
+            tuple: (rows, next_position). Every row is (Customer, rank);
+            ``next_position`` is None on the last page.
+        """
+        if mode == SEARCH_FULLTEXT:
+            document = literal_column(CUSTOMER_DOCUMENT_SQL)
+            tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), prefix_tsquery(term))
+            condition = document.op('@@')(tsquery)
+            raw_rank = func.ts_rank(document, tsquery)
+        else:
+            pattern = escape_like(term) + '%'
+            if len(term) >= TRIGRAM_MIN_CONTAINS_LENGTH:
+                pattern = '%' + pattern
+            condition = or_(Customer.full_name.ilike(pattern, escape='\\'), Customer.email.ilike(pattern, escape='\\'))
+            if CustomerRepository.trigram_available():
+                raw_rank = func.greatest(func.word_similarity(term, Customer.full_name), func.word_similarity(term, Customer.email))
+            else:
+                prefix = escape_like(term) + '%'
+                raw_rank = case(
+                    (Customer.full_name.ilike(prefix, escape='\\'), 1.0),
+                    (Customer.email.ilike(prefix, escape='\\'), 0.75),
+                    else_=0.5,
+                )
+
+        # Rounded numeric ranks compare exactly against the value carried in the cursor
+        rank = func.round(cast(raw_rank, Numeric), SEARCH_RANK_SCALE).label('rank')
+        query = db.session.query(Customer, rank).filter(condition)
+        if after is not None:
+            query = query.filter(tuple_(func.round(cast(raw_rank, Numeric), SEARCH_RANK_SCALE), Customer.id) < tuple_(*after))
+
+        rows = query.order_by(rank.desc(), Customer.id.desc()).limit(per_page + 1).all()
+        items = rows[:per_page]
+        next_position = (items[-1][1], items[-1][0].id) if len(rows) > per_page and items else None
+        return items, next_position
 
     @staticmethod
     def get_customer_by_id(customer_id):
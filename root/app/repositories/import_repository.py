@@ -0,0 +1,68 @@
+from sqlalchemy import text
+from app.extensions import db
+
+STAGING_TABLE = 'import_rows'
+
+# Filas que violarían las restricciones de la tabla destino. Se eliminan del staging
+# y se informan como errores de fila en lugar de abortar toda la importación.
+CONFLICT_SQL = {
+    'customers': [
+        f"""DELETE FROM {STAGING_TABLE} s
+        WHERE EXISTS (SELECT 1 FROM customers c WHERE c.email = s.email)
+        RETURNING s.row_number, 'email already exists' AS reason""",
+        f"""DELETE FROM {STAGING_TABLE} s
+        WHERE EXISTS (SELECT 1 FROM {STAGING_TABLE} f WHERE f.email = s.email AND f.row_number < s.row_number)
+        RETURNING s.row_number, 'duplicate email in import' AS reason"""
+    ],
+    'products': [],
+    'inventory': [
+        f"""DELETE FROM {STAGING_TABLE} s
+        WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.id = s.product_id)
+        RETURNING s.row_number, 'product not found' AS reason"""
+    ]
+}
+
+class ImportRepository:
+
+    @staticmethod
+    def create_staging_table(table, columns):
+        """
+        Creates a temporary table with the types of ``columns`` of ``table`` but
+        none of its constraints or defaults. It is dropped on commit or rollback.
+        """
+        column_list = ', '.join(columns)
+        db.session.execute(text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT 0 AS row_number, {column_list} FROM {table} WITH NO DATA"
+        ))
+
+    @staticmethod
+    def copy_into_staging(columns, stream):
+        """Streams CSV rows into the staging table with COPY ... FROM STDIN."""
+        column_list = ', '.join(columns)
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {STAGING_TABLE} (row_number, {column_list}) FROM STDIN WITH (FORMAT csv)", stream)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def reject_conflicts(table):
+        """
+        Removes the staged rows that would violate a constraint of ``table``.
+
+        Returns:
+            list: (row_number, reason) of every rejected row.
+        """
+        rejected = []
+        for statement in CONFLICT_SQL[table]:
+            rejected.extend(db.session.execute(text(statement)).all())
+        return rejected
+
+    @staticmethod
+    def insert_from_staging(table, columns):
+        column_list = ', '.join(columns)
+        result = db.session.execute(text(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {STAGING_TABLE} ORDER BY row_number"
+        ))
+        return result.rowcount
@@ -0,0 +1,36 @@
+from sqlalchemy import bindparam, text
+from app.extensions import db
+
+# Estadísticas de acceso de las tablas de los schemas indicados, acumuladas desde
+# el último pg_stat_reset.
+TABLE_SCANS_SQL = text("""
+SELECT schemaname AS schema_name, relname AS table_name, seq_scan, seq_tup_read,
+       COALESCE(idx_scan, 0) AS idx_scan, n_live_tup
+FROM pg_stat_user_tables
+WHERE schemaname IN :schemas
+""").bindparams(bindparam('schemas', expanding=True))
+
+# Claves foráneas cuya primera columna no encabeza ningún índice de la tabla.
+UNINDEXED_FOREIGN_KEYS_SQL = text("""
+SELECT n.nspname AS schema_name, t.relname AS table_name, a.attname AS column_name
+FROM pg_constraint c
+JOIN pg_class t ON t.oid = c.conrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+WHERE c.contype = 'f' AND n.nspname IN :schemas
+  AND NOT EXISTS (
+      SELECT 1 FROM pg_index i
+      WHERE i.indrelid = c.conrelid AND i.indkey[0] = c.conkey[1]
+  )
+ORDER BY n.nspname, t.relname, a.attname
+""").bindparams(bindparam('schemas', expanding=True))
+
+class IndexAdvisorRepository:
+
+    @staticmethod
+    def get_table_scans(schemas):
+        return db.session.execute(TABLE_SCANS_SQL, {"schemas": list(schemas)}).mappings().all()
+
+    @staticmethod
+    def get_unindexed_foreign_keys(schemas):
+        return db.session.execute(UNINDEXED_FOREIGN_KEYS_SQL, {"schemas": list(schemas)}).mappings().all()
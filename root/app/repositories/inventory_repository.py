@@ -1,5 +1,9 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
+from app.utils.export import stream_columns
 from app.models.inventory import Inventory
 
 class InventoryRepository:
@@ -27,7 +31,7 @@ class InventoryRepository:
             raise e
 
     @staticmethod
-    def get_inventory_items_paginated(page, per_page, product_id=None, min_stock=None, max_stock=None):
+    def _filtered_query(product_id=None, min_stock=None, max_stock=None):
         query = Inventory.query
         if product_id:
             query = query.filter_by(product_id=product_id)
@@ -35,12 +39,27 @@ class InventoryRepository:
             query = query.filter(Inventory.stock_quantity >= min_stock)
         if max_stock is not None:
             query = query.filter(Inventory.stock_quantity <= max_stock)
-        
+        return query
+
+    @staticmethod
+    def get_inventory_items_paginated(page, per_page, **filters):
+        query = InventoryRepository._filtered_query(**filters)
+
         # Orden descendente por id para mostrar los elementos más recientes primero
         query = query.order_by(Inventory.id.desc())
 
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-        return paginated.items, paginated.total
+        paginated = project_columns(query, Inventory).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return rows_as_dicts(paginated.items), count_rows(query)
+
+    @staticmethod
+    def get_inventory_items_keyset(per_page, after_id=None, include_total=False, **filters):
+        query = InventoryRepository._filtered_query(**filters)
+        items, next_id, total = keyset_paginate(project_columns(query, Inventory), Inventory.id, per_page, after_id, include_total)
+        return rows_as_dicts(items), next_id, total
+
+    @staticmethod
+    def stream_inventory_items(**filters):
+        return stream_columns(InventoryRepository._filtered_query(**filters), Inventory)
 
     @staticmethod
     def delete_inventory_item(item_id):
@@ -0,0 +1,113 @@
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models.jobs import Job
+
+# Toma el siguiente job en cola cuyo tenant no haya alcanzado el máximo de jobs en
+# ejecución. El advisory lock serializa las reclamaciones entre workers para que el
+# límite por tenant se respete; SKIP LOCKED evita esperar por filas ya tomadas.
+CLAIM_SQL = """
+UPDATE public.jobs
+SET status = 'running', worker_id = :worker_id, attempts = attempts + 1,
+    started_at = :now, heartbeat_at = :now
+WHERE id = (
+    SELECT j.id FROM public.jobs j
+    WHERE j.status = 'queued'
+      AND j.schema_name NOT IN (
+          SELECT schema_name FROM public.jobs
+          WHERE status = 'running'
+          GROUP BY schema_name
+          HAVING COUNT(*) >= :max_per_tenant
+      )
+    ORDER BY j.id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id
+"""
+
+class JobRepository:
+
+    @staticmethod
+    def create_job(job_type, schema_name, params=None):
+        try:
+            new_job = Job(job_type=job_type, schema_name=schema_name, params=params)
+            db.session.add(new_job)
+            db.session.commit()
+            return new_job
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_job_by_id(job_id, schema_name):
+        """Jobs are only visible to the tenant that enqueued them."""
+        try:
+            return Job.query.filter_by(id=job_id, schema_name=schema_name).first()
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def claim_next_job(worker_id, max_per_tenant):
+        try:
+            db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext('jobs:claim'))"))
+            job_id = db.session.execute(text(CLAIM_SQL), {
+                "worker_id": worker_id,
+                "max_per_tenant": max_per_tenant,
+                "now": datetime.utcnow()
+            }).scalar()
+            db.session.commit()
+            return db.session.get(Job, job_id) if job_id else None
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def update_progress(job_id, progress):
+        try:
+            db.session.query(Job).filter_by(id=job_id).update(
+                {"progress": progress, "heartbeat_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def finish_job(job_id, status, result=None, error=None):
+        try:
+            values = {"status": status, "result": result, "error": error, "finished_at": datetime.utcnow()}
+            if status == Job.SUCCEEDED:
+                values["progress"] = 1
+            db.session.query(Job).filter_by(id=job_id).update(values, synchronize_session=False)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def requeue_stale_jobs(stale_before, max_attempts):
+        """
+        Returns running jobs whose worker stopped reporting progress to the
+        queue, or fails them once they have used up ``max_attempts``.
+
+        Returns:
+            int: Number of jobs requeued or failed.
+        """
+        try:
+            stale = Job.query.filter(Job.status == Job.RUNNING, Job.heartbeat_at < stale_before) \
+                .with_for_update(skip_locked=True).all()
+            for job in stale:
+                if job.attempts >= max_attempts:
+                    job.status = Job.FAILED
+                    job.error = "Worker stopped responding"
+                    job.finished_at = datetime.utcnow()
+                else:
+                    job.status = Job.QUEUED
+                    job.worker_id = None
+            db.session.commit()
+            return len(stale)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
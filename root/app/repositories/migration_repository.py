@@ -0,0 +1,37 @@
+from sqlalchemy import text
+from app.extensions import db
+from app.utils.migrations import SCHEMA_MIGRATIONS_TABLE, migrations_table_ddl
+
+class MigrationRepository:
+
+    @staticmethod
+    def lock(schema_name):
+        """Serializes migrations of ``schema_name`` until the transaction ends."""
+        db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock_name))"), {"lock_name": f"migrations:{schema_name}"})
+
+    @staticmethod
+    def ensure_table(table=SCHEMA_MIGRATIONS_TABLE):
+        """Creates the migrations table (in the schema of the current search_path when unqualified) if missing."""
+        db.session.execute(text(migrations_table_ddl(table)))
+
+    @staticmethod
+    def table_exists(table=SCHEMA_MIGRATIONS_TABLE):
+        return db.session.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": table}).scalar()
+
+    @staticmethod
+    def get_installed_extensions():
+        return set(db.session.execute(text("SELECT extname FROM pg_extension")).scalars())
+
+    @staticmethod
+    def get_applied(table=SCHEMA_MIGRATIONS_TABLE):
+        """Returns {version: checksum} of the migrations recorded in ``table``."""
+        return dict(db.session.execute(text(f"SELECT version, checksum FROM {table}")).all())
+
+    @staticmethod
+    def apply(migration, table=SCHEMA_MIGRATIONS_TABLE):
+        """Runs ``migration`` and records it. Must run inside the caller's transaction."""
+        db.session.execute(text(migration.sql))
+        db.session.execute(
+            text(f"INSERT INTO {table} (version, name, checksum) VALUES (:version, :name, :checksum)"),
+            {"version": migration.version, "name": migration.name, "checksum": migration.checksum}
+        )
@@ -1,5 +1,8 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
 from app.models.order_items import OrderItem
 
 class OrderItemRepository:
@@ -21,12 +24,23 @@ class OrderItemRepository:
             raise e
 
     @staticmethod
-    def get_order_items_paginated(page, per_page, id_order=None):
+    def _filtered_query(id_order=None):
         query = OrderItem.query
         if id_order:
             query = query.filter_by(id_order=id_order)
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-        return paginated.items, paginated.total
+        return query
+
+    @staticmethod
+    def get_order_items_paginated(page, per_page, id_order=None):
+        query = OrderItemRepository._filtered_query(id_order=id_order)
+        paginated = project_columns(query, OrderItem).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return rows_as_dicts(paginated.items), count_rows(query)
+
+    @staticmethod
+    def get_order_items_keyset(per_page, after_id=None, include_total=False, id_order=None):
+        query = OrderItemRepository._filtered_query(id_order=id_order)
+        items, next_id, total = keyset_paginate(project_columns(query, OrderItem), OrderItem.id, per_page, after_id, include_total)
+        return rows_as_dicts(items), next_id, total
 
     @staticmethod
     def get_order_item_by_id(order_item_id):
@@ -1,21 +1,44 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
-from sqlalchemy import func, desc
-from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import attach_children, project_columns, rows_as_dicts
+from app.utils.export import stream_query
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 from app.models.orders import Order
 from app.models.order_items import OrderItem
 from app.models.customers import Customer
+from app.models.products import Product
 
 class OrderRepository:
     
     @staticmethod
-    def create_order(payment_method, id_customer, delivery_date=None, status='pending'):
+    def _build_order(payment_method, id_customer, delivery_date=None, status='pending', order_items=None):
+        new_order = Order(
+            payment_method=payment_method,
+            id_customer=id_customer,
+            delivery_date=delivery_date,
+            status=status
+        )
+        # Items are attached through the relationship so the flush batches them
+        # into a single multi-row INSERT (insertmanyvalues) after the order row
+        new_order.order_items = [
+            OrderItem(
+                quantity=item['quantity'],
+                price=item['price'],
+                id_order=None,
+                id_product=item['id_product']
+            )
+            for item in order_items or []
+        ]
+        return new_order
+
+    @staticmethod
+    def create_order(payment_method, id_customer, delivery_date=None, status='pending', order_items=None):
         try:
-            new_order = Order(
-                payment_method=payment_method,
-                id_customer=id_customer,
-                delivery_date=delivery_date,
-                status=status
+            new_order = OrderRepository._build_order(
+                payment_method, id_customer, delivery_date, status, order_items
             )
             db.session.add(new_order)
             db.session.commit()
@@ -25,23 +48,75 @@ class OrderRepository:
             raise e
 
     @staticmethod
-    def get_orders_paginated(page, per_page, status=None, id_customer=None):
-        query = Order.query
+    def create_orders_bulk(orders):
+        """
+        Inserts many orders and their items in a single transaction.
+        Either every order is stored or none is.
+        """
+        try:
+            new_orders = [
+                OrderRepository._build_order(
+                    order['payment_method'],
+                    order['id_customer'],
+                    order.get('delivery_date'),
+                    order.get('status', 'pending'),
+                    order.get('order_items')
+                )
+                for order in orders
+            ]
+            db.session.add_all(new_orders)
+            db.session.flush()
+            order_ids = [order.id for order in new_orders]
+            db.session.commit()
+            # The commit expires every order; reload them with their items in two
+            # queries instead of refreshing each order and its items one by one
+            reloaded = {
+                order.id: order
+                for order in Order.query.options(selectinload(Order.order_items)).filter(Order.id.in_(order_ids))
+            }
+            return [reloaded[order_id] for order_id in order_ids]
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _filtered_query(status=None, id_customer=None, with_items=True):
+        # Load the items of the whole page with a single SELECT ... WHERE id_order IN (...)
+        query = Order.query.options(selectinload(Order.order_items)) if with_items else Order.query
         if status:
             query = query.filter_by(status=status)
         if id_customer:
             query = query.filter_by(id_customer=id_customer)
+        return query
+
+    @staticmethod
+    def get_orders_paginated(page, per_page, **filters):
+        # The page is projected to columns; attach_children loads the items with one query
+        query = OrderRepository._filtered_query(with_items=False, **filters)
 
         # Cambiamos la ordenación para que sea descendente
         query = query.order_by(Order.id.desc())  # Orden descendente para que el último sea el primero
 
-        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-        return paginated.items, paginated.total
+        paginated = project_columns(query, Order).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return attach_children(rows_as_dicts(paginated.items), OrderItem, 'id_order', 'order_items'), count_rows(query)
+
+    @staticmethod
+    def get_orders_keyset(per_page, after_id=None, include_total=False, **filters):
+        query = OrderRepository._filtered_query(with_items=False, **filters)
+        items, next_id, total = keyset_paginate(project_columns(query, Order), Order.id, per_page, after_id, include_total)
+        return attach_children(rows_as_dicts(items), OrderItem, 'id_order', 'order_items'), next_id, total
+
+    @staticmethod
+    def stream_orders(**filters):
+        # selectinload loads the items of each batch of orders with one extra query
+        query = OrderRepository._filtered_query(**filters).order_by(Order.id)
+        for order in stream_query(query).scalars():
+            yield order.as_dict()
 
     @staticmethod
     def get_order_by_id(order_id):
         try:
-            return Order.query.get(order_id)
+            return db.session.get(Order, order_id, options=[selectinload(Order.order_items)])
         except SQLAlchemyError as e:
             raise e
 
@@ -81,33 +156,53 @@ class OrderRepository:
         
     # Métodos de conteo y estadísticas
     @staticmethod
-    def get_total_orders():
-        return db.session.query(func.count(Order.id)).scalar()
+    def get_order_counts_by_status(since=None, until=None):
+        """
+        Counts orders per status in a single GROUP BY pass, optionally limited
+        to orders placed in [since, until).
+        """
+        query = db.session.query(Order.status, func.count(Order.id))
+        if since:
+            query = query.filter(Order.order_date >= since)
+        if until:
+            query = query.filter(Order.order_date < until)
+        return dict(query.group_by(Order.status).all())
 
     @staticmethod
-    def get_total_completed_orders():
-        return db.session.query(func.count(Order.id)).filter(Order.status == 'Completada').scalar()
-
-    @staticmethod
-    def get_total_pending_orders():
-        return db.session.query(func.count(Order.id)).filter(Order.status == 'Pendiente').scalar()
+    def _apply_window(query, since=None, until=None, status=None):
+        if status:
+            query = query.filter(Order.status == status)
+        if since:
+            query = query.filter(Order.order_date >= since)
+        if until:
+            query = query.filter(Order.order_date < until)
+        return query
 
     @staticmethod
-    def get_top_customers_by_sales(limit=3):
-        return db.session.query(
+    def get_top_customers(limit=3, since=None, until=None, status=None):
+        """Customers with the most orders in ``status`` placed in [since, until)."""
+        order_count = func.count(Order.id)
+        query = db.session.query(
             Customer.id,
             Customer.full_name,
-            func.count(Order.id).label("total_orders")
-        ).join(Order, Order.id_customer == Customer.id) \
-         .group_by(Customer.id) \
-         .order_by(desc("total_orders")) \
-         .limit(limit).all()
+            order_count.label('order_count')
+        ).join(Order, Order.id_customer == Customer.id)
+        query = OrderRepository._apply_window(query, since, until, status)
+        return query.group_by(Customer.id, Customer.full_name) \
+            .order_by(order_count.desc(), Customer.id) \
+            .limit(limit).all()
 
     @staticmethod
-    def get_top_selling_products(limit=3):
-        return db.session.query(
-            OrderItem.id_product,
-            func.sum(OrderItem.quantity).label("total_quantity")
-        ).group_by(OrderItem.id_product) \
-         .order_by(desc("total_quantity")) \
-         .limit(limit).all()
+    def get_top_selling_products(limit=3, since=None, until=None, status=None):
+        """Products with the most units sold in orders in ``status`` placed in [since, until)."""
+        quantity_sold = func.sum(OrderItem.quantity)
+        query = db.session.query(
+            Product.id,
+            Product.name,
+            quantity_sold.label('quantity_sold')
+        ).join(OrderItem, OrderItem.id_product == Product.id) \
+         .join(Order, Order.id == OrderItem.id_order)
+        query = OrderRepository._apply_window(query, since, until, status)
+        return query.group_by(Product.id, Product.name) \
+            .order_by(quantity_sold.desc(), Product.id) \
+            .limit(limit).all()
@@ -1,5 +1,8 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
 from app.models.products import Product
 
 class ProductRepository:
@@ -24,8 +27,17 @@ class ProductRepository:
     def get_products_paginated(page, per_page):
         try:
             # Orden descendente por id para mostrar los productos más recientes primero
-            paginated = Product.query.order_by(Product.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
-            return paginated.items, paginated.total
+            query = Product.query.order_by(Product.id.desc())
+            paginated = project_columns(query, Product).paginate(page=page, per_page=per_page, error_out=False, count=False)
+            return rows_as_dicts(paginated.items), count_rows(query)
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def get_products_keyset(per_page, after_id=None, include_total=False):
+        try:
+            items, next_id, total = keyset_paginate(project_columns(Product.query, Product), Product.id, per_page, after_id, include_total)
+            return rows_as_dicts(items), next_id, total
         except SQLAlchemyError as e:
             raise e
 
@@ -0,0 +1,40 @@
+from sqlalchemy import text
+from sqlalchemy.schema import CreateSchema, DropSchema
+from app.extensions import db
+
+class ProvisioningRepository:
+
+    @staticmethod
+    def schema_exists(schema_name):
+        return db.session.execute(
+            text("SELECT to_regnamespace(:schema_name) IS NOT NULL"), {"schema_name": schema_name}
+        ).scalar()
+
+    @staticmethod
+    def get_schema_comment(schema_name):
+        return db.session.execute(
+            text("SELECT obj_description(to_regnamespace(:schema_name), 'pg_namespace')"), {"schema_name": schema_name}
+        ).scalar()
+
+    @staticmethod
+    def lock(lock_name):
+        """Serializes work on ``lock_name`` until the transaction ends."""
+        db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock_name))"), {"lock_name": lock_name})
+
+    @staticmethod
+    def create_schema(schema_name):
+        db.session.execute(CreateSchema(schema_name))
+
+    @staticmethod
+    def drop_schema(schema_name):
+        db.session.execute(DropSchema(schema_name, cascade=True, if_exists=True))
+
+    @staticmethod
+    def comment_schema(schema_name, comment):
+        # COMMENT no admite parámetros; schema_name ya fue validado como identificador
+        db.session.execute(text(f"COMMENT ON SCHEMA {schema_name} IS '{comment}'"))
+
+    @staticmethod
+    def execute_script(script):
+        """Runs a multi-statement script in one round trip."""
+        db.session.execute(text(script))
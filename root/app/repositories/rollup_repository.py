@@ -0,0 +1,85 @@
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+from app.models.customers import Customer
+from app.models.products import Product
+from app.models.order_status_rollups import OrderStatusRollup
+from app.models.product_sales_rollups import ProductSalesRollup
+from app.models.customer_orders_rollups import CustomerOrdersRollup
+
+COMPLETED_STATUS = 'Completada'
+
+# Recalcula las rollups desde cero. Las escrituras quedan bloqueadas mientras tanto
+# (SHARE MODE) para que los triggers no se mezclen con el recálculo.
+REBUILD_SQL = f"""
+LOCK TABLE orders, order_items, sales IN SHARE MODE;
+TRUNCATE order_status_rollup, product_sales_rollup, customer_orders_rollup;
+
+INSERT INTO order_status_rollup (status, order_count)
+SELECT status, COUNT(*) FROM orders GROUP BY status;
+
+INSERT INTO product_sales_rollup (id_product, quantity_sold)
+SELECT oi.id_product, SUM(oi.quantity)
+FROM order_items oi
+JOIN orders o ON o.id = oi.id_order
+WHERE o.status = '{COMPLETED_STATUS}'
+GROUP BY oi.id_product;
+
+INSERT INTO customer_orders_rollup (id_customer, completed_orders, total_sales)
+SELECT c.id, COALESCE(o.completed_orders, 0), COALESCE(s.total_sales, 0)
+FROM customers c
+LEFT JOIN (
+    SELECT id_customer, COUNT(*) AS completed_orders FROM orders
+    WHERE status = '{COMPLETED_STATUS}' GROUP BY id_customer
+) o ON o.id_customer = c.id
+LEFT JOIN (
+    SELECT id_customer, SUM(total_amount) AS total_sales FROM sales GROUP BY id_customer
+) s ON s.id_customer = c.id
+WHERE o.id_customer IS NOT NULL OR s.id_customer IS NOT NULL;
+"""
+
+class RollupRepository:
+
+    @staticmethod
+    def get_order_counts_by_status():
+        return dict(db.session.query(OrderStatusRollup.status, OrderStatusRollup.order_count)
+                    .filter(OrderStatusRollup.order_count > 0).all())
+
+    @staticmethod
+    def get_top_customers(limit=3):
+        return db.session.query(
+            Customer.id,
+            Customer.full_name,
+            CustomerOrdersRollup.completed_orders.label('order_count')
+        ).join(Customer, Customer.id == CustomerOrdersRollup.id_customer) \
+         .filter(CustomerOrdersRollup.completed_orders > 0) \
+         .order_by(CustomerOrdersRollup.completed_orders.desc(), Customer.id) \
+         .limit(limit).all()
+
+    @staticmethod
+    def get_top_selling_products(limit=3):
+        return db.session.query(
+            Product.id,
+            Product.name,
+            ProductSalesRollup.quantity_sold.label('quantity_sold')
+        ).join(Product, Product.id == ProductSalesRollup.id_product) \
+         .filter(ProductSalesRollup.quantity_sold > 0) \
+         .order_by(ProductSalesRollup.quantity_sold.desc(), Product.id) \
+         .limit(limit).all()
+
+    @staticmethod
+    def install(rollups_sql):
+        """Creates the rollup tables, functions and triggers if missing."""
+        db.session.execute(text(rollups_sql))
+
+    @staticmethod
+    def rebuild():
+        """
+        Recomputes every rollup of the schema in the current search_path.
+        Must run inside the caller's transaction.
+        """
+        try:
+            db.session.execute(text(REBUILD_SQL))
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
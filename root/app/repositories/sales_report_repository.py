@@ -1,11 +1,91 @@
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.sales_reports import SalesReport
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
+
+# Tipos de reporte y la unidad de date_trunc de su periodo
+REPORT_PERIODS = {
+    'daily': 'day',
+    'weekly': 'week',
+    'monthly': 'month'
+}
+
+# Primer periodo pendiente (el siguiente al último reporte, o el de la primera venta
+# o vencimiento si aún no hay reportes) y comienzo del periodo en curso, que no se cierra.
+PENDING_PERIODS_SQL = """
+SELECT
+    COALESCE(
+        (SELECT MAX(report_date) FROM sales_reports WHERE report_type = :report_type) + CAST(:step AS INTERVAL),
+        date_trunc(:unit, LEAST((SELECT MIN(sale_date) FROM sales), (SELECT MIN(due_date) FROM credit_accounts)))
+    ) AS period_start,
+    date_trunc(:unit, CAST(:now AS TIMESTAMP)) AS period_end
+"""
+
+# Calcula todos los reportes de los periodos en [:period_start, :period_end) en una sola
+# pasada: GROUPING SETS produce a la vez las filas por cliente y las del tenant
+# completo (id_customer NULL).
+GENERATE_SQL = """
+WITH period_sales AS (
+    SELECT date_trunc(:unit, sale_date) AS period, id_customer, id_order, total_amount
+    FROM sales
+    WHERE sale_date >= :period_start AND sale_date < :period_end
+),
+totals AS (
+    SELECT period, id_customer, SUM(total_amount) AS total_sales
+    FROM period_sales
+    GROUP BY GROUPING SETS ((period, id_customer), (period))
+),
+products_sold AS (
+    SELECT ps.period, ps.id_customer, oi.id_product, SUM(oi.quantity) AS quantity
+    FROM period_sales ps
+    JOIN order_items oi ON oi.id_order = ps.id_order
+    GROUP BY GROUPING SETS ((ps.period, ps.id_customer, oi.id_product), (ps.period, oi.id_product))
+),
+ranked_products AS (
+    SELECT period, id_customer, id_product,
+        ROW_NUMBER() OVER (PARTITION BY period, id_customer ORDER BY quantity DESC, id_product) AS most_rank,
+        ROW_NUMBER() OVER (PARTITION BY period, id_customer ORDER BY quantity ASC, id_product) AS least_rank
+    FROM products_sold
+),
+period_collections AS (
+    SELECT date_trunc(:unit, due_date) AS period, id_customer, credit_balance
+    FROM credit_accounts
+    WHERE due_date >= :period_start AND due_date < :period_end AND credit_balance > 0
+),
+collections AS (
+    SELECT period, id_customer, SUM(credit_balance) AS pending_collections
+    FROM period_collections
+    GROUP BY GROUPING SETS ((period, id_customer), (period))
+),
+report_keys AS (
+    SELECT period, id_customer FROM totals
+    UNION
+    SELECT period, id_customer FROM collections
+)
+INSERT INTO sales_reports (report_type, report_date, total_sales, most_sold_product,
+                           least_sold_product, pending_collections, id_customer)
+SELECT :report_type, k.period, COALESCE(t.total_sales, 0), most.name, least.name,
+       COALESCE(c.pending_collections, 0), k.id_customer
+FROM report_keys k
+LEFT JOIN totals t
+    ON t.period = k.period AND COALESCE(t.id_customer, 0) = COALESCE(k.id_customer, 0)
+LEFT JOIN collections c
+    ON c.period = k.period AND COALESCE(c.id_customer, 0) = COALESCE(k.id_customer, 0)
+LEFT JOIN ranked_products rm
+    ON rm.period = k.period AND COALESCE(rm.id_customer, 0) = COALESCE(k.id_customer, 0) AND rm.most_rank = 1
+LEFT JOIN products most ON most.id = rm.id_product
+LEFT JOIN ranked_products rl
+    ON rl.period = k.period AND COALESCE(rl.id_customer, 0) = COALESCE(k.id_customer, 0) AND rl.least_rank = 1
+LEFT JOIN products least ON least.id = rl.id_product
+"""
 
 class SalesReportRepository:
-    
+
     @staticmethod
-    def create_sales_report(report_type, total_sales, id_customer, report_date=None, 
+    def create_sales_report(report_type, total_sales, id_customer=None, report_date=None,
                             most_sold_product=None, least_sold_product=None, pending_collections=None):
         try:
             new_report = SalesReport(
@@ -24,6 +104,35 @@ class SalesReportRepository:
             db.session.rollback()
             raise e
 
+    @staticmethod
+    def _filtered_query(report_type=None, id_customer=None, scope=None, since=None, until=None):
+        query = SalesReport.query
+        if report_type:
+            query = query.filter(SalesReport.report_type == report_type)
+        if id_customer is not None:
+            query = query.filter(SalesReport.id_customer == id_customer)
+        if scope == 'tenant':
+            query = query.filter(SalesReport.id_customer.is_(None))
+        elif scope == 'customer':
+            query = query.filter(SalesReport.id_customer.isnot(None))
+        if since:
+            query = query.filter(SalesReport.report_date >= since)
+        if until:
+            query = query.filter(SalesReport.report_date < until)
+        return query
+
+    @staticmethod
+    def get_sales_reports_paginated(page, per_page, **filters):
+        query = SalesReportRepository._filtered_query(**filters).order_by(SalesReport.id.desc())
+        paginated = project_columns(query, SalesReport).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return rows_as_dicts(paginated.items), count_rows(query)
+
+    @staticmethod
+    def get_sales_reports_keyset(per_page, after_id=None, include_total=False, **filters):
+        query = SalesReportRepository._filtered_query(**filters)
+        items, next_id, total = keyset_paginate(project_columns(query, SalesReport), SalesReport.id, per_page, after_id, include_total)
+        return rows_as_dicts(items), next_id, total
+
     @staticmethod
     def get_sales_report_by_id(report_id):
         try:
@@ -44,3 +153,58 @@ class SalesReportRepository:
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
+
+    # Generación de reportes
+    @staticmethod
+    def install(sales_reports_sql):
+        """Applies the sales_reports schema adjustments if missing."""
+        db.session.execute(text(sales_reports_sql))
+
+    @staticmethod
+    def lock_report_type(lock_name):
+        """Serializes report generation of one type and tenant until the transaction ends."""
+        db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:lock_name))"), {"lock_name": lock_name})
+
+    @staticmethod
+    def get_pending_periods(report_type, now):
+        """
+        Returns (period_start, period_end): the first period without a report
+        and the start of the current, still open, period.
+        """
+        unit = REPORT_PERIODS[report_type]
+        row = db.session.execute(text(PENDING_PERIODS_SQL), {
+            "report_type": report_type,
+            "unit": unit,
+            "step": f"1 {unit}",
+            "now": now
+        }).one()
+        return row.period_start, row.period_end
+
+    @staticmethod
+    def truncate_to_period(report_type, value):
+        return db.session.execute(
+            text("SELECT date_trunc(:unit, CAST(:value AS TIMESTAMP))"),
+            {"unit": REPORT_PERIODS[report_type], "value": value}
+        ).scalar()
+
+    @staticmethod
+    def generate_reports(report_type, period_start, period_end):
+        """
+        Replaces the reports of ``report_type`` for every period in
+        [period_start, period_end). Must run inside the caller's transaction.
+
+        Returns:
+            int: Number of reports written.
+        """
+        db.session.execute(
+            text("DELETE FROM sales_reports WHERE report_type = :report_type "
+                 "AND report_date >= :period_start AND report_date < :period_end"),
+            {"report_type": report_type, "period_start": period_start, "period_end": period_end}
+        )
+        result = db.session.execute(text(GENERATE_SQL), {
+            "report_type": report_type,
+            "unit": REPORT_PERIODS[report_type],
+            "period_start": period_start,
+            "period_end": period_end
+        })
+        return result.rowcount
@@ -1,5 +1,9 @@
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
+from app.utils.counting import count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.projection import project_columns, rows_as_dicts
+from app.utils.export import stream_columns
 from app.models.sales import Sale
 
 class SaleRepository:
@@ -23,11 +27,23 @@ class SaleRepository:
     def get_sales_paginated(page, per_page):
         try:
             # Orden descendente por id para mostrar las ventas más recientes primero
-            paginated = Sale.query.order_by(Sale.id.desc()).paginate(page=page, per_page=per_page, error_out=False)
-            return paginated.items, paginated.total
+            query = Sale.query.order_by(Sale.id.desc())
+            paginated = project_columns(query, Sale).paginate(page=page, per_page=per_page, error_out=False, count=False)
+            return rows_as_dicts(paginated.items), count_rows(query)
         except SQLAlchemyError as e:
             raise e
 
+    @staticmethod
+    def get_sales_keyset(per_page, after_id=None, include_total=False):
+        try:
+            items, next_id, total = keyset_paginate(project_columns(Sale.query, Sale), Sale.id, per_page, after_id, include_total)
+            return rows_as_dicts(items), next_id, total
+        except SQLAlchemyError as e:
+            raise e
+
+    @staticmethod
+    def stream_sales():
+        return stream_columns(Sale.query, Sale)
 
     @staticmethod
     def get_sale_by_id(sale_id):
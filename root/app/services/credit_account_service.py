@@ -72,3 +72,18 @@ class CreditAccountService:
         except Exception as e:
             logger.error(f"Error fetching paginated credit accounts: {e}")
             raise InternalServerError("An internal error occurred while fetching paginated credit accounts.")
+
+    def get_credit_accounts_keyset(self, per_page, after_id=None, include_total=False, **filters):
+        """
+        Retrieves a page of credit accounts older than ``after_id`` with optional filters.
+        """
+        try:
+            logger.info(f"Fetching credit accounts with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.credit_account_repository.get_credit_accounts_keyset(per_page, after_id, include_total, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated credit accounts: {e}")
+            raise InternalServerError("An internal error occurred while fetching paginated credit accounts.")
+
+    def export_credit_accounts(self, **filters):
+        logger.info("Exporting credit accounts")
+        return self.credit_account_repository.stream_credit_accounts(**filters)
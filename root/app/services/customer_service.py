@@ -1,7 +1,7 @@
 import logging
 from flask_injector import inject
-from werkzeug.exceptions import InternalServerError, NotFound
-from app.repositories.customer_repository import CustomerRepository
+from werkzeug.exceptions import BadRequest, InternalServerError, NotFound
+from app.repositories.customer_repository import CustomerRepository, SEARCH_FULLTEXT, SEARCH_MODES, prefix_tsquery
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,33 @@ class CustomerService:
             logger.error(f"Error fetching paginated customers: {e}")
             raise InternalServerError("An internal error occurred while fetching customers.")
 
+    def get_customers_keyset(self, per_page, after_id=None, include_total=False, **filters):
+        try:
+            logger.info(f"Fetching customers with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.customer_repository.get_customers_keyset(per_page, after_id, include_total, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated customers: {e}")
+            raise InternalServerError("An internal error occurred while fetching customers.")
+
+    def search_customers(self, term, mode, per_page, after=None):
+        term = (term or '').strip()
+        if not term:
+            raise BadRequest("The 'q' parameter is required")
+        if mode not in SEARCH_MODES:
+            raise BadRequest(f"Invalid search mode, expected one of: {', '.join(SEARCH_MODES)}")
+        if mode == SEARCH_FULLTEXT and not prefix_tsquery(term):
+            raise BadRequest("The 'q' parameter must contain at least one word")
+        try:
+            logger.info(f"Searching customers ({mode}): per_page {per_page}")
+            return self.customer_repository.search_customers(term, mode, per_page, after)
+        except Exception as e:
+            logger.error(f"Error searching customers: {e}")
+            raise InternalServerError("An internal error occurred while searching customers.")
+
+    def export_customers(self, **filters):
+        logger.info("Exporting customers")
+        return self.customer_repository.stream_customers(**filters)
+
     def get_customer_by_id(self, customer_id):
         try:
             logger.info(f"Fetching customer with ID: {customer_id}")
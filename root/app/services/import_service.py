@@ -0,0 +1,88 @@
+import csv
+import logging
+from flask import current_app
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest, InternalServerError
+from app.extensions import db, query_cache, tenant_connections
+from app.repositories.import_repository import ImportRepository
+from app.utils.bulk_import import IMPORT_FIELDS, CopyStream, read_records, validate_record
+from app.utils.tenant_connection import current_schema
+
+logger = logging.getLogger(__name__)
+
+class ImportService:
+
+    @inject
+    def __init__(self, import_repository: ImportRepository):
+        self.import_repository = import_repository
+
+    def import_records(self, resource, stream, import_format, schema_name=None):
+        """
+        Loads CSV or NDJSON records into ``resource`` of a tenant schema.
+
+        Records are validated while the input is read and valid ones are
+        streamed into a staging table with COPY, so the input is never held in
+        memory. Rows that fail validation or would violate a constraint are
+        reported and skipped; the rest are inserted in one statement.
+
+        Args:
+            resource (str): One of IMPORT_FIELDS.
+            stream: Binary file object with the records.
+            import_format (str): 'csv' or 'ndjson'.
+            schema_name (str): Tenant schema (default: the current request's tenant).
+
+        Returns:
+            dict: Counts of received, imported and rejected rows and the row errors.
+        """
+        fields = IMPORT_FIELDS.get(resource)
+        if fields is None:
+            raise BadRequest(f"Unknown import resource: {resource}")
+
+        schema_name = schema_name or current_schema() or 'public'
+        columns = [field.name for field in fields]
+        max_errors = current_app.config.get('IMPORT_MAX_ERRORS', 1000)
+        summary = {"resource": resource, "received": 0, "imported": 0, "rejected": 0, "errors": []}
+
+        def add_error(row_number, errors):
+            summary["rejected"] += 1
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append({"row": row_number, "errors": errors})
+
+        def valid_rows():
+            try:
+                for row_number, record in read_records(stream, import_format):
+                    summary["received"] += 1
+                    values, errors = validate_record(fields, record)
+                    if errors:
+                        add_error(row_number, errors)
+                        continue
+                    yield (row_number,) + values
+            except (csv.Error, UnicodeDecodeError) as e:
+                summary["fatal"] = f"Unreadable {import_format} input after row {summary['received']}: {e}"
+
+        try:
+            logger.info(f"Importing {resource} ({import_format}) into schema: {schema_name}")
+            tenant_connections.set_local_search_path(schema_name)
+            self.import_repository.create_staging_table(resource, columns)
+            self.import_repository.copy_into_staging(columns, CopyStream(valid_rows()))
+
+            if "fatal" in summary:
+                db.session.rollback()
+                raise BadRequest(summary["fatal"])
+
+            for row_number, reason in self.import_repository.reject_conflicts(resource):
+                add_error(row_number, {"row": reason})
+            summary["imported"] = self.import_repository.insert_from_staging(resource, columns)
+            db.session.commit()
+        except BadRequest:
+            raise
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error importing {resource} into schema {schema_name}: {e}")
+            raise InternalServerError(f"An error occurred while importing {resource}.")
+
+        # COPY and INSERT ... SELECT bypass the ORM, so cached counts are dropped here
+        query_cache.invalidate(resource, schema_name)
+        summary["errors"].sort(key=lambda error: error["row"])
+        summary["errors_truncated"] = summary["rejected"] > len(summary["errors"])
+        return summary
@@ -0,0 +1,77 @@
+import logging
+from flask_injector import inject
+from werkzeug.exceptions import InternalServerError
+from app.extensions import db
+from app.repositories.index_advisor_repository import IndexAdvisorRepository
+from app.repositories.tenants_repository import TenantRepository
+
+logger = logging.getLogger(__name__)
+
+class IndexAdvisorService:
+    """
+    Flags the tenant tables that are mostly read with sequential scans.
+
+    Reads pg_stat_user_tables for every tenant schema in a single query, so it
+    is cheap enough to run against production. Small tables are ignored: the
+    planner rightly prefers a sequential scan for them.
+    """
+
+    @inject
+    def __init__(self, index_advisor_repository: IndexAdvisorRepository, tenant_repository: TenantRepository):
+        self.index_advisor_repository = index_advisor_repository
+        self.tenant_repository = tenant_repository
+
+    def advise(self, schema_name=None, min_rows=10000, min_seq_scans=50, min_seq_ratio=0.5):
+        """
+        Finds sequential-scan hotspots and foreign keys without an index.
+
+        Args:
+            schema_name (str): Tenant schema to inspect. Defaults to every tenant.
+            min_rows (int): Tables with fewer live rows are ignored.
+            min_seq_scans (int): Sequential scans a table needs to be reported.
+            min_seq_ratio (float): Share of the scans that were sequential (0-1).
+
+        Returns:
+            dict: {"hotspots": [...], "unindexed_foreign_keys": [...]}. Hotspots are
+            ordered by rows read through sequential scans, the worst first.
+        """
+        try:
+            if schema_name:
+                schemas = [schema_name]
+            else:
+                schemas = [tenant.schema_name for tenant in self.tenant_repository.get_all_tenants()]
+            if not schemas:
+                db.session.commit()
+                return {"hotspots": [], "unindexed_foreign_keys": []}
+
+            table_scans = self.index_advisor_repository.get_table_scans(schemas)
+            foreign_keys = self.index_advisor_repository.get_unindexed_foreign_keys(schemas)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error reading table statistics: {e}")
+            raise InternalServerError("An error occurred while reading the table statistics.")
+
+        hotspots = []
+        for row in table_scans:
+            scans = row['seq_scan'] + row['idx_scan']
+            seq_ratio = row['seq_scan'] / scans if scans else 0
+            if not row['seq_scan'] or row['n_live_tup'] < min_rows or row['seq_scan'] < min_seq_scans \
+                    or seq_ratio < min_seq_ratio:
+                continue
+            hotspots.append({
+                "schema_name": row['schema_name'],
+                "table_name": row['table_name'],
+                "seq_scan": row['seq_scan'],
+                "seq_tup_read": row['seq_tup_read'],
+                "idx_scan": row['idx_scan'],
+                "live_rows": row['n_live_tup'],
+                "seq_ratio": round(seq_ratio, 3),
+                "rows_per_seq_scan": row['seq_tup_read'] // row['seq_scan']
+            })
+        hotspots.sort(key=lambda hotspot: hotspot['seq_tup_read'], reverse=True)
+
+        return {
+            "hotspots": hotspots,
+            "unindexed_foreign_keys": [dict(row) for row in foreign_keys]
+        }
@@ -40,6 +40,18 @@ class InventoryService:
             logger.error(f"Error fetching paginated inventory items: {e}")
             raise InternalServerError("An error occurred while fetching paginated inventory items.")
 
+    def get_inventory_items_keyset(self, per_page, after_id=None, include_total=False, **filters):
+        try:
+            logger.info(f"Fetching inventory items with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.inventory_repository.get_inventory_items_keyset(per_page, after_id, include_total, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated inventory items: {e}")
+            raise InternalServerError("An error occurred while fetching paginated inventory items.")
+
+    def export_inventory_items(self, **filters):
+        logger.info("Exporting inventory items")
+        return self.inventory_repository.stream_inventory_items(**filters)
+
     def delete_inventory_item(self, item_id):
         try:
             result = self.inventory_repository.delete_inventory_item(item_id)
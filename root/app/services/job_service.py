@@ -0,0 +1,105 @@
+import logging
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest, InternalServerError, NotFound
+from app.models.jobs import Job
+from app.repositories.job_repository import JobRepository
+from app.repositories.sales_report_repository import REPORT_PERIODS
+from app.services.sales_report_service import SalesReportService
+from app.utils.tenant_connection import current_schema
+
+logger = logging.getLogger(__name__)
+
+SALES_REPORTS_JOB = 'sales_reports'
+
+class JobService:
+
+    @inject
+    def __init__(self, job_repository: JobRepository, sales_report_service: SalesReportService):
+        self.job_repository = job_repository
+        self.sales_report_service = sales_report_service
+        self.handlers = {
+            SALES_REPORTS_JOB: self._run_sales_reports
+        }
+
+    def enqueue_sales_reports(self, report_types=None, since=None):
+        """Queues a sales report generation for the current tenant."""
+        unknown = [report_type for report_type in report_types or [] if report_type not in REPORT_PERIODS]
+        if unknown:
+            raise BadRequest(f"Unknown report types: {', '.join(unknown)}")
+
+        try:
+            schema_name = current_schema() or 'public'
+            params = {"report_types": report_types, "since": since.isoformat() if since else None}
+            logger.info(f"Queueing sales reports job for schema: {schema_name}")
+            return self.job_repository.create_job(SALES_REPORTS_JOB, schema_name, params)
+        except Exception as e:
+            logger.error(f"Error queueing sales reports job: {e}")
+            raise InternalServerError("An error occurred while queueing the job.")
+
+    def get_job(self, job_id):
+        try:
+            job = self.job_repository.get_job_by_id(job_id, current_schema() or 'public')
+            if not job:
+                raise NotFound("Job not found")
+            return job
+        except NotFound:
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving job by ID {job_id}: {e}")
+            raise InternalServerError("An error occurred while retrieving the job.")
+
+    def run_next_job(self, worker_id):
+        """
+        Claims and runs the oldest queued job whose tenant is below
+        JOB_MAX_PER_TENANT running jobs.
+
+        Returns:
+            Job: The job that was run, or None when nothing could be claimed.
+        """
+        job = self.job_repository.claim_next_job(worker_id, current_app.config.get('JOB_MAX_PER_TENANT', 1))
+        if job is None:
+            return None
+
+        job_id = job.id
+        logger.info(f"Worker {worker_id} running job {job_id} ({job.job_type}) for schema: {job.schema_name}")
+        try:
+            handler = self.handlers.get(job.job_type)
+            if handler is None:
+                raise ValueError(f"Unknown job type: {job.job_type}")
+            result = handler(job)
+            self.job_repository.finish_job(job_id, Job.SUCCEEDED, result=result)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.job_repository.finish_job(job_id, Job.FAILED, error=str(e))
+        return job
+
+    def requeue_stale_jobs(self):
+        stale_after = current_app.config.get('JOB_STALE_AFTER', 1800)
+        count = self.job_repository.requeue_stale_jobs(
+            datetime.utcnow() - timedelta(seconds=stale_after),
+            current_app.config.get('JOB_MAX_ATTEMPTS', 3)
+        )
+        if count:
+            logger.info(f"Recovered {count} stale jobs")
+        return count
+
+    def _run_sales_reports(self, job):
+        job_id = job.id
+        params = job.params or {}
+        since = datetime.fromisoformat(params["since"]) if params.get("since") else None
+        results = self.sales_report_service.generate_reports(
+            report_types=params.get("report_types"),
+            since=since,
+            schema_name=job.schema_name,
+            progress=lambda fraction: self.job_repository.update_progress(job_id, fraction)
+        )
+        return [
+            {
+                **result,
+                "period_start": result["period_start"].isoformat() if result["period_start"] else None,
+                "period_end": result["period_end"].isoformat() if result["period_end"] else None
+            }
+            for result in results
+        ]
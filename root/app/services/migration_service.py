@@ -0,0 +1,169 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from flask_injector import inject
+from werkzeug.exceptions import InternalServerError, NotFound
+from app.extensions import db, tenant_connections, tenant_ddl
+from app.repositories.migration_repository import MigrationRepository
+from app.repositories.provisioning_repository import ProvisioningRepository
+from app.repositories.tenants_repository import TenantRepository
+from app.utils.migrations import PUBLIC_MIGRATIONS_TABLE, SCHEMA_MIGRATIONS_TABLE, load_migrations
+
+logger = logging.getLogger(__name__)
+
+class MigrationService:
+    """
+    Applies the versioned tenant migrations to every tenant schema.
+
+    Tenants are migrated concurrently, each in its own app context and
+    therefore on its own pooled connection, so the number of workers is capped
+    by the size of the pool. Every migration runs in its own transaction and is
+    recorded in the tenant's schema_migrations table: a failure rolls back that
+    migration only and stops that tenant, and running the migrations again
+    resumes from the first migration not yet applied. Migrations that require
+    an extension which is not installed are skipped and stay pending until it is.
+
+    The database-level migrations of PUBLIC_MIGRATIONS_PATH (public tables,
+    extensions) follow the same rules in the public schema and are recorded
+    in public.database_migrations. They must be idempotent, because databases
+    created from ddl-public.sql already contain them.
+    """
+
+    @inject
+    def __init__(self, migration_repository: MigrationRepository, provisioning_repository: ProvisioningRepository,
+                 tenant_repository: TenantRepository):
+        self.migration_repository = migration_repository
+        self.provisioning_repository = provisioning_repository
+        self.tenant_repository = tenant_repository
+
+    def get_schemas(self, schema_name=None):
+        try:
+            if schema_name:
+                tenant = self.tenant_repository.get_tenant_by_schema(schema_name)
+                schemas = [tenant.schema_name] if tenant else []
+            else:
+                schemas = [tenant.schema_name for tenant in self.tenant_repository.get_all_tenants()]
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error listing tenants to migrate: {e}")
+            raise InternalServerError("An error occurred while listing the tenants to migrate.")
+
+        if schema_name and not schemas:
+            raise NotFound(f"Tenant schema {schema_name} not found.")
+        return schemas
+
+    def migrate(self, schema_name=None, target=None, dry_run=False, workers=None):
+        """
+        Applies the pending migrations up to ``target`` to one or every tenant.
+
+        Args:
+            schema_name (str): Tenant schema to migrate. Defaults to every tenant.
+            target (int): Last version to apply (default: the latest).
+            dry_run (bool): Only report the pending migrations.
+            workers (int): Tenants migrated in parallel (default: MIGRATION_WORKERS).
+
+        Returns:
+            list: One {"schema_name", "success", "applied", "pending", "message"}
+            entry per tenant, in tenant order.
+        """
+        app = current_app._get_current_object()
+        migrations = [migration for migration in tenant_ddl.get_migrations()
+                      if target is None or migration.version <= target]
+        schemas = self.get_schemas(schema_name)
+        workers = min(workers or app.config.get('MIGRATION_WORKERS', 8), self._pool_capacity(app))
+
+        def run(schema):
+            # Every thread works in its own app context and therefore its own session
+            with app.app_context():
+                try:
+                    return self._migrate_schema(schema, migrations, dry_run)
+                finally:
+                    db.session.remove()
+
+        logger.info(f"{'Checking' if dry_run else 'Migrating'} {len(schemas)} tenants with {workers} workers")
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='migrations') as executor:
+            return list(executor.map(run, schemas))
+
+    def migrate_public(self, target=None, dry_run=False):
+        """
+        Applies the pending database-level migrations up to ``target``.
+
+        Returns:
+            dict: A {"schema_name": "public", ...} entry like the ones of ``migrate``.
+        """
+        try:
+            migrations = [migration for migration in load_migrations(current_app.config.get('PUBLIC_MIGRATIONS_PATH', 'db/migrations/public'))
+                          if target is None or migration.version <= target]
+        except (OSError, ValueError) as e:
+            return self._status('public', False, [], [], f"Migrations not loaded: {e}")
+        return self._migrate_schema('public', migrations, dry_run, table=PUBLIC_MIGRATIONS_TABLE)
+
+    def _migrate_schema(self, schema_name, migrations, dry_run, table=SCHEMA_MIGRATIONS_TABLE):
+        applied = []
+        try:
+            if not self.provisioning_repository.schema_exists(schema_name):
+                db.session.rollback()
+                return self._status(schema_name, False, applied, [], "Schema does not exist")
+
+            tenant_connections.set_local_search_path(schema_name)
+            recorded = self.migration_repository.get_applied(table) if self.migration_repository.table_exists(table) else {}
+            installed = self.migration_repository.get_installed_extensions()
+            db.session.rollback()
+
+            modified = [migration.version for migration in migrations
+                        if migration.version in recorded and recorded[migration.version] != migration.checksum]
+            if modified:
+                return self._status(schema_name, False, applied, [],
+                                    f"Applied migrations were modified afterwards: {modified}")
+
+            pending = [migration for migration in migrations if migration.version not in recorded]
+            waiting = [migration for migration in pending if not set(migration.requires) <= installed]
+            if dry_run or len(waiting) == len(pending):
+                return self._status(schema_name, True, applied, [migration.version for migration in pending],
+                                    self._waiting_message(waiting) or ("Pending migrations" if pending else "Up to date"))
+            pending = [migration for migration in pending if migration not in waiting]
+
+            for index, migration in enumerate(pending):
+                try:
+                    self.migration_repository.lock(schema_name)
+                    tenant_connections.set_local_search_path(schema_name)
+                    self.migration_repository.ensure_table(table)
+                    # Another runner may have applied it while this one waited for the lock
+                    if migration.version not in self.migration_repository.get_applied(table):
+                        self.migration_repository.apply(migration, table)
+                    db.session.commit()
+                    applied.append(migration.version)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Migration {migration.version}_{migration.name} failed for schema {schema_name}: {e}")
+                    return self._status(schema_name, False, applied,
+                                        sorted([item.version for item in pending[index:]] + [item.version for item in waiting]),
+                                        f"Migration {migration.version}_{migration.name} failed: {e}")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error migrating schema {schema_name}: {e}")
+            return self._status(schema_name, False, applied, [], str(e))
+
+        logger.info(f"Applied migrations {applied} to schema {schema_name}")
+        message = f"Applied {len(applied)} migrations"
+        if waiting:
+            message += f"; {self._waiting_message(waiting)}"
+        return self._status(schema_name, True, applied, [migration.version for migration in waiting], message)
+
+    @staticmethod
+    def _waiting_message(waiting):
+        if not waiting:
+            return None
+        extensions = sorted({extension for migration in waiting for extension in migration.requires})
+        return f"Waiting for extensions {', '.join(extensions)}: {[migration.version for migration in waiting]}"
+
+    @staticmethod
+    def _pool_capacity(app):
+        # QueuePool defaults: 5 connections plus 10 overflow
+        engine_options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+        return engine_options.get('pool_size', 5) + max(engine_options.get('max_overflow', 10), 0)
+
+    @staticmethod
+    def _status(schema_name, success, applied, pending, message):
+        return {"schema_name": schema_name, "success": success, "applied": applied, "pending": pending, "message": message}
@@ -30,6 +30,14 @@ class OrderItemService:
             logger.error(f"Error fetching paginated order items: {e}")
             raise InternalServerError("An error occurred while fetching order items.")
 
+    def get_order_items_keyset(self, per_page, after_id=None, include_total=False, id_order=None):
+        try:
+            logger.info(f"Fetching order items with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.order_item_repository.get_order_items_keyset(per_page, after_id, include_total, id_order)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated order items: {e}")
+            raise InternalServerError("An error occurred while fetching order items.")
+
     def get_order_item_by_id(self, order_item_id):
         try:
             order_item = self.order_item_repository.get_order_item_by_id(order_item_id)
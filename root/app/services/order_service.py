@@ -1,14 +1,11 @@
 import logging
+from flask import current_app
 from flask_injector import inject
 from werkzeug.exceptions import InternalServerError, NotFound
-from sqlalchemy import func
-from app.extensions import db
+from app.extensions import query_cache
 from app.repositories.order_repository import OrderRepository
+from app.repositories.rollup_repository import RollupRepository, COMPLETED_STATUS
 from app.services.order_item_service import OrderItemService
-from app.models.orders import Order
-from app.models.order_items import OrderItem
-from app.models.customers import Customer
-from app.models.products import Product
 
 
 logger = logging.getLogger(__name__)
@@ -16,31 +13,35 @@ logger = logging.getLogger(__name__)
 class OrderService:
 
     @inject
-    def __init__(self, order_repository: OrderRepository, order_item_service: OrderItemService):
+    def __init__(self, order_repository: OrderRepository, order_item_service: OrderItemService,
+                 rollup_repository: RollupRepository):
         self.order_repository = order_repository
         self.order_item_service = order_item_service
+        self.rollup_repository = rollup_repository
+
+    def _use_rollups(self):
+        return current_app.config.get('ORDER_ROLLUPS_ENABLED', False)
 
     def create_order(self, payment_method, id_customer, delivery_date=None, status='pending', order_items=None):
         try:
             logger.info(f"Creating new order for customer ID: {id_customer}")
+            # The order and all of its items are written in one transaction
             new_order = self.order_repository.create_order(
-                payment_method, id_customer, delivery_date, status
+                payment_method, id_customer, delivery_date, status, order_items
             )
-
-            if order_items:
-                for item in order_items:
-                    self.order_item_service.create_order_item(
-                        quantity=item['quantity'],
-                        price=item['price'],
-                        id_order=new_order.id,
-                        id_product=item['id_product']
-                    )
-
             return new_order
         except Exception as e:
             logger.error(f"Error creating order: {e}")
             raise InternalServerError("An error occurred while creating the order.")
 
+    def create_orders_bulk(self, orders):
+        try:
+            logger.info(f"Creating {len(orders)} orders in bulk")
+            return self.order_repository.create_orders_bulk(orders)
+        except Exception as e:
+            logger.error(f"Error creating orders in bulk: {e}")
+            raise InternalServerError("An error occurred while creating the orders.")
+
     def get_orders_paginated(self, page, per_page, **filters):
         try:
             logger.info(f"Fetching orders with pagination: page {page}, per_page {per_page}")
@@ -50,6 +51,18 @@ class OrderService:
             logger.error(f"Error fetching paginated orders: {e}")
             raise InternalServerError("An error occurred while fetching orders.")
 
+    def get_orders_keyset(self, per_page, after_id=None, include_total=False, **filters):
+        try:
+            logger.info(f"Fetching orders with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.order_repository.get_orders_keyset(per_page, after_id, include_total, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated orders: {e}")
+            raise InternalServerError("An error occurred while fetching orders.")
+
+    def export_orders(self, **filters):
+        logger.info("Exporting orders with their items")
+        return self.order_repository.stream_orders(**filters)
+
     def get_order_by_id(self, order_id):
         try:
             order = self.order_repository.get_order_by_id(order_id)
@@ -82,63 +95,74 @@ class OrderService:
             logger.error(f"Error deleting order: {e}")
             raise InternalServerError("An error occurred while deleting the order.")
 
-    def get_statistics(self):
-        return {
-            "total_orders": self.order_repository.get_total_orders(),
-            "total_completed_orders": self.order_repository.get_total_completed_orders(),
-            "total_pending_orders": self.order_repository.get_total_pending_orders(),
-        }
-
-    def get_top_customers(self, limit=3):
-        results = (
-            db.session.query(
-                Customer.id,
-                Customer.full_name,
-                func.count(Order.id).label('completed_order_count')
-            )
-            .join(Order, Customer.id == Order.id_customer)  # Unión con la tabla de órdenes
-            .filter(Order.status == 'Completada')  # Solo órdenes completadas
-            .group_by(Customer.id)
-            .order_by(func.count(Order.id).desc())  # Orden descendente por cantidad de órdenes
-            .limit(limit)
-        )
-
-        top_customers = [
-            {
-                "customer_id": row.id,
-                "customer_name": row.full_name,
-                "completed_order_count": row.completed_order_count
+    def get_statistics(self, since=None, until=None):
+        try:
+            # The rollups hold all-time counts; date ranges still aggregate over orders
+            if self._use_rollups() and not since and not until:
+                counts = self.rollup_repository.get_order_counts_by_status()
+            else:
+                counts = self.order_repository.get_order_counts_by_status(since, until)
+            return {
+                "total_orders": sum(counts.values()),
+                "total_completed_orders": counts.get(COMPLETED_STATUS, 0),
+                "total_pending_orders": counts.get('Pendiente', 0),
+                "by_status": counts
             }
-            for row in results
-        ]
-        return top_customers
+        except Exception as e:
+            logger.error(f"Error fetching order statistics: {e}")
+            raise InternalServerError("An error occurred while fetching order statistics.")
+
+    def _use_top_rollups(self, since, until, status):
+        # The rollups only hold all-time figures for completed orders
+        return self._use_rollups() and not since and not until and status == COMPLETED_STATUS
+
+    def _cached_top(self, name, tables, compute, limit, since, until, status):
+        key = (name, limit, since and since.isoformat(), until and until.isoformat(), status)
+        result = query_cache.get(key)
+        if result is None:
+            result = query_cache.set(key, compute(), tables, current_app.config.get('TOP_N_CACHE_TTL'))
+        return result
+
+    def get_top_customers(self, limit=3, since=None, until=None, status=COMPLETED_STATUS):
+        def compute():
+            if self._use_top_rollups(since, until, status):
+                results = self.rollup_repository.get_top_customers(limit)
+            else:
+                results = self.order_repository.get_top_customers(limit, since, until, status)
+            return [
+                {
+                    "customer_id": row.id,
+                    "customer_name": row.full_name,
+                    # Original key, kept for existing clients; it counts orders in ``status``
+                    "completed_order_count": row.order_count,
+                    "order_count": row.order_count
+                }
+                for row in results
+            ]
 
-    def get_top_selling_products(self, limit=3):
         try:
-            results = (
-                db.session.query(
-                    Product.id,
-                    Product.name,
-                    func.sum(OrderItem.quantity).label('total_quantity_sold')
-                )
-                .join(OrderItem, Product.id == OrderItem.id_product)  # Unir con la tabla OrderItem
-                .join(Order, Order.id == OrderItem.id_order)  # Unir con la tabla Order para filtrar por estado
-                .filter(Order.status == 'Completada')  # Solo considerar órdenes completadas
-                .group_by(Product.id)
-                .order_by(func.sum(OrderItem.quantity).desc())  # Ordenar por la cantidad vendida en orden descendente
-                .limit(limit)
-            )
-
-            top_products = [
+            return self._cached_top('top_customers', ('orders', 'customers'), compute, limit, since, until, status)
+        except Exception as e:
+            logger.error(f"Error fetching top customers: {e}")
+            raise InternalServerError("An error occurred while fetching top customers.")
+
+    def get_top_selling_products(self, limit=3, since=None, until=None, status=COMPLETED_STATUS):
+        def compute():
+            if self._use_top_rollups(since, until, status):
+                results = self.rollup_repository.get_top_selling_products(limit)
+            else:
+                results = self.order_repository.get_top_selling_products(limit, since, until, status)
+            return [
                 {
                     "product_id": row.id,
                     "product_name": row.name,
-                    "total_quantity_sold": row.total_quantity_sold
+                    "total_quantity_sold": int(row.quantity_sold)
                 }
                 for row in results
             ]
-            return top_products
 
+        try:
+            return self._cached_top('top_products', ('orders', 'order_items', 'products'), compute, limit, since, until, status)
         except Exception as e:
             logger.error(f"Error fetching top selling products: {e}")
             raise InternalServerError("An error occurred while fetching top selling products.")
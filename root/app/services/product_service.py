@@ -28,6 +28,14 @@ class ProductService:
             logger.error(f"Error fetching paginated products: {e}")
             raise InternalServerError("An error occurred while retrieving products.")
 
+    def get_products_keyset(self, per_page, after_id=None, include_total=False):
+        try:
+            logger.info(f"Fetching products with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.product_repository.get_products_keyset(per_page, after_id, include_total)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated products: {e}")
+            raise InternalServerError("An error occurred while retrieving products.")
+
     def get_product_by_id(self, product_id):
         try:
             product = self.product_repository.get_product_by_id(product_id)
@@ -0,0 +1,164 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest, InternalServerError
+from app.extensions import db, tenant_cache, tenant_connections, tenant_ddl
+from app.repositories.migration_repository import MigrationRepository
+from app.repositories.provisioning_repository import ProvisioningRepository
+from app.repositories.tenants_repository import TenantRepository
+from app.services.migration_service import MigrationService
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_NAME_PATTERN = re.compile(r'^[a-z_][a-z0-9_]{0,62}$')
+RESERVED_SCHEMAS = ('public', 'information_schema')
+
+def validate_schema_name(schema_name):
+    if not schema_name or not SCHEMA_NAME_PATTERN.match(schema_name) \
+            or schema_name in RESERVED_SCHEMAS or schema_name.startswith('pg_'):
+        raise BadRequest(f"Invalid schema name: {schema_name!r} (lowercase letters, digits and '_', up to 63 chars)")
+
+class ProvisioningService:
+    """
+    Creates tenant schemas from the DDL cached at startup.
+
+    Each tenant runs the script in a single transaction that creates the
+    schema, its tables and the tenants row, so a failed tenant leaves nothing
+    behind. The empty template schema (TENANT_TEMPLATE_SCHEMA) is only built
+    for the warmup (`flask tenants template`) and is not read when provisioning.
+    """
+
+    @inject
+    def __init__(self, provisioning_repository: ProvisioningRepository, tenant_repository: TenantRepository,
+                 migration_repository: MigrationRepository):
+        self.provisioning_repository = provisioning_repository
+        self.tenant_repository = tenant_repository
+        self.migration_repository = migration_repository
+
+    def ensure_template(self):
+        """
+        Builds (or rebuilds, when the DDL changed) the empty template schema
+        that the warmup prepares its statements against.
+
+        Returns:
+            str: The version of the DDL in the template.
+        """
+        template = current_app.config.get('TENANT_TEMPLATE_SCHEMA', 'tenant_template')
+        script = tenant_ddl.get_script()
+        try:
+            self.provisioning_repository.lock(f"provisioning:{template}")
+            if self.provisioning_repository.get_schema_comment(template) != tenant_ddl.version:
+                logger.info(f"Building template schema {template} with DDL {tenant_ddl.version}")
+                self.provisioning_repository.drop_schema(template)
+                self.provisioning_repository.create_schema(template)
+                tenant_connections.set_local_search_path(template)
+                self.provisioning_repository.execute_script(script)
+                self.provisioning_repository.comment_schema(template, tenant_ddl.version)
+            db.session.commit()
+            return tenant_ddl.version
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error building template schema {template}: {e}")
+            raise InternalServerError(f"The tenant DDL could not be applied to the template schema: {e}")
+
+    def provision_tenant(self, tenant_name, schema_name):
+        """
+        Creates the schema, its tables and the tenants row of one tenant atomically.
+
+        Returns:
+            Tenant: The registered tenant.
+        """
+        if not tenant_name:
+            raise BadRequest("The 'tenant_name' parameter is required")
+        validate_schema_name(schema_name)
+
+        script = tenant_ddl.get_script()
+        try:
+            self.provisioning_repository.lock(f"provisioning:{schema_name}")
+            tenant_connections.set_local_search_path('public')
+            if self.tenant_repository.get_tenant_by_schema(schema_name) or self.provisioning_repository.schema_exists(schema_name):
+                raise BadRequest(f"Schema {schema_name} already exists.")
+
+            self.provisioning_repository.create_schema(schema_name)
+            tenant_connections.set_local_search_path(schema_name)
+            self.provisioning_repository.execute_script(script)
+            self._apply_extension_migrations()
+            self.provisioning_repository.comment_schema(schema_name, tenant_ddl.version)
+
+            tenant_connections.set_local_search_path('public')
+            # create_tenant commits the whole transaction
+            tenant = self.tenant_repository.create_tenant(tenant_name, schema_name)
+        except BadRequest:
+            db.session.rollback()
+            raise
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error provisioning tenant {schema_name}: {e}")
+            raise InternalServerError(f"An error occurred while provisioning the schema {schema_name}.")
+
+        tenant_cache.invalidate(schema_name)
+        logger.info(f"Provisioned tenant {tenant_name} in schema {schema_name}")
+        return tenant
+
+    def provision_tenants(self, tenants, workers=None):
+        """
+        Provisions many tenants concurrently.
+
+        Args:
+            tenants (list): {"tenant_name", "schema_name"} dicts.
+            workers (int): Tenants provisioned in parallel (default: PROVISIONING_WORKERS).
+
+        Returns:
+            list: One {"tenant_name", "schema_name", "success", "message"} entry per
+            tenant, in input order.
+        """
+        app = current_app._get_current_object()
+        # Every worker holds a connection for its whole transaction
+        workers = min(workers or app.config.get('PROVISIONING_WORKERS', 4), MigrationService._pool_capacity(app))
+
+        seen = set()
+        results = [None] * len(tenants)
+        pending = []
+        for index, entry in enumerate(tenants):
+            tenant_name, schema_name = entry.get('tenant_name'), entry.get('schema_name')
+            if schema_name in seen:
+                results[index] = self._status(tenant_name, schema_name, False, "Duplicate schema in batch")
+            else:
+                seen.add(schema_name)
+                pending.append((index, tenant_name, schema_name))
+
+        def provision(item):
+            index, tenant_name, schema_name = item
+            # Every thread works in its own app context and therefore its own session
+            with app.app_context():
+                try:
+                    self.provision_tenant(tenant_name, schema_name)
+                    return index, self._status(tenant_name, schema_name, True, "Provisioned")
+                except (BadRequest, InternalServerError) as e:
+                    return index, self._status(tenant_name, schema_name, False, e.description)
+                finally:
+                    db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='provisioning') as executor:
+            for index, status in executor.map(provision, pending):
+                results[index] = status
+        return results
+
+    def _apply_extension_migrations(self):
+        """
+        Applies (and records) the migrations left out of the DDL script whose
+        extensions are installed; the others stay pending for `flask migrations apply`.
+        """
+        migrations = tenant_ddl.get_extension_migrations()
+        if not migrations:
+            return
+        installed = self.migration_repository.get_installed_extensions()
+        for migration in migrations:
+            if set(migration.requires) <= installed:
+                self.migration_repository.apply(migration)
+
+    @staticmethod
+    def _status(tenant_name, schema_name, success, message):
+        return {"tenant_name": tenant_name, "schema_name": schema_name, "success": success, "message": message}
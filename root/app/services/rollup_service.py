@@ -0,0 +1,55 @@
+import logging
+from flask_injector import inject
+from werkzeug.exceptions import InternalServerError
+from app.extensions import db, tenant_connections
+from app.repositories.rollup_repository import RollupRepository
+from app.repositories.tenants_repository import TenantRepository
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_SQL_PATH = 'db/assets/rollups.sql'
+
+class RollupService:
+
+    @inject
+    def __init__(self, rollup_repository: RollupRepository, tenant_repository: TenantRepository):
+        self.rollup_repository = rollup_repository
+        self.tenant_repository = tenant_repository
+
+    def rebuild(self, schema_name=None):
+        """
+        Installs (if missing) and recomputes the order/sales rollups from scratch.
+
+        Args:
+            schema_name (str): Tenant schema to rebuild. Defaults to every tenant.
+
+        Returns:
+            list: One {"schema_name", "success", "message"} entry per tenant.
+        """
+        try:
+            with open(ROLLUPS_SQL_PATH, 'r') as rollups_file:
+                rollups_sql = rollups_file.read()
+
+            if schema_name:
+                schemas = [schema_name]
+            else:
+                schemas = [tenant.schema_name for tenant in self.tenant_repository.get_all_tenants()]
+                db.session.commit()
+        except Exception as e:
+            logger.error(f"Error preparing rollup rebuild: {e}")
+            raise InternalServerError("An error occurred while preparing the rollup rebuild.")
+
+        results = []
+        for schema in schemas:
+            try:
+                logger.info(f"Rebuilding rollups for schema: {schema}")
+                tenant_connections.set_local_search_path(schema)
+                self.rollup_repository.install(rollups_sql)
+                self.rollup_repository.rebuild()
+                db.session.commit()
+                results.append({"schema_name": schema, "success": True, "message": "Rollups rebuilt"})
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error rebuilding rollups for schema {schema}: {e}")
+                results.append({"schema_name": schema, "success": False, "message": str(e)})
+        return results
@@ -30,6 +30,18 @@ class SaleService:
             logger.error(f"Error fetching paginated sales: {e}")
             raise InternalServerError("An error occurred while retrieving sales.")
 
+    def get_sales_keyset(self, per_page, after_id=None, include_total=False):
+        try:
+            logger.info(f"Fetching sales with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.sale_repository.get_sales_keyset(per_page, after_id, include_total)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated sales: {e}")
+            raise InternalServerError("An error occurred while retrieving sales.")
+
+    def export_sales(self):
+        logger.info("Exporting sales")
+        return self.sale_repository.stream_sales()
+
     def get_sale_by_id(self, sale_id):
         try:
             sale = self.sale_repository.get_sale_by_id(sale_id)
@@ -0,0 +1,154 @@
+import logging
+from datetime import datetime
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest, InternalServerError, NotFound
+from app.extensions import db, query_cache, tenant_connections
+from app.repositories.sales_report_repository import SalesReportRepository, REPORT_PERIODS
+from app.repositories.tenants_repository import TenantRepository
+from app.utils.tenant_connection import current_schema
+
+logger = logging.getLogger(__name__)
+
+SALES_REPORTS_SQL_PATH = 'db/assets/sales_reports.sql'
+
+class SalesReportService:
+
+    @inject
+    def __init__(self, sales_report_repository: SalesReportRepository, tenant_repository: TenantRepository):
+        self.sales_report_repository = sales_report_repository
+        self.tenant_repository = tenant_repository
+        # Schemas whose sales_reports table has already been adjusted by this process
+        self._installed_schemas = set()
+
+    def _install(self, schema_name):
+        if schema_name in self._installed_schemas:
+            return
+        with open(SALES_REPORTS_SQL_PATH, 'r') as sales_reports_file:
+            self.sales_report_repository.install(sales_reports_file.read())
+        self._installed_schemas.add(schema_name)
+
+    def generate_reports(self, report_types=None, since=None, schema_name=None, progress=None):
+        """
+        Builds the daily, weekly and monthly reports of one tenant.
+
+        Only closed periods without a report are computed, unless ``since`` is
+        given, in which case every period from ``since`` on is recomputed.
+
+        Args:
+            report_types (list): Subset of REPORT_PERIODS (default: all of them).
+            since (datetime): Recompute the periods starting at this date.
+            schema_name (str): Tenant schema (default: the current request's tenant).
+            progress (callable): Called with the completed fraction after each report type.
+
+        Returns:
+            list: One {"report_type", "period_start", "period_end", "reports"} entry per type.
+        """
+        report_types = report_types or list(REPORT_PERIODS)
+        unknown = [report_type for report_type in report_types if report_type not in REPORT_PERIODS]
+        if unknown:
+            raise BadRequest(f"Unknown report types: {', '.join(unknown)}")
+
+        schema_name = schema_name or current_schema() or 'public'
+        results = []
+        try:
+            now = datetime.utcnow()
+            for index, report_type in enumerate(report_types, start=1):
+                logger.info(f"Generating {report_type} sales reports for schema: {schema_name}")
+                tenant_connections.set_local_search_path(schema_name)
+                self._install(schema_name)
+                self.sales_report_repository.lock_report_type(f"sales_reports:{schema_name}:{report_type}")
+
+                period_start, period_end = self.sales_report_repository.get_pending_periods(report_type, now)
+                if since:
+                    period_start = self.sales_report_repository.truncate_to_period(report_type, since)
+
+                reports = 0
+                if period_start is not None and period_start < period_end:
+                    reports = self.sales_report_repository.generate_reports(report_type, period_start, period_end)
+                db.session.commit()
+
+                results.append({
+                    "report_type": report_type,
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    "reports": reports
+                })
+                if progress:
+                    progress(index / len(report_types))
+            query_cache.invalidate('sales_reports', schema_name)
+            return results
+        except Exception as e:
+            db.session.rollback()
+            self._installed_schemas.discard(schema_name)
+            logger.error(f"Error generating sales reports for schema {schema_name}: {e}")
+            raise InternalServerError("An error occurred while generating sales reports.")
+
+    def generate_for_tenants(self, schema_name=None, report_types=None, since=None):
+        """
+        Runs generate_reports for one or every tenant.
+
+        Returns:
+            list: One {"schema_name", "success", "message", "results"} entry per tenant.
+        """
+        try:
+            if schema_name:
+                schemas = [schema_name]
+            else:
+                schemas = [tenant.schema_name for tenant in self.tenant_repository.get_all_tenants()]
+                db.session.commit()
+        except Exception as e:
+            logger.error(f"Error listing tenants for sales reports: {e}")
+            raise InternalServerError("An error occurred while preparing the sales report generation.")
+
+        outcomes = []
+        for schema in schemas:
+            try:
+                results = self.generate_reports(report_types, since, schema)
+                reports = sum(result["reports"] for result in results)
+                outcomes.append({"schema_name": schema, "success": True,
+                                 "message": f"{reports} reports generated", "results": results})
+            except BadRequest:
+                raise
+            except Exception as e:
+                outcomes.append({"schema_name": schema, "success": False, "message": str(e), "results": []})
+        return outcomes
+
+    def get_sales_reports_paginated(self, page, per_page, **filters):
+        try:
+            logger.info(f"Fetching sales reports with pagination: page {page}, per_page {per_page}")
+            return self.sales_report_repository.get_sales_reports_paginated(page, per_page, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching paginated sales reports: {e}")
+            raise InternalServerError("An error occurred while fetching sales reports.")
+
+    def get_sales_reports_keyset(self, per_page, after_id=None, include_total=False, **filters):
+        try:
+            logger.info(f"Fetching sales reports with keyset pagination: after_id {after_id}, per_page {per_page}")
+            return self.sales_report_repository.get_sales_reports_keyset(per_page, after_id, include_total, **filters)
+        except Exception as e:
+            logger.error(f"Error fetching keyset-paginated sales reports: {e}")
+            raise InternalServerError("An error occurred while fetching sales reports.")
+
+    def get_sales_report_by_id(self, report_id):
+        try:
+            report = self.sales_report_repository.get_sales_report_by_id(report_id)
+            if not report:
+                raise NotFound("Sales report not found")
+            return report
+        except NotFound:
+            raise
+        except Exception as e:
+            logger.error(f"Error retrieving sales report by ID {report_id}: {e}")
+            raise InternalServerError("An error occurred while retrieving the sales report.")
+
+    def delete_sales_report(self, report_id):
+        try:
+            result = self.sales_report_repository.delete_sales_report(report_id)
+            if not result:
+                raise NotFound("Sales report not found")
+            return result
+        except NotFound:
+            raise
+        except Exception as e:
+            logger.error(f"Error deleting sales report: {e}")
+            raise InternalServerError("An error occurred while deleting the sales report.")
@@ -0,0 +1,186 @@
+import csv
+import io
+import json
+from collections import namedtuple
+from datetime import datetime
+from werkzeug.exceptions import BadRequest
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+IMPORT_FORMATS = (CSV, NDJSON)
+
+Field = namedtuple('Field', ['name', 'parse', 'required', 'default'])
+
+
+def _text(value):
+    value = str(value).strip()
+    return value or None
+
+
+def _email(value):
+    value = _text(value)
+    if value and '@' not in value:
+        raise ValueError("invalid email")
+    return value
+
+
+def _int(value):
+    if isinstance(value, bool):
+        raise ValueError("expected an integer")
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError("expected an integer")
+    return int(value)
+
+
+def _non_negative_int(value):
+    value = _int(value)
+    if value < 0:
+        raise ValueError("must be zero or greater")
+    return value
+
+
+def _float(value):
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    return float(value)
+
+
+def _non_negative_float(value):
+    value = _float(value)
+    if value < 0:
+        raise ValueError("must be zero or greater")
+    return value
+
+
+def _datetime(value):
+    return datetime.fromisoformat(str(value).strip())
+
+
+# Columns accepted by each importable table, in COPY order
+IMPORT_FIELDS = {
+    'customers': [
+        Field('full_name', _text, True, None),
+        Field('email', _email, True, None),
+        Field('phone', _text, True, None),
+        Field('address', _text, False, None),
+        Field('credit_limit', _non_negative_float, False, 0.0)
+    ],
+    'products': [
+        Field('name', _text, True, None),
+        Field('description', _text, False, None),
+        Field('price', _non_negative_float, True, None),
+        Field('stock', _non_negative_int, True, None)
+    ],
+    'inventory': [
+        Field('product_id', _int, True, None),
+        Field('stock_quantity', _non_negative_int, True, None),
+        Field('restock_date', _datetime, False, None)
+    ]
+}
+
+
+def detect_format(content_type=None, filename=None, explicit=None):
+    """Picks csv or ndjson from an explicit value, the file extension or the content type."""
+    if explicit:
+        explicit = explicit.lower()
+        if explicit not in IMPORT_FORMATS:
+            raise BadRequest(f"Invalid 'format', expected one of: {', '.join(IMPORT_FORMATS)}")
+        return explicit
+    if filename and filename.lower().endswith('.csv'):
+        return CSV
+    if content_type and 'csv' in content_type:
+        return CSV
+    return NDJSON
+
+
+def read_records(stream, import_format):
+    """
+    Yields ``(row_number, record)`` from a binary stream, one record at a
+    time. ``record`` is a dict, or an error message for unparseable NDJSON lines.
+    """
+    text_stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    if import_format == CSV:
+        for row_number, record in enumerate(csv.DictReader(text_stream), start=1):
+            yield row_number, record
+        return
+
+    row_number = 0
+    for line in text_stream:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, "invalid JSON"
+            continue
+        yield row_number, record if isinstance(record, dict) else "expected a JSON object"
+
+
+def validate_record(fields, record):
+    """
+    Converts a raw record into the tuple of column values of ``fields``.
+
+    Returns:
+        tuple: (values, errors). ``values`` is None when ``errors`` is not empty.
+    """
+    if not isinstance(record, dict):
+        return None, {"row": record}
+
+    values, errors = [], {}
+    for field in fields:
+        raw = record.get(field.name)
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            if field.required:
+                errors[field.name] = "required"
+            values.append(field.default)
+            continue
+        try:
+            value = field.parse(raw)
+        except (TypeError, ValueError) as e:
+            errors[field.name] = str(e) or "invalid value"
+            continue
+        if value is None and field.required:
+            errors[field.name] = "required"
+        values.append(value if value is not None else field.default)
+    return (None, errors) if errors else (tuple(values), None)
+
+
+class CopyStream(io.RawIOBase):
+    """
+    Read-only file object feeding COPY ... FROM STDIN (FORMAT csv) from an
+    iterable of value tuples, encoding one row at a time.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b''
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line, lineterminator='\n')
+
+    def readable(self):
+        return True
+
+    def _encode(self, values):
+        self._line.seek(0)
+        self._line.truncate(0)
+        self._writer.writerow(['' if value is None else _copy_value(value) for value in values])
+        return self._line.getvalue().encode('utf-8')
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            values = next(self._rows, None)
+            if values is None:
+                break
+            self._buffer += self._encode(values)
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _copy_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,103 @@
+import json
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.extensions import db, query_cache
+from app.utils.tenant_connection import current_schema
+
+EXACT = 'exact'
+ESTIMATED = 'estimated'
+CACHED = 'cached'
+COUNT_STRATEGIES = (EXACT, ESTIMATED, CACHED)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper so the planner estimate goes through the normal execution path."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def get_count_strategy():
+    """
+    Returns the count strategy for the current request: the ``count`` query
+    argument when it is a known strategy, otherwise PAGINATION_COUNT_STRATEGY.
+    """
+    strategy = request.args.get('count') if has_request_context() else None
+    if strategy in COUNT_STRATEGIES:
+        return strategy
+    if has_app_context():
+        return current_app.config.get('PAGINATION_COUNT_STRATEGY', EXACT)
+    return EXACT
+
+
+def _table_name(query):
+    return query.column_descriptions[0]['entity'].__table__.name
+
+
+def _exact_count(query):
+    return query.order_by(None).count()
+
+
+def _estimated_count(query, session):
+    """
+    Planner estimate: pg_class.reltuples for unfiltered queries, EXPLAIN rows
+    otherwise. Falls back to an exact count outside PostgreSQL or when the
+    table has never been analyzed.
+    """
+    if session.get_bind().dialect.name != 'postgresql':
+        return _exact_count(query)
+
+    statement = query.order_by(None).statement
+    if statement.whereclause is None:
+        schema = current_schema()
+        relation = f"{schema}.{_table_name(query)}" if schema else _table_name(query)
+        estimate = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:relation)"),
+            {"relation": relation}
+        ).scalar()
+    else:
+        plan = session.execute(Explain(statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]['Plan']['Plan Rows']
+
+    if estimate is None or estimate < 0:
+        return _exact_count(query)
+    return int(estimate)
+
+
+def count_rows(query, strategy=None):
+    """
+    Counts the rows matched by ``query`` with the requested strategy.
+
+    Args:
+        query: The filtered ORM query of a list endpoint.
+        strategy (str): One of COUNT_STRATEGIES; defaults to get_count_strategy().
+
+    Returns:
+        int: The exact or approximate number of rows.
+    """
+    strategy = strategy or get_count_strategy()
+
+    if strategy == ESTIMATED:
+        return _estimated_count(query, db.session)
+
+    if strategy == CACHED:
+        compiled = query.order_by(None).statement.compile()
+        key = ('count', str(compiled), repr(sorted(compiled.params.items())))
+
+        total = query_cache.get(key)
+        if total is None:
+            ttl = current_app.config.get('COUNT_CACHE_TTL') if has_app_context() else None
+            total = query_cache.set(key, _exact_count(query), [_table_name(query)], ttl)
+        return total
+
+    return _exact_count(query)
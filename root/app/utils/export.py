@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Response, current_app, request, stream_with_context
+from werkzeug.exceptions import BadRequest
+from app.utils.projection import project_columns
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+EXPORT_FORMATS = {
+    NDJSON: 'application/x-ndjson',
+    CSV: 'text/csv'
+}
+
+
+def get_export_format():
+    """Reads the ``format`` query argument of an export request (default: ndjson)."""
+    export_format = request.args.get('format', NDJSON).lower()
+    if export_format not in EXPORT_FORMATS:
+        raise BadRequest(f"Invalid 'format', expected one of: {', '.join(EXPORT_FORMATS)}")
+    return export_format
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_default, separators=(',', ':'))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_query(query, batch_size=None):
+    """
+    Executes an ORM query through a server-side cursor, fetching
+    ``batch_size`` rows at a time, so only one batch is held in memory.
+
+    Returns:
+        Result: Rows of the query; use ``.scalars()`` for entity queries.
+    """
+    batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    return query.session.execute(query.statement, execution_options={"yield_per": batch_size})
+
+
+def stream_columns(query, model, batch_size=None):
+    """
+    Streams the table columns of ``model`` as dicts, ordered by id. Rows are
+    read as plain tuples instead of ORM instances, which keeps the identity
+    map empty and skips attribute instrumentation.
+    """
+    query = project_columns(query, model).order_by(model.id)
+    for row in stream_query(query, batch_size):
+        yield row._asdict()
+
+
+def _ndjson_chunks(rows, chunk_rows):
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, default=_default, separators=(',', ':')))
+        if len(buffer) >= chunk_rows:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def _csv_chunks(rows, chunk_rows):
+    output = io.StringIO()
+    writer = None
+    pending = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(output, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow({key: _csv_value(value) for key, value in row.items()})
+        pending += 1
+        if pending >= chunk_rows:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            pending = 0
+    if output.tell():
+        yield output.getvalue()
+
+
+def export_response(rows, filename, export_format=None):
+    """
+    Streams ``rows`` (an iterable of dicts) as NDJSON or CSV.
+
+    The iterable is consumed while the response is sent, inside the request
+    context, so the tenant schema and the database session stay available.
+    Rows are written in chunks of EXPORT_CHUNK_ROWS.
+    """
+    export_format = export_format or get_export_format()
+    chunk_rows = current_app.config.get('EXPORT_CHUNK_ROWS', 500)
+    chunks = _csv_chunks(rows, chunk_rows) if export_format == CSV else _ndjson_chunks(rows, chunk_rows)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}.{export_format}"}
+    )
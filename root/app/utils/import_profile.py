@@ -0,0 +1,123 @@
+"""
+Import-time profile of the Lambda entry point.
+
+Runs ``import wsgi`` in a fresh interpreter with ``-X importtime`` and reports
+the modules that cost the most, so cold start regressions show up before
+deploying:
+
+    python -m app.utils.import_profile --top 25
+    python -m app.utils.import_profile --config app.config.Config --json > baseline.json
+    python -m app.utils.import_profile --baseline baseline.json --threshold 20
+
+With ``--baseline`` the exit status is 1 when the total import time grew more
+than ``--threshold`` percent.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+ImportTime = namedtuple('ImportTime', ['module', 'self_us', 'cumulative_us', 'depth'])
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def parse_import_times(stderr):
+    """Parses the ``-X importtime`` report into ImportTime entries."""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportTime(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def profile(entry_point='wsgi', config=None, cwd=None):
+    """
+    Imports ``entry_point`` in a subprocess and returns its ImportTime entries.
+
+    Args:
+        entry_point (str): Module to import.
+        config (str): APP_CONFIG for the subprocess, e.g. app.config.LambdaConfig.
+        cwd (str): Working directory (the one holding db/assets).
+    """
+    env = dict(os.environ)
+    if config:
+        env['APP_CONFIG'] = config
+    source_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [source_root, env.get('PYTHONPATH')]))
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {entry_point}"],
+                            env=env, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(f"import {entry_point} failed:\n" + '\n'.join(errors[-20:]))
+    return parse_import_times(result.stderr)
+
+
+def summarize(entries, top=20):
+    """
+    Builds the report: total time, time per top-level package and the
+    slowest modules by self time.
+    """
+    packages = {}
+    for entry in entries:
+        package = entry.module.split('.')[0]
+        packages[package] = packages.get(package, 0) + entry.self_us
+
+    return {
+        'total_ms': round(sum(entry.self_us for entry in entries) / 1000, 1),
+        'modules': len(entries),
+        'packages': [{'package': package, 'self_ms': round(self_us / 1000, 1)}
+                     for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]],
+        'slowest': [{'module': entry.module, 'self_ms': round(entry.self_us / 1000, 1),
+                     'cumulative_ms': round(entry.cumulative_us / 1000, 1)}
+                    for entry in sorted(entries, key=lambda entry: -entry.self_us)[:top]],
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"Total import time: {report['total_ms']} ms across {report['modules']} modules")
+    if baseline:
+        print(f"Baseline: {baseline['total_ms']} ms ({report['total_ms'] - baseline['total_ms']:+.1f} ms)")
+    print("\nBy package (self time):")
+    for package in report['packages']:
+        print(f"  {package['self_ms']:>9.1f} ms  {package['package']}")
+    print("\nSlowest modules (self / cumulative):")
+    for module in report['slowest']:
+        print(f"  {module['self_ms']:>9.1f} / {module['cumulative_ms']:>9.1f} ms  {module['module']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time profile of the Lambda entry point")
+    parser.add_argument('--entry-point', default='wsgi')
+    parser.add_argument('--config', default='app.config.LambdaConfig', help="APP_CONFIG used for the import")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON (usable as a baseline)")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=20.0, help="Allowed growth over the baseline, in percent")
+    args = parser.parse_args(argv)
+
+    report = summarize(profile(args.entry_point, args.config), args.top)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, baseline)
+
+    if baseline and report['total_ms'] > baseline['total_ms'] * (1 + args.threshold / 100):
+        print(f"Import time regressed more than {args.threshold}% over the baseline", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
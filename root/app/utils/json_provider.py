@@ -0,0 +1,76 @@
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+from app.utils.request_metrics import SERIALIZE_PHASE, timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetime rendering: 'http' keeps Flask's RFC 822 dates ("Wed, 21 Oct 2015 07:28:00 GMT"),
+# 'iso' emits ISO 8601 like the exports do and lets orjson encode datetimes natively
+HTTP_DATES = 'http'
+ISO_DATES = 'iso'
+DATETIME_FORMATS = (HTTP_DATES, ISO_DATES)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider used by ``jsonify`` (and therefore ``create_response``).
+
+    Encodes with orjson when it is installed, which serializes dicts, lists,
+    datetimes and numbers in C, and falls back to the standard library
+    otherwise. Decimals are rendered as strings and datetimes as selected by
+    JSON_DATETIME_FORMAT in both paths, so the output does not depend on
+    whether orjson is available. Keys are not sorted.
+    """
+
+    sort_keys = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.datetime_format = app.config.get('JSON_DATETIME_FORMAT', HTTP_DATES)
+        if self.datetime_format not in DATETIME_FORMATS:
+            raise ValueError(f"Unknown JSON_DATETIME_FORMAT: {self.datetime_format}")
+
+        self.orjson_options = 0
+        if orjson is not None:
+            self.orjson_options = orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                self.orjson_options |= orjson.OPT_SORT_KEYS
+            if self.datetime_format == HTTP_DATES:
+                self.orjson_options |= orjson.OPT_PASSTHROUGH_DATETIME
+
+    def default(self, value):
+        if self.datetime_format == ISO_DATES and isinstance(value, date):
+            return value.isoformat()
+        return DefaultJSONProvider.default(value)
+
+    def encode(self, obj):
+        """Serializes ``obj`` to UTF-8 bytes."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self.orjson_options)
+            except orjson.JSONEncodeError:
+                # e.g. integers wider than 64 bits, which the standard library handles
+                pass
+        return super().dumps(obj).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs or orjson is None:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs or orjson is None:
+            return super().loads(s, **kwargs)
+        # orjson.JSONDecodeError subclasses ValueError, as request.get_json expects
+        return orjson.loads(s)
+
+    @timed(SERIALIZE_PHASE)
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            # Indented output for debugging goes through the standard library
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode(obj) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,63 @@
+import threading
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Engine options only understood by QueuePool (and its subclasses)
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_use_lifo')
+
+
+def supported_pool_options(options):
+    """
+    Drops the QueuePool sizing options when the engine will use another pool,
+    e.g. the StaticPool of in-memory SQLite, which rejects them.
+    """
+    url = make_url(options['url'])
+    poolclass = options.get('poolclass') or url.get_dialect().get_pool_class(url)
+    if issubclass(poolclass, QueuePool):
+        return options
+    return {key: value for key, value in options.items() if key not in QUEUE_POOL_OPTIONS}
+
+
+class DeferredEngine:
+    """Placeholder for an engine that is created the first time it is needed."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.engine = None
+        self._lock = threading.Lock()
+
+    def create(self):
+        with self._lock:
+            if self.engine is None:
+                self.engine = self.factory()
+        return self.engine
+
+    def dispose(self):
+        if self.engine is not None:
+            self.engine.dispose()
+
+
+class LazySQLAlchemy(SQLAlchemy):
+    """
+    SQLAlchemy extension that, with LAZY_APP enabled, creates the engines on
+    first use instead of in ``init_app``.
+
+    Creating an engine imports the dialect and the DBAPI driver and builds the
+    pool, none of which a cold start needs before its first query. Any access
+    to ``db.engines`` (sessions, ``db.engine``, event listeners) creates them.
+    """
+
+    def _make_engine(self, bind_key, options, app):
+        options = supported_pool_options(options)
+        if not app.config.get('LAZY_APP', False):
+            return super()._make_engine(bind_key, options, app)
+        return DeferredEngine(lambda: super(LazySQLAlchemy, self)._make_engine(bind_key, options, app))
+
+    @property
+    def engines(self):
+        engines = super().engines
+        for key, engine in list(engines.items()):
+            if isinstance(engine, DeferredEngine):
+                engines[key] = engine.create()
+        return engines
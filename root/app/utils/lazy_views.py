@@ -0,0 +1,159 @@
+import ast
+import importlib
+import importlib.util
+import logging
+import pkgutil
+import sys
+import threading
+from collections import namedtuple
+from flask_injector import wrap_fun
+from injector import singleton
+
+logger = logging.getLogger(__name__)
+
+RouteSpec = namedtuple('RouteSpec', ['rule', 'endpoint', 'function', 'methods'])
+
+
+def import_models():
+    """
+    Imports every module of ``app.models``. Models are cheap to import and
+    all of them must be mapped before the first query, because foreign keys
+    and relationships refer to each other by name.
+    """
+    import app.models
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise ValueError(f"line {node.lineno}: only literal route arguments can be registered lazily")
+
+
+def scan_blueprint(module_name, blueprint_attr):
+    """
+    Reads the name and routes of a blueprint from the controller source
+    without importing it.
+
+    Only ``Blueprint('name', __name__)`` and ``@bp.route('<literal>', methods=[...])``
+    are understood. Any other use of the blueprint (hooks, error handlers,
+    url_prefix, ...) raises ValueError so the caller falls back to importing it.
+
+    Returns:
+        tuple: (blueprint name, list of RouteSpec).
+    """
+    spec = importlib.util.find_spec(module_name)
+    with open(spec.origin, 'r') as source_file:
+        tree = ast.parse(source_file.read(), spec.origin)
+
+    blueprint_name = None
+    routes = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == blueprint_attr for target in node.targets):
+            call = node.value
+            if not (isinstance(call, ast.Call) and getattr(call.func, 'id', None) == 'Blueprint') or call.keywords:
+                raise ValueError(f"line {node.lineno}: unsupported blueprint definition")
+            blueprint_name = _literal(call.args[0])
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for decorator in node.decorator_list:
+                if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)
+                        and getattr(decorator.func.value, 'id', None) == blueprint_attr):
+                    continue
+                if decorator.func.attr != 'route':
+                    raise ValueError(f"line {decorator.lineno}: unsupported blueprint hook {decorator.func.attr}")
+                options = {keyword.arg: _literal(keyword.value) for keyword in decorator.keywords}
+                if set(options) - {'methods', 'endpoint'}:
+                    raise ValueError(f"line {decorator.lineno}: unsupported route options {sorted(options)}")
+                routes.append(RouteSpec(_literal(decorator.args[0]), options.get('endpoint', node.name),
+                                        node.name, options.get('methods')))
+
+        elif isinstance(node, ast.Attribute) and getattr(node.value, 'id', None) == blueprint_attr \
+                and node.attr != 'route':
+            raise ValueError(f"line {node.lineno}: unsupported use of {blueprint_attr}.{node.attr}")
+
+    if blueprint_name is None:
+        raise ValueError(f"{blueprint_attr} is not defined")
+    return blueprint_name, routes
+
+
+class LazyView:
+    """
+    URL rule target that imports its controller on the first request.
+
+    The controller module (and with it its services, repositories and their
+    dependencies) is imported once, the view is wrapped for Flask-Injector
+    and every later call goes straight to it.
+    """
+
+    def __init__(self, registry, module_name, function_name):
+        self.registry = registry
+        self.module_name = module_name
+        self.function_name = function_name
+        self._view = None
+
+    def __call__(self, *args, **kwargs):
+        view = self._view or self._load()
+        return view(*args, **kwargs)
+
+    def _load(self):
+        with self.registry.lock:
+            if self._view is None:
+                module = self.registry.load_module(self.module_name)
+                self._view = wrap_fun(getattr(module, self.function_name), self.registry.app.injector)
+        return self._view
+
+
+class LazyBlueprints:
+    """
+    Registers the URL rules of controller blueprints without importing them.
+
+    Endpoints keep the ``blueprint.function`` names they have when the
+    blueprint is registered normally, so ``url_for`` is unaffected. Services
+    listed in ``services`` are bound as singletons as soon as their module has
+    been imported, by a controller or by anything else.
+    """
+
+    def __init__(self, app, services):
+        self.app = app
+        self.services = services
+        self.lock = threading.RLock()
+        self.loaded_modules = set()
+        self.bound_services = set()
+
+    def register(self, module_name, blueprint_attr, url_prefix=''):
+        try:
+            blueprint_name, routes = scan_blueprint(module_name, blueprint_attr)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.warning(f"Registering {module_name} eagerly: {e}")
+            self.app.register_blueprint(getattr(self.load_module(module_name), blueprint_attr), url_prefix=url_prefix)
+            return
+
+        views = {}
+        for route in routes:
+            view = views.setdefault(route.function, LazyView(self, module_name, route.function))
+            self.app.add_url_rule(f"{url_prefix}{route.rule}", endpoint=f"{blueprint_name}.{route.endpoint}",
+                                  view_func=view, methods=route.methods)
+
+    def load_module(self, module_name):
+        with self.lock:
+            module = importlib.import_module(module_name)
+            if module_name not in self.loaded_modules:
+                self.loaded_modules.add(module_name)
+                logger.info(f"Loaded controller {module_name}")
+            if hasattr(self.app, 'injector'):
+                self.bind_loaded_services(self.app.injector.binder)
+            return module
+
+    def bind_loaded_services(self, binder):
+        """Binds, as singletons, the services whose module has already been imported."""
+        for module_name, class_name in self.services:
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            service = getattr(module, class_name)
+            if service not in self.bound_services:
+                binder.bind(service, to=service, scope=singleton)
+                self.bound_services.add(service)
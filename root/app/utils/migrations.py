@@ -0,0 +1,92 @@
+import hashlib
+import os
+import re
+from collections import namedtuple
+
+# Versioned tenant migrations live in TENANT_MIGRATIONS_PATH as NNNN_description.sql.
+# Each one runs with the search_path pointing at the tenant schema, in its own
+# transaction, and is recorded in that schema's schema_migrations table.
+# Database-level changes (public tables, extensions) live in PUBLIC_MIGRATIONS_PATH
+# and are recorded in public.database_migrations instead: an unqualified
+# schema_migrations in public would be found through the search_path of every tenant.
+#
+# A migration with a ``-- requires: ext1, ext2`` line depends on those
+# PostgreSQL extensions: it stays pending, without being recorded, until they
+# are installed in the database.
+Migration = namedtuple('Migration', ['version', 'name', 'path', 'sql', 'checksum', 'requires'])
+
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d+)_([a-z0-9_]+)\.sql$')
+REQUIRES_PATTERN = re.compile(r'^--\s*requires:\s*(.+)$', re.MULTILINE)
+
+SCHEMA_MIGRATIONS_TABLE = 'schema_migrations'
+PUBLIC_MIGRATIONS_TABLE = 'public.database_migrations'
+
+
+def migrations_table_ddl(table):
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    checksum VARCHAR NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+"""
+
+
+SCHEMA_MIGRATIONS_DDL = migrations_table_ddl(SCHEMA_MIGRATIONS_TABLE)
+
+
+def load_migrations(directory):
+    """
+    Reads every migration of ``directory`` ordered by version.
+
+    Returns an empty list when the directory does not exist. Files that do not
+    follow the NNNN_description.sql naming are ignored.
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    migrations = []
+    versions = {}
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in versions:
+            raise ValueError(f"Duplicate migration version {version}: {versions[version]} and {filename}")
+        versions[version] = filename
+
+        path = os.path.join(directory, filename)
+        with open(path, 'r') as migration_file:
+            sql = migration_file.read()
+        checksum = hashlib.sha256(sql.encode()).hexdigest()[:16]
+        migrations.append(Migration(version, match.group(2), path, sql, checksum, required_extensions(sql)))
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def required_extensions(sql):
+    """Returns the extensions named in the ``-- requires:`` lines of ``sql``."""
+    return tuple(
+        extension.strip()
+        for line in REQUIRES_PATTERN.findall(sql)
+        for extension in line.split(',')
+        if extension.strip()
+    )
+
+
+def stamp_sql(migrations):
+    """
+    Builds the SQL that creates schema_migrations and records ``migrations`` as
+    applied. Appended to the provisioning script, whose DDL already includes them.
+    """
+    rows = ',\n'.join(
+        f"    ({migration.version}, '{migration.name}', '{migration.checksum}')" for migration in migrations
+    )
+    if not rows:
+        return SCHEMA_MIGRATIONS_DDL
+    return (
+        f"{SCHEMA_MIGRATIONS_DDL}\n"
+        f"INSERT INTO schema_migrations (version, name, checksum) VALUES\n{rows}\n"
+        f"ON CONFLICT (version) DO NOTHING;\n"
+    )
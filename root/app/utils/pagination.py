@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+from flask import request
+from werkzeug.exceptions import BadRequest
+from app.utils.counting import count_rows
+
+KeysetArgs = namedtuple('KeysetArgs', ['after_id', 'include_total'])
+
+
+def _encode_payload(payload):
+    payload = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def _decode_payload(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequest("Invalid cursor")
+    if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+        raise BadRequest("Invalid cursor")
+    return payload
+
+
+def encode_cursor(last_id):
+    """Encodes the id of the last row of a page into an opaque cursor."""
+    if last_id is None:
+        return None
+    return _encode_payload({"id": last_id})
+
+
+def decode_cursor(cursor):
+    """Decodes a cursor produced by encode_cursor back into a row id."""
+    return _decode_payload(cursor)["id"]
+
+
+def encode_rank_cursor(rank, last_id):
+    """
+    Encodes the position of the last row of a ranked page. The rank is a
+    Decimal and is kept as a string so it round-trips exactly.
+    """
+    if last_id is None:
+        return None
+    return _encode_payload({"rank": str(rank), "id": last_id})
+
+
+def decode_rank_cursor(cursor):
+    """Decodes a cursor produced by encode_rank_cursor into (rank, id)."""
+    payload = _decode_payload(cursor)
+    try:
+        return Decimal(payload["rank"]), payload["id"]
+    except (KeyError, TypeError, InvalidOperation):
+        raise BadRequest("Invalid cursor")
+
+
+def get_keyset_args():
+    """
+    Reads the keyset pagination arguments of the current request.
+
+    Keyset pagination is opt-in: it is used when the request carries a
+    ``cursor`` (an empty cursor requests the first page) or an ``after_id``.
+    The total row count is only computed when ``include_total=true``.
+
+    Returns:
+        KeysetArgs: The decoded arguments, or None for offset pagination.
+    """
+    cursor = request.args.get('cursor')
+    after_id = request.args.get('after_id', type=int)
+    if cursor is None and after_id is None:
+        return None
+
+    if cursor:
+        after_id = decode_cursor(cursor)
+
+    include_total = request.args.get('include_total', 'false').lower() == 'true'
+    return KeysetArgs(after_id=after_id, include_total=include_total)
+
+
+def keyset_paginate(query, id_column, per_page, after_id=None, include_total=False):
+    """
+    Seeks on ``id_column`` (newest first) instead of using OFFSET.
+
+    One extra row is fetched to know whether another page exists, so no
+    COUNT(*) is needed unless ``include_total`` is set. The total honours the
+    request's count strategy.
+
+    Returns:
+        tuple: (items, next_id, total). ``next_id`` is None on the last page
+        and ``total`` is None unless requested.
+    """
+    total = count_rows(query) if include_total else None
+
+    if after_id is not None:
+        query = query.filter(id_column < after_id)
+    rows = query.order_by(id_column.desc()).limit(per_page + 1).all()
+
+    items = rows[:per_page]
+    next_id = items[-1].id if len(rows) > per_page and items else None
+    return items, next_id, total
+
+
+def keyset_result(data, next_id, total=None):
+    """Builds the ``result`` payload of a keyset-paginated response."""
+    result = {"data": data, "next_cursor": encode_cursor(next_id)}
+    if total is not None:
+        result["total"] = total
+    return result
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from app.utils.tenant_connection import current_schema
+
+
+class QueryCache:
+    """
+    Short-lived per-tenant cache of query results.
+
+    Every entry declares the tables it was computed from. As soon as a session
+    commits a write to one of those tables, the entries of the current tenant
+    that depend on it are dropped, so a cached result is never older than the
+    last committed write made through the ORM (or than its TTL, for writes made
+    elsewhere).
+
+    The cache never holds more than ``QUERY_CACHE_MAX_SIZE`` entries across
+    all tenants; expired entries are dropped first, then the least recently
+    used ones.
+    """
+
+    def __init__(self, db=None, ttl=30, max_size=1024):
+        self.db = db
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._keys_by_table = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app, db=None):
+        if db is not None:
+            self.db = db
+        self.max_size = app.config.get('QUERY_CACHE_MAX_SIZE', self.max_size)
+
+        session = self.db.session
+        if not event.contains(session, 'after_flush', _collect_written_tables):
+            event.listen(session, 'after_flush', _collect_written_tables)
+            event.listen(session, 'after_commit', self._invalidate_written_tables)
+            event.listen(session, 'after_rollback', _forget_written_tables)
+        app.extensions['query_cache'] = self
+
+    def get(self, key, tenant=None):
+        tenant = tenant or current_schema() or 'public'
+        with self._lock:
+            entry = self._entries.get((tenant, key))
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop((tenant, key))
+                self.misses += 1
+                return None
+            self._entries.move_to_end((tenant, key))
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tables, ttl=None, tenant=None):
+        """
+        Stores ``value`` under ``key`` for the current tenant.
+
+        Args:
+            key (tuple): Hashable key, unique per query and parameters.
+            value: The result to cache.
+            tables (iterable): Table names the result was computed from.
+            ttl (int): Seconds to keep the entry (default: the cache ttl).
+        """
+        if self.max_size <= 0:
+            return value
+
+        tenant = tenant or current_schema() or 'public'
+        tables = tuple(tables)
+        now = time.monotonic()
+        with self._lock:
+            self._drop((tenant, key))
+            self._entries[(tenant, key)] = (now + (self.ttl if ttl is None else ttl), value, tables)
+            for table in tables:
+                self._keys_by_table.setdefault((tenant, table), set()).add(key)
+            if len(self._entries) > self.max_size:
+                self._evict(now)
+        return value
+
+    def invalidate(self, table, tenant=None):
+        """Drops the entries of ``tenant`` (default: current tenant) that depend on ``table``."""
+        tenant = tenant or current_schema() or 'public'
+        with self._lock:
+            for key in list(self._keys_by_table.get((tenant, table), ())):
+                self._drop((tenant, key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl
+            }
+
+    def _drop(self, entry_key):
+        """Removes an entry and its table references. Caller holds the lock."""
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        tenant, key = entry_key
+        for table in entry[2]:
+            keys = self._keys_by_table.get((tenant, table))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[(tenant, table)]
+
+    def _evict(self, now):
+        """Drops expired entries, then the least recently used. Caller holds the lock."""
+        for entry_key in [entry_key for entry_key, entry in self._entries.items() if entry[0] <= now]:
+            self._drop(entry_key)
+        while len(self._entries) > self.max_size:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _invalidate_written_tables(self, session):
+        for table in session.info.pop('written_tables', ()):
+            self.invalidate(table)
+
+
+def _collect_written_tables(session, flush_context):
+    tables = session.info.setdefault('written_tables', set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(instance, '__tablename__', None)
+        if table:
+            tables.add(table)
+
+
+def _forget_written_tables(session):
+    session.info.pop('written_tables', None)
@@ -0,0 +1,61 @@
+from datetime import date, datetime, timedelta
+from flask import request
+from werkzeug.exceptions import BadRequest
+
+
+def get_datetime_arg(name):
+    """
+    Reads an ISO 8601 date or datetime query argument.
+
+    Returns:
+        datetime: The parsed value, or None when the argument is missing.
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"Invalid '{name}' date, expected ISO 8601 (YYYY-MM-DD[THH:MM:SS])")
+
+
+def get_until_arg(name='until'):
+    """
+    Reads the end of a date range as an exclusive upper bound. A date-only
+    value covers that whole day, so it becomes midnight of the next day;
+    compare with ``< until``.
+
+    Returns:
+        datetime: The bound, or None when the argument is missing.
+    """
+    until = get_datetime_arg(name)
+    if until is not None and _is_date_only(request.args[name]):
+        until += timedelta(days=1)
+    return until
+
+
+def _is_date_only(value):
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def get_int_arg(name, default, minimum=None, maximum=None):
+    """
+    Reads an integer query argument within [minimum, maximum].
+
+    Returns:
+        int: The parsed value, or ``default`` when the argument is missing.
+    """
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise BadRequest(f"Invalid '{name}', expected an integer")
+    if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        raise BadRequest(f"'{name}' must be between {minimum} and {maximum}")
+    return value
@@ -0,0 +1,209 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.tenant_connection import current_schema
+
+# Upper bounds of the histogram buckets: milliseconds for timings, statements for counts
+TIME_BUCKETS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Phases timed inside a request besides the SQL statements
+TENANT_PHASE = 'tenant'
+SERIALIZE_PHASE = 'serialize'
+
+# Tenant reported for series beyond REQUEST_METRICS_MAX_SERIES
+OTHER_TENANT = '_other'
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; quantiles are reported as bucket upper bounds,
+    capped at the largest value observed.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if bucket and seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return 0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'avg': round(self.sum / self.count, 3) if self.count else 0,
+            'max': round(self.max, 3),
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': {str(bound): count for bound, count in zip((*self.bounds, '+Inf'), self.buckets) if count},
+        }
+
+
+class RequestTiming:
+    """Accumulates the measurements of a single request."""
+
+    __slots__ = ('start', 'statements', 'db_ms', 'phases')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.db_ms = 0.0
+        self.phases = {}
+
+    def add(self, phase, elapsed_ms):
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed_ms
+
+
+def current_timing():
+    """Returns the RequestTiming of the current request, if it is being measured."""
+    if not has_request_context():
+        return None
+    return g.get('_request_timing')
+
+
+@contextmanager
+def timed(phase):
+    """
+    Adds the time spent in the block (or decorated function) to ``phase`` of
+    the current request. Does nothing outside a measured request.
+    """
+    timing = current_timing()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, (time.perf_counter() - start) * 1000)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_timing() is not None:
+        context._request_metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_request_metrics_start', None)
+    if start is None:
+        return
+    timing = current_timing()
+    if timing is not None:
+        timing.statements += 1
+        timing.db_ms += (time.perf_counter() - start) * 1000
+
+
+class RequestMetrics:
+    """
+    Per-request instrumentation: total latency, SQL statements, DB time,
+    serialization time and tenant resolution time.
+
+    Every request is recorded in in-process histograms keyed by endpoint and
+    tenant schema (GET /api/v1/admin/metrics) and, with SERVER_TIMING_HEADER,
+    reported in a ``Server-Timing`` header. The SQL statements are counted by
+    engine-level cursor events, so engines created lazily are covered too.
+    Each request costs a few clock reads and one short lock.
+
+    The histograms live in the process: on Lambda every container keeps its own.
+    """
+
+    def __init__(self, max_series=1000):
+        self.max_series = max_series
+        self.server_timing = True
+        self.since = datetime.now(timezone.utc)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['request_metrics'] = self
+        if not app.config.get('REQUEST_METRICS_ENABLED', True):
+            return
+        self.max_series = app.config.get('REQUEST_METRICS_MAX_SERIES', self.max_series)
+        self.server_timing = app.config.get('SERVER_TIMING_HEADER', True)
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _start_request(self):
+        g._request_timing = RequestTiming()
+
+    def _finish_request(self, response):
+        timing = g.pop('_request_timing', None)
+        if timing is None:
+            return response
+        total_ms = (time.perf_counter() - timing.start) * 1000
+
+        if self.server_timing:
+            metrics = [f'total;dur={total_ms:.1f}', f'db;dur={timing.db_ms:.1f};desc="{timing.statements} statements"']
+            metrics += [f'{phase};dur={elapsed_ms:.1f}' for phase, elapsed_ms in timing.phases.items()]
+            response.headers['Server-Timing'] = ', '.join(metrics)
+
+        self.record(request.endpoint or '<unmatched>', current_schema() or 'public', total_ms, timing)
+        return response
+
+    def record(self, endpoint, tenant, total_ms, timing):
+        with self._lock:
+            series = self._series.get((endpoint, tenant))
+            if series is None:
+                if len(self._series) >= self.max_series:
+                    tenant = OTHER_TENANT
+                    series = self._series.get((endpoint, tenant))
+                if series is None:
+                    series = self._series[(endpoint, tenant)] = {
+                        'total_ms': Histogram(TIME_BUCKETS),
+                        'db_ms': Histogram(TIME_BUCKETS),
+                        'statements': Histogram(COUNT_BUCKETS),
+                        f'{TENANT_PHASE}_ms': Histogram(TIME_BUCKETS),
+                        f'{SERIALIZE_PHASE}_ms': Histogram(TIME_BUCKETS),
+                    }
+            series['total_ms'].observe(total_ms)
+            series['db_ms'].observe(timing.db_ms)
+            series['statements'].observe(timing.statements)
+            series[f'{TENANT_PHASE}_ms'].observe(timing.phases.get(TENANT_PHASE, 0.0))
+            series[f'{SERIALIZE_PHASE}_ms'].observe(timing.phases.get(SERIALIZE_PHASE, 0.0))
+
+    def snapshot(self, endpoint=None, tenant=None):
+        """
+        Returns the histograms recorded since startup (or the last reset),
+        slowest series (by accumulated latency) first.
+        """
+        with self._lock:
+            series = [
+                (histograms['total_ms'].sum,
+                 {'endpoint': key[0], 'tenant': key[1],
+                  **{metric: histogram.as_dict() for metric, histogram in histograms.items()}})
+                for key, histograms in self._series.items()
+                if (endpoint is None or key[0] == endpoint) and (tenant is None or key[1] == tenant)
+            ]
+        series = [item for _, item in sorted(series, key=lambda pair: -pair[0])]
+        return {'since': self.since.isoformat(), 'series': series}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self.since = datetime.now(timezone.utc)
@@ -0,0 +1,203 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.tenant_connection import SEARCH_PATH_KEY, current_schema
+
+logger = logging.getLogger(__name__)
+
+# Parameter values kept as they are; anything else (text, bytes, JSON) is redacted
+SAFE_PARAMETER_TYPES = (bool, int, float, Decimal, date, type(None))
+
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+
+def redact_parameters(parameters):
+    """
+    Replaces the parameter values that may hold personal data (strings,
+    bytes, documents) with their type. Numbers, dates and NULLs are kept
+    because they usually explain the plan (ids, limits, date ranges).
+    """
+    def redact(value):
+        if isinstance(value, SAFE_PARAMETER_TYPES):
+            return value
+        return f"<{type(value).__name__}>"
+
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) if isinstance(value, (dict, list, tuple)) else redact(value) for value in parameters]
+    return redact(parameters)
+
+
+def _json_default(value):
+    if isinstance(value, (date, Decimal)):
+        return str(value)
+    return repr(value)
+
+
+def _statement_schema(conn, context):
+    """The tenant schema a statement ran against, as far as the connection knows."""
+    schema_name = current_schema()
+    if schema_name:
+        return schema_name
+    translate_map = context.execution_options.get('schema_translate_map') if context is not None else None
+    if translate_map and translate_map.get(None):
+        return translate_map[None]
+    return conn.info.get(SEARCH_PATH_KEY, 'public')
+
+
+class SlowQueryLog:
+    """
+    Records the SQL statements slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Statements are timed by cursor events on the Engine class (every engine,
+    including those created lazily or by the CLI and worker). Each slow
+    statement is stored with its tenant schema, endpoint and redacted
+    parameters in a ring buffer of SLOW_QUERY_BUFFER_SIZE entries
+    (GET /api/v1/admin/slow_queries) and, when SLOW_QUERY_LOG_PATH is set,
+    appended as a JSON line to a rotating file.
+
+    A SLOW_QUERY_EXPLAIN_RATE fraction of slow SELECTs is re-run with
+    EXPLAIN (ANALYZE, BUFFERS) on the same connection, inside a savepoint
+    that is always rolled back and under SLOW_QUERY_EXPLAIN_TIMEOUT_MS.
+    This repeats the query, so keep the rate low.
+    """
+
+    def __init__(self, threshold_ms=500, buffer_size=200):
+        self.threshold_ms = threshold_ms
+        self.enabled = False
+        self.explain_rate = 0.0
+        self.explain_timeout_ms = 5000
+        self.max_statement_length = 4000
+        self.entries = deque(maxlen=buffer_size)
+        self.file_logger = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.extensions['slow_queries'] = self
+        self.enabled = app.config.get('SLOW_QUERY_ENABLED', True)
+        if not self.enabled:
+            return
+        self.threshold_ms = app.config.get('SLOW_QUERY_THRESHOLD_MS', self.threshold_ms)
+        self.explain_rate = app.config.get('SLOW_QUERY_EXPLAIN_RATE', self.explain_rate)
+        self.explain_timeout_ms = app.config.get('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', self.explain_timeout_ms)
+        self.max_statement_length = app.config.get('SLOW_QUERY_MAX_STATEMENT_LENGTH', self.max_statement_length)
+        self.entries = deque(self.entries, maxlen=app.config.get('SLOW_QUERY_BUFFER_SIZE', self.entries.maxlen))
+
+        log_path = app.config.get('SLOW_QUERY_LOG_PATH')
+        if log_path and self.file_logger is None:
+            handler = RotatingFileHandler(log_path, maxBytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024),
+                                          backupCount=app.config.get('SLOW_QUERY_LOG_BACKUPS', 5))
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.file_logger = logging.getLogger(f"{__name__}.file")
+            self.file_logger.addHandler(handler)
+            self.file_logger.setLevel(logging.INFO)
+            self.file_logger.propagate = False
+
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled and context is not None:
+            context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, '_slow_query_start', None)
+        if start is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        try:
+            self.record(conn, cursor, statement, parameters, context, executemany, duration_ms)
+        except Exception as e:
+            # Recording must never break the statement that was measured
+            logger.warning(f"Slow query not recorded: {e}")
+
+    def record(self, conn, cursor, statement, parameters, context, executemany, duration_ms):
+        entry = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(duration_ms, 1),
+            'schema': _statement_schema(conn, context),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'statement': statement[:self.max_statement_length],
+            'parameters': redact_parameters(parameters),
+            'executemany': executemany,
+            'rowcount': cursor.rowcount,
+            'plan': None,
+        }
+        if self._should_explain(conn, statement, context, executemany):
+            entry['plan'] = self.explain(conn, statement, parameters)
+
+        with self._lock:
+            self.entries.append(entry)
+        if self.file_logger is not None:
+            self.file_logger.info(json.dumps(entry, default=_json_default))
+
+    def _should_explain(self, conn, statement, context, executemany):
+        return (
+            self.explain_rate > 0
+            and not executemany
+            and conn.dialect.name == 'postgresql'
+            and statement.lstrip().upper().startswith('SELECT')
+            and not context.execution_options.get('stream_results')
+            and random.random() < self.explain_rate
+        )
+
+    def explain(self, conn, statement, parameters):
+        """
+        Returns the EXPLAIN (ANALYZE, BUFFERS) plan of ``statement``, or the
+        error that prevented it. Runs on the raw DBAPI connection so it is not
+        measured itself; the savepoint keeps the transaction usable.
+        """
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                return cursor.fetchone()[0]
+            except Exception as e:
+                return {'error': str(e).strip()}
+            finally:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+                cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        finally:
+            cursor.close()
+
+    def snapshot(self, schema_name=None, limit=None):
+        """
+        Returns the buffered slow queries, newest first, and the count and
+        total time per tenant schema (heaviest first).
+        """
+        with self._lock:
+            entries = list(self.entries)
+
+        tenants = {}
+        for entry in entries:
+            totals = tenants.setdefault(entry['schema'], {'schema': entry['schema'], 'count': 0, 'total_ms': 0.0})
+            totals['count'] += 1
+            totals['total_ms'] = round(totals['total_ms'] + entry['duration_ms'], 1)
+
+        if schema_name is not None:
+            entries = [entry for entry in entries if entry['schema'] == schema_name]
+        entries.reverse()
+        return {
+            'threshold_ms': self.threshold_ms,
+            'tenants': sorted(tenants.values(), key=lambda totals: -totals['total_ms']),
+            'queries': entries[:limit] if limit else entries,
+        }
+
+    def reset(self):
+        with self._lock:
+            self.entries.clear()
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Lightweight snapshot of a tenant row. ORM instances are bound to the
+# session of the request that loaded them, so they are not safe to share
+# across requests.
+CachedTenant = namedtuple('CachedTenant', ['tenant_id', 'tenant_name', 'schema_name'])
+
+
+class TenantCache:
+    """
+    In-process LRU cache of tenants keyed by the X-Tenant header value.
+
+    Entries expire after ``TENANT_CACHE_TTL`` seconds and the cache never
+    holds more than ``TENANT_CACHE_MAX_SIZE`` entries; the least recently
+    used entry is evicted first.
+    """
+
+    def __init__(self, ttl=300, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        """Reads TTL and size limits from the Flask configuration."""
+        self.ttl = app.config.get('TENANT_CACHE_TTL', self.ttl)
+        self.max_size = app.config.get('TENANT_CACHE_MAX_SIZE', self.max_size)
+        app.extensions['tenant_cache'] = self
+
+    def get(self, key):
+        """
+        Returns the cached tenant for ``key`` or None if missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, tenant = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return tenant
+
+    def set(self, key, tenant):
+        """
+        Stores a snapshot of ``tenant`` under ``key`` and returns the snapshot.
+        """
+        snapshot = CachedTenant(tenant.tenant_id, tenant.tenant_name, tenant.schema_name)
+        if self.max_size <= 0:
+            return snapshot
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return snapshot
+
+    def invalidate(self, key):
+        """Drops a single entry, if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drops every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Returns the hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl
+            }
@@ -0,0 +1,187 @@
+from flask import g, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.pool import QueuePool
+
+# Key under which each pooled DBAPI connection records its committed search_path.
+# The connection-level ``info`` dict is discarded when the connection is
+# invalidated, so a reconnect never inherits a stale value.
+SEARCH_PATH_KEY = 'tenant_search_path'
+
+
+def search_path_sql(schema_name, local=False):
+    """Builds the SET statement used for a tenant (or the public) schema."""
+    command = 'SET LOCAL' if local else 'SET'
+    if schema_name == 'public':
+        return f'{command} search_path TO public'
+    return f'{command} search_path TO {schema_name}, public'
+
+
+def current_schema():
+    """Returns the schema requested for the current app context, if any."""
+    if not has_app_context():
+        return None
+    return g.get('tenant_schema')
+
+
+def schema_translate_map(schema_name):
+    """Maps every unqualified table onto ``schema_name``."""
+    return {None: schema_name}
+
+
+class TenantAffinityPool(QueuePool):
+    """
+    QueuePool that prefers handing out an idle connection whose search_path
+    already points at the schema requested for the current request.
+
+    Falls back to the regular QueuePool behaviour (and overflow accounting)
+    when no idle connection matches.
+    """
+
+    def _do_get(self):
+        schema_name = current_schema() or 'public'
+        queue = self._pool
+        with queue.mutex:
+            for record in queue.queue:
+                if record.info.get(SEARCH_PATH_KEY) == schema_name:
+                    queue.queue.remove(record)
+                    queue.not_full.notify()
+                    return record
+        return super()._do_get()
+
+
+@event.listens_for(TenantAffinityPool, 'checkout')
+def _apply_search_path(dbapi_connection, connection_record, connection_proxy):
+    """
+    Points a freshly checked out connection at the requested schema, or back
+    at public when no schema is requested, so a connection never carries the
+    previous tenant into code that did not ask for one.
+
+    The SET is committed so it survives the rollback the pool performs on
+    checkin, which is what lets the next request for the same tenant skip it.
+    Nothing else is running on the connection at checkout, so the commit
+    cannot end a caller's transaction.
+    """
+    schema_name = current_schema() or 'public'
+    if connection_record.info.get(SEARCH_PATH_KEY) == schema_name:
+        return
+
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(search_path_sql(schema_name))
+        dbapi_connection.commit()
+        connection_record.info[SEARCH_PATH_KEY] = schema_name
+    except Exception:
+        connection_record.info.pop(SEARCH_PATH_KEY, None)
+        dbapi_connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+class TenantConnectionManager:
+    """
+    Tenant-aware connection layer on top of the ``db`` engine.
+
+    Supports two tenancy modes, selected with ``TENANCY_MODE``:
+
+    - ``search_path``: every pooled connection remembers the schema its
+      search_path is bound to, so switching to a tenant only costs a round
+      trip when the connection was last used by a different tenant. Without
+      the affinity pool, each transaction sets the search_path with SET LOCAL.
+    - ``schema_translate``: queries are rendered against ``"{schema}".table``
+      through SQLAlchemy's ``schema_translate_map``. Connections carry no
+      tenant state and can be shared freely across tenants.
+    """
+
+    SEARCH_PATH = 'search_path'
+    SCHEMA_TRANSLATE = 'schema_translate'
+
+    def __init__(self, db=None):
+        self.db = db
+        self.mode = self.SEARCH_PATH
+        self.enabled = False
+        self.local_search_path = False
+
+    def init_app(self, app, db=None):
+        """
+        Reads the tenancy mode and installs the affinity pool or the translate
+        map listener. Must run before ``db.init_app`` so the engine is built
+        with the affinity pool.
+        """
+        if db is not None:
+            self.db = db
+
+        self.mode = app.config.get('TENANCY_MODE', self.SEARCH_PATH)
+        if self.mode not in (self.SEARCH_PATH, self.SCHEMA_TRANSLATE):
+            raise ValueError(f"Unknown TENANCY_MODE: {self.mode}")
+
+        if self.mode == self.SCHEMA_TRANSLATE and not event.contains(self.db.session, 'after_begin', self._translate_on_begin):
+            event.listen(self.db.session, 'after_begin', self._translate_on_begin)
+
+        uri = app.config.get('SQLALCHEMY_DATABASE_URI') or ''
+        is_postgresql = uri.startswith('postgresql')
+        self.enabled = (
+            self.mode == self.SEARCH_PATH
+            and app.config.get('TENANT_CONNECTION_AFFINITY', True)
+            and is_postgresql
+        )
+
+        if self.enabled:
+            engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+            engine_options.setdefault('poolclass', TenantAffinityPool)
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+            self.enabled = engine_options['poolclass'] is TenantAffinityPool
+
+        self.local_search_path = self.mode == self.SEARCH_PATH and not self.enabled and is_postgresql
+        if self.local_search_path and not event.contains(self.db.session, 'after_begin', self._search_path_on_begin):
+            event.listen(self.db.session, 'after_begin', self._search_path_on_begin)
+
+        app.extensions['tenant_connections'] = self
+
+    def use_schema(self, schema_name):
+        """
+        Binds the current request to ``schema_name``.
+
+        In ``schema_translate`` mode this only updates the translate map of
+        the session connection. In ``search_path`` mode, transactions started
+        afterwards are switched by the pool listener (or the SET LOCAL issued
+        on begin without the affinity pool); if the session is already in a
+        transaction on a connection bound elsewhere, a SET LOCAL covers the
+        rest of it. The caller's transaction is never committed.
+        """
+        session = self.db.session()
+        g.tenant_schema = schema_name
+
+        if not session.in_transaction():
+            return
+
+        if self.mode == self.SCHEMA_TRANSLATE:
+            session.connection().execution_options(schema_translate_map=schema_translate_map(schema_name))
+            return
+
+        if not (self.enabled or self.local_search_path):
+            return
+        if self.enabled and session.connection().connection.info.get(SEARCH_PATH_KEY) == schema_name:
+            return
+
+        self.set_local_search_path(schema_name)
+
+    def set_local_search_path(self, schema_name):
+        """
+        Points the search_path at ``schema_name`` for the current transaction
+        only (SET LOCAL). Used for raw SQL such as DDL scripts, which
+        ``schema_translate_map`` does not rewrite. The connection reverts to
+        its previous search_path on commit or rollback, so its recorded
+        binding stays valid in every mode.
+        """
+        self.db.session.execute(text(search_path_sql(schema_name, local=True)))
+
+    def _search_path_on_begin(self, session, transaction, connection):
+        schema_name = current_schema()
+        if schema_name is not None:
+            connection.exec_driver_sql(search_path_sql(schema_name, local=True))
+
+    def _translate_on_begin(self, session, transaction, connection):
+        schema_name = current_schema()
+        if schema_name is not None:
+            connection.execution_options(schema_translate_map=schema_translate_map(schema_name))
@@ -0,0 +1,71 @@
+import hashlib
+import logging
+from app.utils.migrations import load_migrations, stamp_sql
+
+logger = logging.getLogger(__name__)
+
+
+class TenantDDL:
+    """
+    The SQL that builds a tenant schema, read from disk once at startup.
+
+    The tenant tables (TENANT_DDL_PATH) are followed by the idempotent assets
+    that every tenant also needs (rollups, sales report adjustments) and by
+    the tenant migrations, which are recorded as applied in the same script,
+    so a schema is provisioned with a single round trip and starts at the
+    latest migration. Migrations that require an extension are left out of
+    the script; provisioning applies them only when the extension is
+    installed. ``version`` identifies the script and is used to tell whether
+    the template schema is current.
+    """
+
+    def __init__(self, paths=None, migrations_path=None):
+        self.paths = paths or []
+        self.migrations_path = migrations_path
+        self.migrations = []
+        self.script = None
+        self.version = None
+
+    def init_app(self, app, paths=None):
+        if paths is not None:
+            self.paths = paths
+        else:
+            self.paths = [app.config.get('TENANT_DDL_PATH', 'db/assets/ddl.sql'), *app.config.get('TENANT_DDL_EXTRA_PATHS', [])]
+        self.migrations_path = app.config.get('TENANT_MIGRATIONS_PATH', self.migrations_path)
+        app.extensions['tenant_ddl'] = self
+        if app.config.get('LAZY_APP', False):
+            # Read by the first provisioning instead of on every cold start
+            return
+        try:
+            self.load()
+        except (OSError, ValueError) as e:
+            # Provisioning will retry the load and report the error; the API can still serve requests
+            logger.warning(f"Tenant DDL not loaded: {e}")
+
+    def load(self):
+        scripts = []
+        for path in self.paths:
+            with open(path, 'r') as ddl_file:
+                scripts.append(f"-- {path}\n{ddl_file.read()}")
+        if self.migrations_path:
+            self.migrations = load_migrations(self.migrations_path)
+            scripted = [migration for migration in self.migrations if not migration.requires]
+            for migration in scripted:
+                scripts.append(f"-- {migration.path}\n{migration.sql}")
+            scripts.append(f"-- schema_migrations\n{stamp_sql(scripted)}")
+        self.script = '\n\n'.join(scripts)
+        self.version = hashlib.sha256(self.script.encode()).hexdigest()[:16]
+        logger.info(f"Tenant DDL {self.version} loaded from {', '.join(self.paths)} with {len(self.migrations)} migrations")
+        return self.script
+
+    def get_script(self):
+        return self.script if self.script is not None else self.load()
+
+    def get_migrations(self):
+        if self.script is None:
+            self.load()
+        return self.migrations
+
+    def get_extension_migrations(self):
+        """The migrations left out of the script because they require extensions."""
+        return [migration for migration in self.get_migrations() if migration.requires]
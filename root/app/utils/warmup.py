@@ -0,0 +1,145 @@
+import logging
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+from app.extensions import db, tenant_connections
+from app.utils.lazy_views import import_models
+
+logger = logging.getLogger(__name__)
+
+# Page size used to compile the list statements; LIMIT/OFFSET are bound parameters,
+# so every page size shares the same compiled statement
+WARMUP_PAGE_SIZE = 10
+
+# Controllers imported during warmup when LAZY_APP is on
+WARMUP_CONTROLLERS = [
+    'app.controllers.customer_controller',
+    'app.controllers.order_controller',
+    'app.controllers.product_controller',
+]
+
+
+def _hot_statements(app):
+    """
+    (name, callable) pairs that run the statements the busiest endpoints
+    execute, built by the same repository code so their cache keys match.
+    """
+    from app.middlewares.tenant_middleware import find_tenant
+    from app.repositories.credit_account_repository import CreditAccountRepository
+    from app.repositories.customer_repository import CustomerRepository
+    from app.repositories.inventory_repository import InventoryRepository
+    from app.repositories.order_item_repository import OrderItemRepository
+    from app.repositories.order_repository import OrderRepository
+    from app.repositories.product_repository import ProductRepository
+    from app.repositories.rollup_repository import RollupRepository, COMPLETED_STATUS
+    from app.repositories.sales_repository import SaleRepository
+    from app.repositories.sales_report_repository import SalesReportRepository
+
+    statements = [
+        ('tenant_lookup', lambda: find_tenant('')),
+        ('customers', lambda: CustomerRepository.get_customers_paginated(1, WARMUP_PAGE_SIZE)),
+        ('customers_keyset', lambda: CustomerRepository.get_customers_keyset(WARMUP_PAGE_SIZE)),
+        ('orders', lambda: OrderRepository.get_orders_paginated(1, WARMUP_PAGE_SIZE)),
+        ('orders_keyset', lambda: OrderRepository.get_orders_keyset(WARMUP_PAGE_SIZE)),
+        ('products', lambda: ProductRepository.get_products_paginated(1, WARMUP_PAGE_SIZE)),
+        ('products_keyset', lambda: ProductRepository.get_products_keyset(WARMUP_PAGE_SIZE)),
+        ('order_items', lambda: OrderItemRepository.get_order_items_paginated(1, WARMUP_PAGE_SIZE)),
+        ('sales', lambda: SaleRepository.get_sales_paginated(1, WARMUP_PAGE_SIZE)),
+        ('inventory', lambda: InventoryRepository.get_inventory_items_paginated(1, WARMUP_PAGE_SIZE)),
+        ('credit_accounts', lambda: CreditAccountRepository.get_credit_accounts_paginated(1, WARMUP_PAGE_SIZE)),
+        ('sales_reports', lambda: SalesReportRepository.get_sales_reports_paginated(1, WARMUP_PAGE_SIZE)),
+    ]
+    if app.config.get('ORDER_ROLLUPS_ENABLED', False):
+        statements += [
+            ('order_stats', RollupRepository.get_order_counts_by_status),
+            ('top_customers', RollupRepository.get_top_customers),
+            ('top_products', RollupRepository.get_top_selling_products),
+        ]
+    else:
+        statements += [
+            ('order_stats', OrderRepository.get_order_counts_by_status),
+            ('top_customers', lambda: OrderRepository.get_top_customers(status=COMPLETED_STATUS)),
+            ('top_products', lambda: OrderRepository.get_top_selling_products(status=COMPLETED_STATUS)),
+        ]
+    return statements
+
+
+def is_keep_warm_event(app, event):
+    """
+    True for scheduled keep-warm invocations: EventBridge schedules and the
+    other sources listed in WARMUP_EVENT_SOURCES, or any event carrying
+    ``"warmup": true``. API Gateway events never match.
+    """
+    if not isinstance(event, dict):
+        return False
+    return event.get('warmup') is True or event.get('source') in app.config.get('WARMUP_EVENT_SOURCES', [])
+
+
+def ping(app):
+    """Checks out the pooled connection and validates it with SELECT 1."""
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        finally:
+            db.session.remove()
+
+
+def warm_up(app):
+    """
+    Moves the one-off costs of the first request into the Lambda init phase:
+
+    1. Imports every model and configures the mappers.
+    2. Opens the pooled connection (connect, TLS, authentication) and
+       validates it.
+    3. Runs the hot statements against WARMUP_SCHEMA (the empty template
+       schema by default) so they are compiled and cached by the engine.
+       Each one runs in a savepoint and everything is rolled back; a
+       statement that fails on the server is still compiled, so failures
+       are only logged.
+    4. With LAZY_APP, imports the controllers of the busiest endpoints.
+
+    Never raises: a failed warmup leaves the work to the first request.
+
+    Returns:
+        dict: Milliseconds spent in each phase.
+    """
+    timings = {}
+
+    def phase(name, run):
+        start = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            logger.warning(f"Warmup {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def run_statements():
+        schema_name = app.config.get('WARMUP_SCHEMA') or app.config.get('TENANT_TEMPLATE_SCHEMA', 'tenant_template')
+        with app.app_context():
+            try:
+                # SET LOCAL ends with the rollback below, so the pooled connection
+                # is not left pointing at the warmup schema
+                tenant_connections.set_local_search_path(schema_name)
+                for name, run in _hot_statements(app):
+                    try:
+                        with db.session.begin_nested():
+                            run()
+                    except SQLAlchemyError as e:
+                        logger.debug(f"Warmup statement {name} failed: {e}")
+            finally:
+                db.session.rollback()
+                db.session.remove()
+
+    def load_controllers():
+        lazy_blueprints = app.extensions.get('lazy_blueprints')
+        if lazy_blueprints is not None:
+            for module_name in WARMUP_CONTROLLERS:
+                lazy_blueprints.load_module(module_name)
+
+    phase('mappers', lambda: (import_models(), configure_mappers()))
+    phase('connection', lambda: ping(app))
+    phase('statements', run_statements)
+    phase('controllers', load_controllers)
+    logger.info(f"Warmup done: {timings}")
+    return timings
@@ -0,0 +1,108 @@
+import logging
+import os
+import socket
+import threading
+import time
+from app.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for jobs whose worker stopped sending heartbeats
+STALE_CHECK_INTERVAL = 60
+
+def pool_bounded_threads(app, threads):
+    """
+    Caps ``threads`` to the connections the engine pool can hand out, so
+    worker threads never wait on each other for a connection (and hit the
+    pool timeout) instead of running jobs.
+    """
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    if 'pool_size' not in options:
+        return threads
+    capacity = options['pool_size'] + max(options.get('max_overflow', 0), 0)
+    if threads > capacity:
+        logger.warning(f"JOB_WORKER_THREADS={threads} exceeds the connection pool ({capacity}); running {capacity} threads")
+        return max(capacity, 1)
+    return threads
+
+class JobWorker:
+    """
+    Runs queued jobs from the public ``jobs`` table.
+
+    Every thread claims one job at a time inside its own app context, so the
+    number of jobs running in this process is bounded by ``threads`` and the
+    number running per tenant (across every worker) by JOB_MAX_PER_TENANT.
+    """
+
+    def __init__(self, app, threads=None, poll_interval=None, worker_id=None):
+        self.app = app
+        self.threads = pool_bounded_threads(app, threads or app.config.get('JOB_WORKER_THREADS', 4))
+        self.poll_interval = poll_interval or app.config.get('JOB_POLL_INTERVAL', 2)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, stop_when_idle=False, deadline=None):
+        """
+        Processes jobs until ``stop`` is called.
+
+        Args:
+            stop_when_idle (bool): Return once no job can be claimed.
+            deadline (float): ``time.monotonic()`` value after which no new job is claimed.
+
+        Returns:
+            int: Number of jobs run.
+        """
+        self._requeue_stale_jobs()
+        last_check = time.monotonic()
+
+        counts = []
+        threads = [
+            threading.Thread(target=self._work, args=(f"{self.worker_id}:{index}", stop_when_idle, deadline, counts),
+                             name=f"job-worker-{index}", daemon=True)
+            for index in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                threads[0].join(timeout=self.poll_interval)
+                # Jobs left running by a worker that died go back to the queue
+                if time.monotonic() - last_check >= STALE_CHECK_INTERVAL:
+                    self._requeue_stale_jobs()
+                    last_check = time.monotonic()
+        except KeyboardInterrupt:
+            logger.info("Stopping job worker, waiting for running jobs")
+            self.stop()
+            for thread in threads:
+                thread.join()
+        return sum(counts)
+
+    def _requeue_stale_jobs(self):
+        try:
+            with self.app.app_context():
+                self.app.injector.get(JobService).requeue_stale_jobs()
+        except Exception as e:
+            logger.error(f"Could not recover stale jobs: {e}")
+
+    def _work(self, worker_id, stop_when_idle, deadline, counts):
+        processed = 0
+        while not self._stop.is_set():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            try:
+                with self.app.app_context():
+                    job = self.app.injector.get(JobService).run_next_job(worker_id)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} could not claim a job: {e}")
+                job = None
+
+            if job is not None:
+                processed += 1
+                continue
+            if stop_when_idle:
+                break
+            self._stop.wait(self.poll_interval)
+        counts.append(processed)
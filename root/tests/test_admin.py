@@ -0,0 +1,47 @@
+import pytest
+from app.utils.request_metrics import Histogram, TIME_BUCKETS
+
+ADMIN_URLS = ['/api/v1/admin/metrics', '/api/v1/admin/slow_queries']
+
+
+@pytest.fixture
+def admin_token(app):
+    app.config['ADMIN_TOKEN'] = 'secret'
+    yield 'secret'
+    app.config['ADMIN_TOKEN'] = None
+
+
+@pytest.mark.parametrize('url', ADMIN_URLS)
+def test_admin_endpoints_are_closed_without_a_configured_token(client, url):
+    assert client.get(url).status_code == 403
+    assert client.delete(url).status_code == 403
+    assert client.get(url, headers={'X-Admin-Token': ''}).status_code == 403
+
+
+@pytest.mark.parametrize('url', ADMIN_URLS)
+def test_admin_endpoints_require_the_configured_token(client, admin_token, url):
+    assert client.get(url).status_code == 403
+    assert client.get(url, headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert client.get(url, headers={'X-Admin-Token': admin_token}).status_code == 200
+
+
+def test_histogram_quantiles_never_exceed_the_maximum():
+    histogram = Histogram(TIME_BUCKETS)
+    for value in (0.2, 0.3, 3.1):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 0.5
+    assert histogram.quantile(0.99) == 3.1
+    assert histogram.quantile(0.99) <= histogram.max
+
+
+def test_explain_keeps_escaped_percent_signs_with_empty_parameters(app):
+    from app.extensions import db
+    from app.utils.slow_queries import SlowQueryLog
+
+    with app.app_context():
+        with db.engine.connect() as conn:
+            # psycopg2 only unescapes %% when the parameters are not None
+            plan = SlowQueryLog().explain(conn, 'SELECT 5 %% 3', {})
+        assert 'error' not in plan
+        assert plan[0]['Plan']['Node Type'] == 'Result'
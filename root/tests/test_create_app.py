@@ -0,0 +1,14 @@
+import pytest
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from conftest import make_config
+
+
+@pytest.mark.parametrize('lazy', [False, True], ids=['eager', 'lazy'])
+@pytest.mark.parametrize('uri', ['sqlite://', 'sqlite:///:memory:'])
+def test_create_app_with_in_memory_sqlite(uri, lazy):
+    app = create_app(make_config(SQLALCHEMY_DATABASE_URI=uri, LAZY_APP=lazy))
+    with app.app_context():
+        assert db.session.execute(text('SELECT 1')).scalar() == 1
+        db.session.remove()
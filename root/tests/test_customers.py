@@ -0,0 +1,49 @@
+import uuid
+import pytest
+from app.extensions import db
+from app.repositories.customer_repository import CustomerRepository
+from app.services.migration_service import MigrationService
+
+TENANT = {'X-Tenant': 't2'}
+
+
+@pytest.fixture(scope='module')
+def customers(app):
+    client = app.test_client()
+    suffix = uuid.uuid4().hex[:6]
+    names = [f"Zulema Rojas {suffix}", f"Ana Zulema {suffix}", f"Pedro Diaz {suffix}"]
+    for full_name, email in zip(names, [f"pedro{suffix}@example.com", f"ana{suffix}@example.com", f"zulema{suffix}@example.com"]):
+        response = client.post('/api/v1/customers', headers=TENANT,
+                               json={'full_name': full_name, 'email': email, 'phone': '555-0100'})
+        assert response.status_code == 201, response.get_data(as_text=True)
+    return suffix
+
+
+def search(client, query, mode='trigram'):
+    response = client.get(f"/api/v1/customers/search?q={query}&mode={mode}", headers=TENANT)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return [customer['full_name'] for customer in response.get_json()['result']['data']]
+
+
+def test_trigram_search_works_with_or_without_pg_trgm(client, customers):
+    names = search(client, 'zulema')
+    assert len([name for name in names if name.endswith(customers)]) == 3
+    # A name that starts with the term ranks first, with or without word_similarity
+    assert names[0] == f"Zulema Rojas {customers}"
+
+
+def test_fulltext_search(client, customers):
+    assert search(client, f"diaz {customers}", mode='fulltext') == [f"Pedro Diaz {customers}"]
+
+
+def test_trigram_index_migration_waits_for_pg_trgm(app):
+    with app.app_context():
+        available = CustomerRepository.trigram_available()
+        [result] = app.injector.get(MigrationService).migrate(schema_name='t1')
+        db.session.remove()
+
+    assert result['success'], result
+    if available:
+        assert 3 not in result['pending']
+    else:
+        assert result['pending'] == [3] and 'pg_trgm' in result['message']
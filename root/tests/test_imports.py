@@ -0,0 +1,37 @@
+import uuid
+from app.extensions import db, tenant_connections
+from app.models.customers import Customer
+
+TENANT = {'X-Tenant': 't1'}
+
+
+def customer_count(app, schema_name, email):
+    with app.test_request_context():
+        tenant_connections.use_schema(schema_name)
+        count = Customer.query.filter_by(email=email).count()
+        db.session.remove()
+    return count
+
+
+def test_csv_import_copies_valid_rows_and_reports_the_rest(app, client):
+    email = f"{uuid.uuid4().hex}@example.com"
+    body = (
+        "full_name,email,phone,credit_limit\n"
+        f"Imported,{email},555-0101,100\n"
+        "Bad email,not-an-email,555-0102,\n"
+        f"Duplicate,{email},555-0103,\n"
+    )
+    response = client.post('/api/v1/import/customers?format=csv', headers=TENANT, data=body, content_type='text/csv')
+    assert response.status_code == 200, response.get_data(as_text=True)
+    summary = response.get_json()['result']
+    assert (summary['received'], summary['imported'], summary['rejected']) == (3, 1, 2)
+    assert [error['row'] for error in summary['errors']] == [2, 3]
+
+    # Only the tenant in the header received the row
+    assert customer_count(app, 't1', email) == 1
+    assert customer_count(app, 't2', email) == 0
+
+
+def test_import_rejects_unknown_resources(client):
+    response = client.post('/api/v1/import/orders', headers=TENANT, data='{}', content_type='application/x-ndjson')
+    assert response.status_code == 400
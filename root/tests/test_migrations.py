@@ -0,0 +1,37 @@
+import pytest
+from werkzeug.exceptions import NotFound
+from app.extensions import db
+from app.services.migration_service import MigrationService
+from conftest import TENANTS
+
+
+def test_migrate_fans_out_over_every_tenant(app):
+    with app.app_context():
+        migration_service = app.injector.get(MigrationService)
+        results = migration_service.migrate(dry_run=True, workers=100)
+        db.session.remove()
+
+    by_schema = {result['schema_name']: result for result in results}
+    assert set(TENANTS.values()) <= set(by_schema)
+    for schema_name in TENANTS.values():
+        result = by_schema[schema_name]
+        assert result['success'], result
+        # Provisioning recorded every migration except those waiting for an extension
+        assert result['applied'] == [] and set(result['pending']) <= {3}, result
+
+
+def test_migrate_rejects_unknown_tenants(app):
+    with app.app_context():
+        with pytest.raises(NotFound):
+            app.injector.get(MigrationService).migrate(schema_name='missing_tenant')
+        db.session.remove()
+
+
+def test_migrations_status_command_reports_every_schema(app):
+    if app.config['LAZY_APP']:
+        pytest.skip("CLI commands are only registered when LAZY_APP is off")
+    result = app.test_cli_runner().invoke(args=['migrations', 'status'])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0].startswith('public: OK')
+    assert all(any(line.startswith(f"{schema_name}: OK") for line in lines) for schema_name in TENANTS.values())
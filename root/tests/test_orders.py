@@ -0,0 +1,145 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db, tenant_connections
+from app.models.customers import Customer
+from app.models.products import Product
+from app.repositories.rollup_repository import COMPLETED_STATUS
+from conftest import count_statements
+
+TENANT = {'X-Tenant': 't1'}
+
+
+@pytest.fixture(scope='module')
+def catalog(app):
+    """A customer and two products in tenant t1."""
+    with app.test_request_context():
+        tenant_connections.use_schema('t1')
+        customer = Customer(full_name='Orders', email=f"{uuid.uuid4().hex}@example.com", phone='555-0100')
+        products = [Product(name=f"Product {index}", price=10.0 * index, stock=100) for index in (1, 2)]
+        db.session.add_all([customer, *products])
+        db.session.commit()
+        catalog = {'customer': customer.id, 'products': [product.id for product in products]}
+        db.session.remove()
+    return catalog
+
+
+def order_payload(catalog):
+    return {
+        'payment_method': 'cash',
+        'id_customer': catalog['customer'],
+        'order_items': [{'quantity': 1, 'price': 10.0, 'id_product': product} for product in catalog['products']],
+    }
+
+
+def test_bulk_orders_response_does_not_reload_each_order(client, catalog):
+    def create(count):
+        with count_statements() as statements:
+            response = client.post('/api/v1/orders/bulk', headers=TENANT,
+                                   json={'orders': [order_payload(catalog) for _ in range(count)]})
+        assert response.status_code == 201, response.get_data(as_text=True)
+        orders = response.get_json()['result']
+        assert len(orders) == count and all(len(order['order_items']) == 2 for order in orders)
+        return len(statements)
+
+    # Warm the tenant cache so both requests run the same lookups
+    create(1)
+    assert create(2) == create(10)
+
+
+@pytest.fixture(scope='module')
+def orders(app, catalog):
+    response = app.test_client().post('/api/v1/orders/bulk', headers=TENANT, json={'orders': [order_payload(catalog) for _ in range(12)]})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return [order['id'] for order in response.get_json()['result']]
+
+
+def statements_for(client, url):
+    client.get(url, headers=TENANT)  # resolve the tenant into the cache first
+    with count_statements() as statements:
+        response = client.get(url, headers=TENANT)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()['result'], statements
+
+
+@pytest.mark.parametrize('per_page', [1, 10])
+def test_order_list_runs_a_fixed_number_of_statements(client, orders, per_page):
+    # The page, its total and one query for the items of every order on it
+    result, statements = statements_for(client, f"/api/v1/orders?per_page={per_page}")
+    assert len(result['data']) == per_page
+    assert all(order['order_items'] for order in result['data'])
+    assert len(statements) == 3, statements
+
+
+@pytest.mark.parametrize('per_page', [1, 10])
+def test_order_keyset_page_runs_a_fixed_number_of_statements(client, orders, per_page):
+    # The page and one query for the items of every order on it
+    result, statements = statements_for(client, f"/api/v1/orders?per_page={per_page}&cursor=")
+    assert len(result['data']) == per_page
+    assert all(order['order_items'] for order in result['data'])
+    assert len(statements) == 2, statements
+
+
+def test_order_detail_runs_a_fixed_number_of_statements(client, orders):
+    # The order and one query for its items
+    result, statements = statements_for(client, f"/api/v1/orders/{orders[0]}")
+    assert result['id'] == orders[0] and len(result['order_items']) == 2
+    assert len(statements) == 2, statements
+
+
+def test_date_only_until_covers_the_whole_day(client, orders):
+    today = datetime.utcnow().date()
+
+    def total_orders(until):
+        response = client.get(f"/api/v1/orders/statistics?until={until.isoformat()}", headers=TENANT)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.get_json()['result']['total_orders']
+
+    assert total_orders(today) >= len(orders)
+    assert total_orders(today - timedelta(days=1)) == 0
+
+
+def test_top_customers_keeps_the_completed_order_count_key(client, orders):
+    response = client.get('/api/v1/orders/top-customers?status=pending', headers=TENANT)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    top_customers = response.get_json()['result']
+    assert top_customers
+    assert all(customer['completed_order_count'] == customer['order_count'] for customer in top_customers)
+
+
+@pytest.fixture
+def rollups_enabled(app):
+    app.config['ORDER_ROLLUPS_ENABLED'] = True
+    yield
+    app.config['ORDER_ROLLUPS_ENABLED'] = False
+
+
+def test_rollups_match_the_live_queries_after_order_changes(client, catalog, orders, rollups_enabled):
+    def ok(response, status=200):
+        assert response.status_code == status, response.get_data(as_text=True)
+        return response.get_json()['result']
+
+    created = ok(client.post('/api/v1/orders/bulk', headers=TENANT,
+                             json={'orders': [order_payload(catalog) for _ in range(4)]}), 201)
+    completed = [order['id'] for order in created]
+    for order_id in completed:
+        ok(client.put(f"/api/v1/orders/{order_id}", headers=TENANT, json={'status': COMPLETED_STATUS}))
+
+    # Edit the items of completed orders: add one, drop one
+    ok(client.post('/api/v1/order_items', headers=TENANT, json={
+        'quantity': 5, 'price': 10.0, 'id_order': completed[0], 'id_product': catalog['products'][1]}), 201)
+    ok(client.delete(f"/api/v1/order_items/{created[1]['order_items'][0]['id']}", headers=TENANT))
+
+    # Reopen one completed order and delete another one and a pending one
+    ok(client.put(f"/api/v1/orders/{completed[2]}", headers=TENANT, json={'status': 'Pendiente'}))
+    ok(client.delete(f"/api/v1/orders/{completed[3]}", headers=TENANT))
+    ok(client.delete(f"/api/v1/orders/{orders[-1]}", headers=TENANT))
+
+    # A date range always runs the live queries over orders
+    live_range = f"since=2000-01-01&until={(datetime.utcnow() + timedelta(days=1)).date().isoformat()}"
+    for path in ('/api/v1/orders/statistics', '/api/v1/orders/top-customers?limit=100',
+                 '/api/v1/orders/top-products?limit=100'):
+        separator = '&' if '?' in path else '?'
+        rollup = ok(client.get(path, headers=TENANT))
+        live = ok(client.get(f"{path}{separator}{live_range}", headers=TENANT))
+        assert live and rollup == live, path
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import text
+from app import create_app
+from app.config import engine_options
+from app.extensions import db
+from app.services import provisioning_service
+from app.services.provisioning_service import ProvisioningService
+from conftest import make_config
+
+BATCH = [{"tenant_name": f"batch{index}", "schema_name": f"batch_{index}"} for index in range(3)]
+
+
+@pytest.fixture(scope='module')
+def small_pool_app(database):
+    """An app with the single-connection pool used on Lambda."""
+    application = create_app(make_config(SQLALCHEMY_ENGINE_OPTIONS=engine_options(
+        pool_size=1, max_overflow=0, pool_timeout=10, pool_recycle=300)))
+    yield application
+    with application.app_context():
+        for entry in BATCH:
+            db.session.execute(text(f'DROP SCHEMA IF EXISTS "{entry["schema_name"]}" CASCADE'))
+            db.session.execute(text("DELETE FROM public.tenants WHERE schema_name = :schema_name"),
+                               {"schema_name": entry["schema_name"]})
+        db.session.execute(text('DROP SCHEMA IF EXISTS tenant_template CASCADE'))
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+
+
+def schema_exists(schema_name):
+    return db.session.execute(text("SELECT 1 FROM pg_namespace WHERE nspname = :schema_name"),
+                              {"schema_name": schema_name}).scalar() is not None
+
+
+def test_provision_tenants_caps_workers_to_the_pool(small_pool_app, monkeypatch):
+    recorded = []
+    executor_class = provisioning_service.ThreadPoolExecutor
+
+    def recording_executor(max_workers=None, **kwargs):
+        recorded.append(max_workers)
+        return executor_class(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(provisioning_service, 'ThreadPoolExecutor', recording_executor)
+
+    with small_pool_app.app_context():
+        results = small_pool_app.injector.get(ProvisioningService).provision_tenants(BATCH, workers=8)
+        assert [result['success'] for result in results] == [True, True, True]
+        assert recorded == [1]
+        assert all(schema_exists(entry['schema_name']) for entry in BATCH)
+        # Provisioning does not build the warmup template
+        assert not schema_exists('tenant_template')
+        db.session.remove()
+
+
+def test_tenants_template_command_builds_the_template(small_pool_app):
+    result = small_pool_app.test_cli_runner().invoke(args=['tenants', 'template'])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith('tenant_template: OK')
+
+    with small_pool_app.app_context():
+        assert schema_exists('tenant_template')
+        assert db.session.execute(text("SELECT to_regclass('tenant_template.customers')")).scalar() is not None
+        db.session.remove()
@@ -0,0 +1,39 @@
+import time
+from app.utils.query_cache import QueryCache
+
+
+def test_set_evicts_the_least_recently_used_entry():
+    cache = QueryCache(max_size=2)
+    cache.set('a', 1, ['orders'], tenant='t1')
+    cache.set('b', 2, ['orders'], tenant='t1')
+    assert cache.get('a', tenant='t1') == 1
+
+    cache.set('c', 3, ['customers'], tenant='t2')
+
+    assert cache.get('b', tenant='t1') is None
+    assert cache.get('a', tenant='t1') == 1 and cache.get('c', tenant='t2') == 3
+    assert cache.stats()['size'] == 2 and cache.stats()['evictions'] == 1
+
+
+def test_set_drops_expired_entries_before_recent_ones():
+    cache = QueryCache(max_size=2)
+    cache.set('stale', 1, ['orders'], ttl=0, tenant='t1')
+    cache.set('fresh', 2, ['orders'], tenant='t1')
+    time.sleep(0.001)
+
+    cache.set('new', 3, ['orders'], tenant='t1')
+
+    assert cache.get('fresh', tenant='t1') == 2 and cache.get('new', tenant='t1') == 3
+    assert cache.stats()['evictions'] == 0
+
+
+def test_dropped_entries_leave_no_table_references():
+    cache = QueryCache(max_size=1)
+    for index in range(100):
+        cache.set(('count', index), index, ['orders', 'order_items'], tenant='t1')
+
+    assert cache.stats()['size'] == 1
+    assert all(len(keys) == 1 for keys in cache._keys_by_table.values())
+
+    cache.invalidate('orders', tenant='t1')
+    assert cache.stats()['size'] == 0 and not cache._keys_by_table
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db, tenant_connections
+from app.models.customers import Customer
+from app.models.jobs import Job
+from app.models.sales import Sale
+from app.services.job_service import JobService
+
+TENANT = {'X-Tenant': 't2'}
+SALE_DATE = (datetime.utcnow() - timedelta(days=3)).replace(hour=12, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture(scope='module')
+def sales(app):
+    """Two sales of one customer in tenant t2, three days ago."""
+    with app.test_request_context():
+        tenant_connections.use_schema('t2')
+        customer = Customer(full_name='Reports', email=f"{uuid.uuid4().hex}@example.com", phone='555-0200')
+        db.session.add(customer)
+        db.session.flush()
+        for amount in (10.0, 15.0):
+            sale = Sale(total_amount=amount, id_customer=customer.id)
+            sale.sale_date = SALE_DATE
+            db.session.add(sale)
+        db.session.commit()
+        customer_id = customer.id
+        db.session.remove()
+    return customer_id
+
+
+def daily_reports(client, scope):
+    response = client.get(f"/api/v1/sales_reports?report_type=daily&scope={scope}"
+                          f"&since={SALE_DATE.date().isoformat()}&until={SALE_DATE.date().isoformat()}", headers=TENANT)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()['result']['data']
+
+
+def test_generate_builds_tenant_and_customer_reports(client, sales):
+    response = client.post(f"/api/v1/sales_reports/generate?since={SALE_DATE.date().isoformat()}",
+                           headers=TENANT, json={'report_types': ['daily']})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json()['result'][0]['reports'] >= 2
+
+    customer_reports = daily_reports(client, 'customer')
+    assert [report['total_sales'] for report in customer_reports if report['id_customer'] == sales] == [25.0]
+    # The tenant-wide report adds up every customer of the day
+    assert [report['total_sales'] for report in daily_reports(client, 'tenant')] == \
+        [sum(report['total_sales'] for report in customer_reports)]
+
+
+def test_report_job_runs_in_the_worker_and_reports_progress(app, client, sales):
+    response = client.post('/api/v1/sales_reports/jobs', headers=TENANT, json={'report_types': ['daily', 'weekly']})
+    assert response.status_code == 202, response.get_data(as_text=True)
+    job = response.get_json()['result']
+    assert job['status'] == Job.QUEUED
+
+    with app.app_context():
+        assert app.injector.get(JobService).run_next_job('test-worker').id == job['id']
+        db.session.remove()
+
+    response = client.get(f"/api/v1/sales_reports/jobs/{job['id']}", headers=TENANT)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    job = response.get_json()['result']
+    assert (job['status'], job['progress']) == (Job.SUCCEEDED, 1.0)
+    assert [result['report_type'] for result in job['result']] == ['daily', 'weekly']
+
+    # Jobs are only visible to the tenant that queued them
+    assert client.get(f"/api/v1/sales_reports/jobs/{job['id']}", headers={'X-Tenant': 't1'}).status_code == 404
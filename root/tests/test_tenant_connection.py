@@ -0,0 +1,27 @@
+from sqlalchemy import text
+from app.extensions import db, tenant_connections
+from app.models.customers import Customer
+
+
+def test_connection_without_tenant_is_not_left_on_the_last_tenant(app, client):
+    assert client.get('/api/v1/customers', headers={'X-Tenant': 't1'}).status_code == 200
+
+    with app.app_context():
+        search_path = db.session.execute(text('SHOW search_path')).scalar()
+        assert 't1' not in search_path and search_path.endswith('public')
+        db.session.remove()
+
+
+def test_use_schema_never_commits_the_callers_transaction(app):
+    email = 'rollback@example.com'
+    with app.test_request_context():
+        tenant_connections.use_schema('t1')
+        db.session.add(Customer(full_name='Rollback', email=email, phone='555-0100'))
+        db.session.flush()
+
+        tenant_connections.use_schema('t2')
+        db.session.rollback()
+
+        tenant_connections.use_schema('t1')
+        assert Customer.query.filter_by(email=email).count() == 0
+        db.session.remove()
@@ -0,0 +1,47 @@
+import uuid
+
+
+def create_customer(client, tenant, full_name):
+    response = client.post('/api/v1/customers', headers={'X-Tenant': tenant}, json={
+        'full_name': full_name,
+        'email': f"{uuid.uuid4().hex}@example.com",
+        'phone': '555-0100',
+    })
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()['result']
+
+
+def customer_names(client, tenant):
+    response = client.get('/api/v1/customers?per_page=100', headers={'X-Tenant': tenant})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return {customer['full_name'] for customer in response.get_json()['result']['data']}
+
+
+def test_tenants_see_only_their_own_data(client):
+    suffix = uuid.uuid4().hex[:8]
+    create_customer(client, 't1', f"Ana {suffix}")
+    create_customer(client, 't2', f"Luis {suffix}")
+
+    # Interleave the tenants so pooled connections are reused across them
+    for _ in range(3):
+        t1_names = customer_names(client, 't1')
+        t2_names = customer_names(client, 't2')
+        assert f"Ana {suffix}" in t1_names and f"Luis {suffix}" not in t1_names
+        assert f"Luis {suffix}" in t2_names and f"Ana {suffix}" not in t2_names
+
+
+def test_customer_lookup_is_scoped_to_the_tenant(client):
+    customer = create_customer(client, 't1', f"Eva {uuid.uuid4().hex[:8]}")
+
+    response = client.get(f"/api/v1/customers/{customer['id']}", headers={'X-Tenant': 't1'})
+    assert response.status_code == 200
+    assert response.get_json()['result']['full_name'] == customer['full_name']
+
+    # The same id in t2 is either another customer or no customer at all
+    response = client.get(f"/api/v1/customers/{customer['id']}", headers={'X-Tenant': 't2'})
+    assert response.status_code != 200 or response.get_json()['result']['full_name'] != customer['full_name']
+
+
+def test_requests_require_a_known_tenant(client):
+    assert client.get('/api/v1/customers').status_code == 400
+    assert client.get('/api/v1/customers', headers={'X-Tenant': 'missing'}).status_code == 404
@@ -0,0 +1,17 @@
+from sqlalchemy import text
+from app.extensions import db
+from app.utils.warmup import warm_up
+
+
+def test_warm_up_leaves_the_connection_on_public(app, client):
+    timings = warm_up(app)
+    assert set(timings) == {'mappers', 'connection', 'statements', 'controllers'}
+
+    with app.app_context():
+        assert db.engine._compiled_cache
+        search_path = db.session.execute(text('SHOW search_path')).scalar()
+        assert 'tenant_template' not in search_path and search_path.endswith('public')
+        db.session.remove()
+
+    # The pooled connection serves the next tenant request normally
+    assert client.get('/api/v1/customers', headers={'X-Tenant': 't1'}).status_code == 200
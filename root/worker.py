@@ -0,0 +1,17 @@
+import time
+from app import create_app
+from app.worker import JobWorker
+
+app = create_app()
+
+# Seconds kept free before the Lambda timeout so running jobs can finish
+DEADLINE_MARGIN = 60
+
+def lambda_handler(event, context):
+    """Scheduled entry point: drains the job queue until idle or close to the timeout."""
+    deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN
+    processed = JobWorker(app).run(stop_when_idle=True, deadline=deadline)
+    return {"processed": processed}
+
+if __name__ == '__main__':
+    JobWorker(app).run()
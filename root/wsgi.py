@@ -1,7 +1,16 @@
 from app import create_app
+from app.utils.warmup import is_keep_warm_event, ping, warm_up
 from awsgi import response
 
 app = create_app()
 
+# Runs during the Lambda init phase, before the first invocation
+if app.config.get('WARMUP_ON_INIT', False):
+    warm_up(app)
+
 def lambda_handler(event, context):
+    if is_keep_warm_event(app, event):
+        # Scheduled keep-warm pings only refresh the pooled connection
+        ping(app)
+        return {"warm": True}
     return response(app, event, context)